@@ -0,0 +1,242 @@
+# batch.py
+# 여러 Raw 파일(분석대상법인별 BvD Export)을 프로세스 풀로 병렬 변환
+#
+# 사용 예:
+#   python batch.py a.json b.json c.json
+#   python batch.py --dir ./exports --base base.json --report batch_report.json
+#   (base.json: 공통 inputData(yearFrom, yearTo, targetCorp 등)와 criteriaList)
+import argparse
+import copy
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+logger = logging.getLogger("batch")
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+EXPORT_PATTERNS = ("*.xlsx", "*.xls", "*.csv", "*.parquet")
+# 이 도구가 만든 결과/계산값 파일명 (Analysis._output_filepath: [corpName]_양적분석_[기간](n).확장자)
+# — 결과 폴더가 Raw 폴더와 같아도 다음 실행에서 Raw 파일로 읽지 않도록 제외
+OUTPUT_NAME_PATTERN = re.compile(r"_양적분석_\d{2}-\d{2}(?:_\d{2}-\d{2})*(?:\(\d+\))?$")
+
+
+def available_workers():
+    """현재 프로세스가 사용할 수 있는 CPU 코어 수."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def payloads_from_directory(directory, base_payload, patterns=EXPORT_PATTERNS):
+    """
+    폴더 내 Raw 파일마다 공통 설정(base_payload)을 복사한 payload 목록을 만듭니다.
+
+    - rawFilePath: 각 파일 경로
+    - corpName: 파일명(확장자 제외) — 결과 파일명이 겹치지 않도록 파일별로 지정
+    - targetCorp: base_payload에 없으면 파일명
+    - outputDir: base_payload에 없으면 Raw 파일과 같은 폴더
+
+    이전 실행의 결과 파일(OUTPUT_NAME_PATTERN)과 Excel 임시 잠금 파일(~$)은 제외합니다.
+    """
+    paths = sorted({
+        path
+        for pattern in patterns
+        for path in glob.glob(os.path.join(directory, pattern))
+        if not _is_excluded(os.path.basename(path))
+    })
+
+    payloads = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        payload = copy.deepcopy(base_payload)
+        input_data = payload.setdefault("inputData", {})
+        input_data["rawFilePath"] = path
+        input_data["corpName"] = stem
+        input_data.setdefault("targetCorp", stem)
+        input_data.setdefault("outputDir", os.path.dirname(os.path.abspath(path)))
+        payloads.append(payload)
+    return payloads
+
+
+def _is_excluded(filename):
+    """Raw 파일로 취급하지 않는 파일 (Excel 임시 잠금 파일, 이 도구의 결과 파일)."""
+    if filename.startswith("~$"):
+        return True
+    return OUTPUT_NAME_PATTERN.search(os.path.splitext(filename)[0]) is not None
+
+
+def _job_log_path(payload, log_dir):
+    """작업별 로그 파일 경로 (log_dir가 없으면 결과 폴더에 저장)."""
+    input_data = payload["inputData"]
+    raw_path = input_data["rawFilePath"]
+    if isinstance(raw_path, list):
+        raw_path = raw_path[0]  # 나눠 내보낸 파일은 첫 파일 기준
+    stem = os.path.splitext(os.path.basename(raw_path))[0]
+    directory = log_dir or input_data.get("outputDir") or os.path.dirname(os.path.abspath(raw_path))
+    return os.path.join(directory, f"{stem}.log")
+
+
+def _init_worker():
+    """작업 프로세스 초기화: 부모에서 상속된 콘솔 핸들러 제거 (작업 로그는 파일로만 기록)."""
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+
+def _run_job(payload, log_path):
+    """
+    작업 프로세스에서 main_processor 1건 실행.
+
+    예외는 밖으로 전파하지 않고 결과 딕셔너리에 담아 반환하므로,
+    한 파일의 실패가 다른 작업에 영향을 주지 않습니다.
+    """
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    handler = logging.FileHandler(log_path, mode="w", encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    root_logger.setLevel(logging.INFO)
+
+    raw_path = payload["inputData"]["rawFilePath"]
+    result = {"rawFilePath": raw_path, "logFile": log_path, "status": "ok", "error": None, "profile": None}
+    started = time.perf_counter()
+    try:
+        from processor import main_processor
+        result["profile"] = main_processor(payload, require_data=True)
+    except Exception as e:
+        root_logger.error("변환 실패: %s\n%s", raw_path, traceback.format_exc())
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        result["elapsed"] = round(time.perf_counter() - started, 2)
+        root_logger.removeHandler(handler)
+        handler.close()
+    return result
+
+
+def run_batch(payloads, max_workers=None, log_dir=None):
+    """
+    payload 목록을 ProcessPoolExecutor로 병렬 실행합니다.
+
+    Parameters:
+    - payloads: main_processor payload 목록
+    - max_workers: 작업 프로세스 수 (기본값: 사용 가능한 코어 수, 작업 수 이하)
+    - log_dir: 작업별 로그 폴더 (기본값: 각 작업의 outputDir)
+
+    Returns:
+    - 결과 딕셔너리 목록 (payload 순서)
+      {"rawFilePath", "status": "ok" | "failed", "error", "elapsed", "logFile", "profile"}
+    """
+    if not payloads:
+        return []
+
+    workers = min(max_workers or available_workers(), len(payloads))
+    logger.info("배치 시작: %d개 파일, %d개 프로세스", len(payloads), workers)
+
+    results = [None] * len(payloads)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(_run_job, payload, _job_log_path(payload, log_dir)): idx
+            for idx, payload in enumerate(payloads)
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 작업 프로세스 비정상 종료 (메모리 부족 등)
+                result = {
+                    "rawFilePath": payloads[idx]["inputData"]["rawFilePath"],
+                    "logFile": _job_log_path(payloads[idx], log_dir),
+                    "status": "failed",
+                    "error": f"{type(e).__name__}: {e}",
+                    "elapsed": None,
+                    "profile": None,
+                }
+            results[idx] = result
+            done = sum(r is not None for r in results)
+            logger.info("[%d/%d] %s %s (%s초)", done, len(payloads), result["status"],
+                        result["rawFilePath"], result["elapsed"])
+    return results
+
+
+def summarize(results, elapsed=None):
+    """배치 결과 요약 리포트 딕셔너리."""
+    failed = [r for r in results if r["status"] != "ok"]
+    return {
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "elapsed": round(elapsed, 2) if elapsed is not None else None,
+        "jobs": results,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="양적기준분석 배치 실행 (여러 Raw 파일 병렬 변환)")
+    parser.add_argument("payloads", nargs="*", help="payload 파일(JSON/YAML) 목록")
+    parser.add_argument("--dir", help="Raw 파일(*.xlsx, *.xls, *.csv, *.parquet) 폴더 — --base와 함께 사용 "
+                                          "(이전 결과 파일 [이름]_양적분석_[기간].* 은 제외)")
+    parser.add_argument("--base", help="--dir 사용 시 공통 inputData/criteriaList payload 파일")
+    parser.add_argument("-j", "--workers", type=int, help="작업 프로세스 수 (기본값: 사용 가능한 코어 수)")
+    parser.add_argument("--log-dir", help="작업별 로그 폴더 (기본값: 각 결과 폴더)")
+    parser.add_argument("--report", help="요약 리포트 JSON 저장 경로")
+    parser.add_argument("--cache", action="store_true",
+                        help="입력 캐시 사용 (~/.quantitative_app/input_cache 또는 cacheDir, 기본값: 사용 안 함)")
+    return parser
+
+
+def main(argv=None):
+    from cli import (EXIT_FAILURE, EXIT_INVALID_INPUT, EXIT_OK, PayloadError,
+                     load_payload, read_payload_file, validate_payload)
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    try:
+        if args.dir:
+            if not args.base:
+                parser.error("--dir에는 --base(공통 설정 payload)가 필요합니다.")
+            payloads = payloads_from_directory(args.dir, read_payload_file(args.base))
+            for payload in payloads:
+                validate_payload(payload)
+        else:
+            payloads = [load_payload(path) for path in args.payloads]
+    except PayloadError as e:
+        logger.error("%s", e)
+        return EXIT_INVALID_INPUT
+
+    if not payloads:
+        logger.error("실행할 payload가 없습니다.")
+        return EXIT_INVALID_INPUT
+    if args.cache:
+        for payload in payloads:
+            payload["inputData"]["useCache"] = True
+
+    started = time.perf_counter()
+    results = run_batch(payloads, max_workers=args.workers, log_dir=args.log_dir)
+    report = summarize(results, time.perf_counter() - started)
+
+    logger.info("배치 완료: 성공 %d / 실패 %d (%.1f초)", report["succeeded"], report["failed"], report["elapsed"])
+    for result in results:
+        if result["status"] != "ok":
+            logger.error("실패: %s — %s (로그: %s)", result["rawFilePath"], result["error"], result["logFile"])
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return EXIT_OK if report["failed"] == 0 else EXIT_FAILURE
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # PyInstaller 빌드 (Windows spawn) 지원
+    sys.exit(main())
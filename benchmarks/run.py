@@ -0,0 +1,188 @@
+# benchmarks/run.py
+# 합성 BvD Export로 main_processor 전체 / 단계별 성능을 측정하고 이력(JSONL)에 기록
+#
+# 사용 예 (저장소 루트에서):
+#   python -m benchmarks.run                                  # 기본 매트릭스 (1k/10k rows × 3/5 years)
+#   python -m benchmarks.run --rows 1000,10000,50000,100000 --years 3,5,10
+#   python -m benchmarks.run --modes default,writeOnly --tolerance 0.2
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import generate_results_sheet
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_DATA_DIR = os.path.join(BENCH_DIR, "data")
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "history.jsonl")
+END_YEAR = 2023
+
+# 측정 모드 → payload inputData 옵션
+MODES = {
+    "default": {},
+    "writeOnly": {"writeOnly": True},
+    "values": {"writeOnly": True, "criteriaValues": True, "metricValues": True, "summaryMode": "values"},
+    "columnar": {"writeOnly": True, "columnarStore": True},
+    "valuesOnly": {"valuesOnly": True, "columnarStore": True},
+}
+
+# 모든 기준 유형을 포함하는 대표 기준 세트
+BENCH_CRITERIA = [
+    {"type": "텍스트", "account": "감사의견", "xValue": "Unqualified", "xCompare": "All equals", "include": True},
+    {"type": "텍스트", "account": "상장여부", "xValue": "Listed", "xCompare": "텍스트 일치", "include": False},
+    {"type": "데이터가용성", "account": "재무정보가용성", "xValue": "", "xCompare": "존재함", "include": True},
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "초과", "include": True},
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "미만",
+     "yearCondition": "1개년이라도", "include": False},
+    {"type": "숫자-개별연도", "account": "매출원가", "xValue": "100", "xCompare": "이상",
+     "yearCondition": "N개년이상", "nYears": "2", "include": True},
+    {"type": "비율", "account": "재고자산보유일수\n(365/재고자산회전율)", "xValue": "30", "xCompare": "초과", "include": False},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True},
+]
+
+# 회귀 판정 대상 (전체 + 주요 단계)
+WATCHED = ("total", "load", "styles", "save")
+
+
+def dataset_path(data_dir, rows, years, seed):
+    """(rows, years, seed)별 합성 파일 경로 (없으면 생성, 있으면 재사용)."""
+    path = os.path.join(data_dir, f"results_{rows}r_{years}y_s{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"합성 데이터 생성: {path}", flush=True)
+        generate_results_sheet(path, rows, END_YEAR - years + 1, END_YEAR, seed=seed)
+    return path
+
+
+def run_case(raw_path, years, mode, use_cache):
+    """
+    별도 프로세스에서 cli.py로 1건 실행 (프로세스별 최대 RSS를 독립적으로 측정).
+
+    Returns: main_processor 측정 결과 dict
+    """
+    with tempfile.TemporaryDirectory() as out_dir:
+        payload_path = os.path.join(out_dir, "payload.json")
+        profile_path = os.path.join(out_dir, "profile.json")
+        input_data = {
+            "corpName": "bench", "targetCorp": "bench",
+            "yearFrom": END_YEAR - years + 1, "yearTo": END_YEAR,
+            "rawFilePath": raw_path, "outputDir": out_dir,
+            "useCache": use_cache, "profileOutput": profile_path,
+            **MODES[mode],
+        }
+        with open(payload_path, "w", encoding="utf-8") as f:
+            json.dump({"inputData": input_data, "criteriaList": BENCH_CRITERIA}, f, ensure_ascii=False)
+
+        subprocess.run([sys.executable, os.path.join(REPO_DIR, "cli.py"), payload_path, "--log-level", "WARNING"],
+                       check=True, cwd=REPO_DIR)
+        with open(profile_path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def stage_times(profile):
+    """{"total": 전체 wall, 단계명: wall} (초)."""
+    times = {stage["name"]: stage["wall_s"] for stage in profile["stages"]}
+    times["total"] = profile["total"]["wall_s"]
+    return times
+
+
+def find_regressions(record, history, tolerance):
+    """같은 케이스(rows, years, mode, cache)의 직전 기록 대비 tolerance 이상 느려진 항목."""
+    key = (record["rows"], record["years"], record["mode"], record["use_cache"])
+    previous = [r for r in history if (r["rows"], r["years"], r["mode"], r["use_cache"]) == key]
+    if not previous:
+        return []
+
+    before, after = stage_times(previous[-1]["profile"]), stage_times(record["profile"])
+    regressions = []
+    for name in WATCHED:
+        if name in before and name in after and after[name] > before[name] * (1 + tolerance) and after[name] > 0.05:
+            regressions.append(f"{name}: {before[name]:.2f}s → {after[name]:.2f}s")
+    return regressions
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="양적분석 벤치마크 (합성 BvD Export)")
+    parser.add_argument("--rows", type=_int_list, default=[1000, 10000], help="행 수 목록 (예: 1000,10000,50000,100000)")
+    parser.add_argument("--years", type=_int_list, default=[3, 5], help="분석 기간(연수) 목록 (예: 3,5,10)")
+    parser.add_argument("--modes", default="default", help=f"측정 모드 목록 ({', '.join(MODES)})")
+    parser.add_argument("--cache", action="store_true", help="입력 캐시 사용 (기본값: 매번 원본 파싱)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 seed")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="합성 데이터 폴더")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="측정 이력 JSONL 경로")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀 판정 허용 비율 (기본값: 0.25 = 25%%)")
+    parser.add_argument("--no-record", action="store_true", help="이력에 기록하지 않고 비교만 수행")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        print(f"알 수 없는 모드: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    history = load_history(args.history)
+    revision = git_revision()
+    regressions = []
+
+    for rows, years, mode in itertools.product(args.rows, args.years, modes):
+        raw_path = dataset_path(args.data_dir, rows, years, args.seed)
+        profile = run_case(raw_path, years, mode, args.cache)
+        record = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "revision": revision,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "rows": rows, "years": years, "mode": mode, "use_cache": args.cache,
+            "profile": profile,
+        }
+
+        stages = " ".join(f"{s['name']}={s['wall_s']:.2f}" for s in profile["stages"])
+        total = profile["total"]
+        print(f"{rows:>7} rows {years:>2}y {mode:<9} total={total['wall_s']:.2f}s cpu={total['cpu_s']:.2f}s "
+              f"rss={total['peak_rss_mb']}MB | {stages}", flush=True)
+
+        for message in find_regressions(record, history, args.tolerance):
+            regressions.append(f"{rows} rows {years}y {mode} — {message}")
+
+        if not args.no_record:
+            with open(args.history, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        history.append(record)
+
+    if regressions:
+        print("\n성능 회귀 감지:", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
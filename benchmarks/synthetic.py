@@ -0,0 +1,87 @@
+# benchmarks/synthetic.py
+# 벤치마크용 합성 BvD Export (Results 시트) 생성
+import os
+import random
+
+from openpyxl import Workbook
+
+from processor import Analysis
+
+AUDIT_STATUSES = ["Unqualified", "Qualified", "Unqualified with remarks", "n.a."]
+LISTING_STATUSES = ["Listed", "Unlisted", "Delisted"]
+COMPANY_STATUSES = ["Active", "Active (default of payment)", "Inactive"]
+SIC_CODES = [("3571", "Electronic computers"), ("3572", "Computer storage devices"),
+             ("3674", "Semiconductors and related devices"), ("5045", "Computers and peripheral equipment")]
+MISSING_RATE = 0.08  # 연도별 재무 셀 중 "n.a." / 공란 비율
+
+
+def synthetic_columns(start_year, end_year):
+    """Analysis가 기대하는 Raw 컬럼 순서 (+ 로더가 건너뛰어야 하는 불필요 컬럼 1개)."""
+    return Analysis(start_year=start_year, end_year=end_year).ordered_columns + ["Last avail. year"]
+
+
+def _yearly_value(rng, column, scale):
+    """연도별 셀 값: 금액/직원수 숫자, 감사의견 텍스트, 일부는 "n.a." 또는 공란."""
+    if column.startswith("Audit status"):
+        return rng.choice(AUDIT_STATUSES)
+    draw = rng.random()
+    if draw < MISSING_RATE / 2:
+        return "n.a."
+    if draw < MISSING_RATE:
+        return None
+    if column.startswith("Number of employees"):
+        return int(scale / 50) + rng.randint(0, 40)
+    if column.startswith("Operating profit") or column.startswith("Other operating"):
+        return round(rng.gauss(scale * 0.05, scale * 0.1), 1)
+    return round(abs(rng.gauss(scale, scale * 0.3)), 1)
+
+
+def _prefix_value(rng, column, index, sic):
+    values = {
+        "BvD ID number": f"KR{index:09d}",
+        "Company name Latin alphabet": f"SYNTHETIC COMPANY {index}",
+        "Consolidation code": rng.choice(["U1", "C1", "C2"]),
+        "SH - BvD Independence Indicator": rng.choice(["A+", "A", "A-", "B+", "U"]),
+        "Listing status": rng.choice(LISTING_STATUSES),
+        "US SIC, primary code(s)": sic[0],
+        "US SIC, primary code(s) - description": sic[1],
+        "Country": "Korea, Republic of",
+        "City\nLatin Alphabet": rng.choice(["SEOUL", "BUSAN", "INCHEON"]),
+        "Website address": rng.choice([f"www.company{index}.com", None]),
+        "Date of incorporation": f"{rng.randint(1970, 2015)}",
+        "Full overview": f"Company {index} manufactures and distributes electronic products.",
+        "Status": rng.choice(COMPANY_STATUSES),
+        "Main activity": rng.choice(["Manufacturing", "Wholesale", "Services"]),
+        "Primary business line": sic[1],
+        "Main products and services": "Computers, storage devices and components",
+    }
+    return values.get(column, "n.a.")
+
+
+def generate_results_sheet(path, rows, start_year=2021, end_year=2023, seed=0):
+    """
+    합성 Results 시트를 path에 저장합니다 (write-only 모드로 행 단위 기록).
+
+    BvD Export와 같이 1행은 헤더, 2행은 로더가 건너뛰는 불필요한 행입니다.
+    같은 (rows, 연도, seed)이면 항상 같은 내용이 생성됩니다.
+    """
+    rng = random.Random(seed)
+    columns = synthetic_columns(start_year, end_year)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Results")
+    ws.append(columns)
+    ws.append(["" for _ in columns])
+
+    for index in range(1, rows + 1):
+        sic = rng.choice(SIC_CODES)
+        scale = rng.lognormvariate(9, 1.2)  # 회사 규모 (th USD)
+        ws.append([
+            _yearly_value(rng, column, scale) if column[-4:].isdigit()
+            else _prefix_value(rng, column, index, sic)
+            for column in columns
+        ])
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    wb.save(path)
+    return path
@@ -0,0 +1,214 @@
+# cli.py
+# GUI 없이 payload 파일로 양적분석을 실행하는 명령행 진입점 (tkinter를 import하지 않음)
+#
+# 사용 예:
+#   python cli.py payload.json
+#   python cli.py payload.yaml --output-dir ./out
+#   cat payload.json | python cli.py -
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger("cli")
+
+EXIT_OK = 0
+EXIT_FAILURE = 1        # 변환 실행 중 오류
+EXIT_INVALID_INPUT = 2  # payload 파일/형식 오류
+
+
+class PayloadError(Exception):
+    """payload 파일을 읽을 수 없거나 형식이 잘못된 경우."""
+
+
+def load_payload(path):
+    """
+    JSON 또는 YAML payload 파일을 읽어 {"inputData", "criteriaList"} 딕셔너리로 반환합니다.
+
+    - path가 "-"이면 표준입력에서 JSON을 읽습니다.
+    - .yaml / .yml 파일은 PyYAML이 설치된 경우에만 지원합니다.
+    """
+    payload = read_payload_file(path)
+    validate_payload(payload)
+    return payload
+
+
+def read_payload_file(path):
+    """JSON/YAML 파일을 파싱만 합니다 (필수 키 검증 없음)."""
+    try:
+        if path == "-":
+            text = sys.stdin.read()
+        else:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+    except OSError as e:
+        raise PayloadError(f"payload 파일을 읽을 수 없습니다: {e}") from e
+
+    if path.lower().endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError as e:
+            raise PayloadError("YAML payload를 읽으려면 PyYAML이 필요합니다 (pip install pyyaml).") from e
+        try:
+            payload = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise PayloadError(f"YAML 형식 오류: {e}") from e
+    else:
+        try:
+            payload = json.loads(text)
+        except ValueError as e:
+            raise PayloadError(f"JSON 형식 오류: {e}") from e
+    return payload
+
+
+def validate_payload(payload):
+    """main_processor 실행 전 필수 키를 확인합니다."""
+    if not isinstance(payload, dict):
+        raise PayloadError("payload는 {\"inputData\", \"criteriaList\"} 형태의 객체여야 합니다.")
+
+    input_data = payload.get("inputData")
+    if not isinstance(input_data, dict):
+        raise PayloadError("inputData가 없습니다.")
+    required = ("corpName", "targetCorp", "rawFilePath") + (() if input_data.get("windows") else ("yearFrom", "yearTo"))
+    missing = [key for key in required if key not in input_data]
+    if missing:
+        raise PayloadError(f"inputData에 필수 항목이 없습니다: {', '.join(missing)}")
+
+    raw_paths = input_data["rawFilePath"]
+    if not isinstance(raw_paths, list):
+        raw_paths = [raw_paths]
+    if not raw_paths:
+        raise PayloadError("rawFilePath에 최소 1개의 파일이 필요합니다.")
+    for raw_path in raw_paths:
+        if not os.path.isfile(str(raw_path)):
+            raise PayloadError(f"Raw 파일을 찾을 수 없습니다: {raw_path}")
+
+    criteria_list = payload.get("criteriaList")
+    if not isinstance(criteria_list, list) or not criteria_list:
+        raise PayloadError("criteriaList에 최소 1개의 기준이 필요합니다.")
+
+
+def apply_arguments(payload, args):
+    """명령행 옵션을 payload의 inputData에 반영합니다 (payload 값보다 우선)."""
+    input_data = payload.get("inputData") if isinstance(payload, dict) else None
+    if not isinstance(input_data, dict):
+        return payload
+    if args.output_dir:
+        input_data["outputDir"] = args.output_dir
+    if args.profile:
+        input_data["profileOutput"] = args.profile
+    if args.incremental_from:
+        input_data["incrementalFrom"] = args.incremental_from
+    if args.windows:
+        input_data["windows"] = args.windows
+    if args.separate_workbooks:
+        input_data["separateWorkbooks"] = True
+    if args.export:
+        input_data["valuesExport"] = args.export
+    if args.values_only:
+        input_data["valuesOnly"] = True
+    if args.cache:
+        input_data["useCache"] = True
+    return payload
+
+
+def parse_windows(text):
+    """"2021-2023,2022-2024" → [[2021, 2023], [2022, 2024]]."""
+    windows = []
+    for part in text.split(","):
+        try:
+            start_year, end_year = (int(value) for value in part.strip().split("-"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"분석 기간 형식이 잘못되었습니다: {part!r} (예: 2021-2023)")
+        if start_year > end_year:
+            raise argparse.ArgumentTypeError(f"시작연도가 종료연도보다 큽니다: {part!r}")
+        windows.append([start_year, end_year])
+    return windows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="양적기준분석 (GUI 없이 payload 파일로 실행)")
+    parser.add_argument("payload", nargs="?",
+                        help="JSON/YAML payload 파일 경로 (\"-\"이면 표준입력 JSON, --clear-cache만 실행할 때는 생략)")
+    parser.add_argument("-o", "--output-dir", help="결과 파일 저장 폴더 (payload의 outputDir보다 우선)")
+    parser.add_argument("--profile", help="단계별 소요 시간/메모리 측정 결과 JSON 저장 경로")
+    parser.add_argument("--incremental-from", help="이전 결과 파일 — 기준만 바뀐 경우 기준 관련 셀만 교체하여 저장")
+    parser.add_argument("--windows", type=parse_windows,
+                        help="여러 분석 기간을 Raw 파일 한 번 읽기로 처리 (예: 2021-2023,2022-2024)")
+    parser.add_argument("--separate-workbooks", action="store_true",
+                        help="--windows 사용 시 기간별 파일로 저장 (기본값: 한 통합문서에 기간별 시트)")
+    parser.add_argument("--export", choices=["parquet", "csv"],
+                        help="결과 파일과 함께 지표/기준별 Yes·No/양적통과 계산값을 Parquet 또는 CSV로 저장")
+    parser.add_argument("--values-only", action="store_true",
+                        help="결과 통합문서 없이 계산값 파일만 저장 (--export가 없으면 Parquet)")
+    parser.add_argument("--cache", action="store_true",
+                        help="입력 캐시 사용: 파싱한 Raw 데이터를 ~/.quantitative_app/input_cache"
+                             "(payload의 cacheDir)에 최대 2GB 저장해 다음 실행에 재사용 (기본값: 사용 안 함)")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="입력 캐시 폴더의 항목을 모두 삭제 (payload가 없으면 삭제만 하고 종료)")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="로그 레벨 (기본값: INFO)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.payload is None and not args.clear_cache:
+        parser.error("payload 파일 경로가 필요합니다.")
+
+    payload = None
+    if args.payload is not None:
+        try:
+            # 명령행 옵션(--windows 등)을 먼저 반영해야 필수 항목을 올바르게 판단할 수 있음
+            payload = apply_arguments(read_payload_file(args.payload), args)
+            validate_payload(payload)
+        except PayloadError as e:
+            logger.error("%s", e)
+            return EXIT_INVALID_INPUT
+
+    if args.clear_cache:
+        from input_cache import ParsedInputCache
+        cache = ParsedInputCache(payload["inputData"].get("cacheDir") if payload else None)
+        try:
+            cache.clear()
+        except OSError as e:
+            logger.error("입력 캐시를 삭제하지 못했습니다 (%s): %s", cache.cache_dir, e)
+            return EXIT_FAILURE
+        logger.info("입력 캐시 삭제: %s", cache.cache_dir)
+        if payload is None:
+            return EXIT_OK
+
+    input_data = payload["inputData"]
+    if not input_data.get("outputDir"):
+        raw_path = input_data["rawFilePath"]
+        first_path = raw_path[0] if isinstance(raw_path, list) else raw_path
+        input_data["outputDir"] = os.path.dirname(os.path.abspath(first_path))
+
+    # pandas/openpyxl 로딩 비용은 payload 검증 이후에만 발생
+    from processor import main_processor
+
+    started = time.perf_counter()
+    try:
+        profile = main_processor(
+            payload,
+            progress_callback=lambda stage, index, total: logger.info("[%d/%d] %s", index + 1, total, stage),
+            require_data=True,
+        )
+    except Exception:
+        logger.exception("변환 실패: %s", input_data["rawFilePath"])
+        return EXIT_FAILURE
+
+    logger.info("변환 완료 (%.1f초): %s", time.perf_counter() - started, input_data["rawFilePath"])
+    for stage in profile["stages"]:
+        logger.info("  %-8s %7.2fs (CPU %.2fs, RSS %s → %s MB, 최대 RSS 증가 %s MB)",
+                    stage["name"], stage["wall_s"], stage["cpu_s"],
+                    stage["rss_start_mb"], stage["rss_end_mb"], stage["peak_rss_growth_mb"])
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+# columnar_store.py
+# Raw 데이터 컬럼 저장소 (숫자: float64 배열, 텍스트: 사전 인코딩) — 디스크에 저장하면 memmap으로 다시 열기
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from metrics import BLANK, NO_CODE, NUMBER, TEXT, classify_cells, dictionary_encode
+
+STORE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class RawColumn:
+    """
+    Raw 컬럼 1개의 Excel 셀 모델 표현.
+
+    - kinds: int8 배열 (BLANK / NUMBER / TEXT)
+    - numbers: float64 배열 (숫자가 아닌 셀은 NaN, 숫자 셀이 없으면 None)
+    - codes / categories: 텍스트 셀의 사전 인코딩 (codes는 int32, 텍스트가 아닌 셀은 NO_CODE,
+      categories는 고유 값 object 배열 — 텍스트 셀이 없으면 둘 다 None)
+    """
+
+    __slots__ = ("kinds", "numbers", "codes", "categories")
+
+    def __init__(self, kinds, numbers=None, codes=None, categories=None):
+        self.kinds = kinds
+        self.numbers = numbers
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_series(cls, series):
+        numbers, kinds = classify_cells(series)
+        has_number = (kinds == NUMBER).any()
+        if not (kinds == TEXT).any():
+            return cls(kinds, numbers if has_number else None)
+        codes, categories = dictionary_encode(series, kinds)
+        return cls(kinds, numbers if has_number else None, codes, categories)
+
+    @classmethod
+    def concat(cls, parts, lengths):
+        """
+        행 방향으로 이어 붙인 RawColumn.
+
+        Parameters:
+        - parts: 부분별 RawColumn (해당 부분에 컬럼이 없으면 None → 공란)
+        - lengths: 부분별 행 수
+        """
+        kinds = np.concatenate([
+            part.kinds if part is not None else np.full(n, BLANK, dtype=np.int8)
+            for part, n in zip(parts, lengths)
+        ])
+        numbers = None
+        if any(part is not None and part.numbers is not None for part in parts):
+            numbers = np.concatenate([
+                part.numbers if part is not None and part.numbers is not None else np.full(n, np.nan)
+                for part, n in zip(parts, lengths)
+            ])
+        if not any(part is not None and part.codes is not None for part in parts):
+            return cls(kinds, numbers)
+
+        # 부분별 사전을 합친 뒤 (등장 순서 유지) 각 부분의 코드를 합친 사전의 코드로 변환
+        encoded = [part for part in parts if part is not None and part.codes is not None]
+        merged_codes, categories = pd.factorize(np.concatenate([part.categories for part in encoded]),
+                                                use_na_sentinel=False)
+        codes, offset = [], 0
+        for part, n in zip(parts, lengths):
+            if part is None or part.codes is None:
+                codes.append(np.full(n, NO_CODE, dtype=np.int32))
+                continue
+            remap = merged_codes[offset:offset + len(part.categories)].astype(np.int32)
+            offset += len(part.categories)
+            codes.append(np.where(part.codes == NO_CODE, NO_CODE, remap[np.maximum(part.codes, 0)]))
+        return cls(kinds, numbers, np.concatenate(codes).astype(np.int32, copy=False),
+                   np.asarray(categories, dtype=object))
+
+    def take(self, indexer):
+        """indexer(bool 마스크 또는 행 번호 배열) 행만 남긴 메모리 내 복사본."""
+        return RawColumn(
+            np.asarray(self.kinds[indexer]),
+            None if self.numbers is None else np.asarray(self.numbers[indexer]),
+            None if self.codes is None else np.asarray(self.codes[indexer]),
+            self.categories,
+        )
+
+    def values(self, start=0, stop=None):
+        """[start, stop) 행의 셀 값 object 배열 (공란은 None)."""
+        kinds = self.kinds[start:stop]
+        values = np.full(len(kinds), None, dtype=object)
+        if self.numbers is not None:
+            is_number = kinds == NUMBER
+            values[is_number] = self.numbers[start:stop][is_number]
+        if self.codes is not None:
+            is_text = kinds == TEXT
+            values[is_text] = self.categories[self.codes[start:stop][is_text]]
+        return values
+
+
+class ColumnarStore:
+    """
+    원본 DataFrame 대신 사용할 컬럼 단위 Raw 데이터 저장소.
+
+    숫자는 float64 배열 + 셀 종류(int8)로, 텍스트는 컬럼별 사전(categories) + 정수 코드로 보관하므로
+    "n.a." 등이 섞인 연도별 숫자 컬럼도 object 배열 없이 표현됩니다. save()로 저장한 뒤 open()으로 열면
+    숫자/종류/코드 배열은 np.memmap으로 매핑되어, ScreeningMetrics가 복사 없이 그대로 사용합니다.
+    """
+
+    def __init__(self, columns, num_rows):
+        """
+        Parameters:
+        - columns: {컬럼명: RawColumn} (원본 컬럼 순서)
+        - num_rows: 데이터 행 수
+        """
+        self.columns = columns
+        self.num_rows = num_rows
+        self._blank = None
+
+    def __len__(self):
+        return self.num_rows
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    @classmethod
+    def from_frame(cls, df):
+        """read_results_sheet 결과 DataFrame → ColumnarStore (메모리 내)."""
+        return cls({column: RawColumn.from_series(df[column]) for column in df.columns}, len(df))
+
+    @classmethod
+    def concat(cls, stores):
+        """
+        여러 ColumnarStore(나눠 내보낸 파일/시트/청크)를 행 방향으로 이어 붙입니다.
+
+        컬럼은 처음 등장한 순서를 따르고, 일부에만 있는 컬럼은 나머지 부분에서 공란입니다.
+        텍스트 사전은 컬럼별로 하나로 합칩니다.
+        """
+        stores = list(stores)
+        if len(stores) == 1:
+            return stores[0]
+        lengths = [store.num_rows for store in stores]
+        names = dict.fromkeys(name for store in stores for name in store.columns)
+        columns = {
+            name: RawColumn.concat([store.columns.get(name) for store in stores], lengths)
+            for name in names
+        }
+        return cls(columns, sum(lengths))
+
+    # -------------------------
+    # 조회
+    # -------------------------
+    def cells(self, column):
+        """ScreeningMetrics.cells와 같은 (numbers, kinds). 없는 컬럼은 None."""
+        raw = self.columns.get(column)
+        if raw is None:
+            return None
+        numbers = raw.numbers if raw.numbers is not None else self._all_nan()
+        return numbers, raw.kinds
+
+    def text_codes(self, column):
+        """ScreeningMetrics.text_codes와 같은 (codes, categories). 없는 컬럼은 None."""
+        raw = self.columns.get(column)
+        if raw is None:
+            return None
+        if raw.codes is None:
+            return np.full(self.num_rows, NO_CODE, dtype=np.int32), np.empty(0, dtype=object)
+        return raw.codes, raw.categories
+
+    def column_values(self, column):
+        """컬럼 전체의 셀 값 object 배열 (공란은 None). 없는 컬럼은 None."""
+        raw = self.columns.get(column)
+        return raw.values() if raw is not None else None
+
+    def iter_rows(self, columns, chunk_size):
+        """columns 순서의 값 리스트를 한 행씩 생성 (chunk_size 행 단위로 변환, 없는 컬럼은 None)."""
+        for start in range(0, self.num_rows, chunk_size):
+            stop = min(start + chunk_size, self.num_rows)
+            block = np.full((stop - start, len(columns)), None, dtype=object)
+            for j, column in enumerate(columns):
+                raw = self.columns.get(column)
+                if raw is not None:
+                    block[:, j] = raw.values(start, stop)
+            yield from block.tolist()
+
+    def count_non_blank(self):
+        """공란이 아닌 셀 수."""
+        return sum(int(np.count_nonzero(raw.kinds != BLANK)) for raw in self.columns.values())
+
+    def select(self, columns):
+        """columns 중 저장소에 있는 컬럼만 가진 ColumnarStore (배열은 복사하지 않고 공유)."""
+        return ColumnarStore({name: self.columns[name] for name in columns if name in self.columns}, self.num_rows)
+
+    def take(self, indexer):
+        """indexer 행만 남긴 메모리 내 ColumnarStore (bool 마스크 또는 행 번호 배열)."""
+        columns = {name: raw.take(indexer) for name, raw in self.columns.items()}
+        num_rows = len(next(iter(columns.values())).kinds) if columns else int(np.count_nonzero(indexer))
+        return ColumnarStore(columns, num_rows)
+
+    def _all_nan(self):
+        if self._blank is None:
+            self._blank = np.full(self.num_rows, np.nan)
+            self._blank.flags.writeable = False
+        return self._blank
+
+    # -------------------------
+    # 디스크 저장 / memmap 열기
+    # -------------------------
+    def save(self, directory):
+        """
+        directory에 컬럼별 .npy 파일과 manifest.json을 기록합니다.
+
+        categories(고유 텍스트 값)는 object 배열이므로 pickle로 저장되고, 나머지 배열은 memmap 가능한
+        고정 폭 형식입니다.
+        """
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"version": STORE_FORMAT_VERSION, "rows": self.num_rows, "columns": []}
+        for i, (name, raw) in enumerate(self.columns.items()):
+            entry = {"name": name, "numbers": raw.numbers is not None, "codes": raw.codes is not None}
+            np.save(os.path.join(directory, f"c{i}.kinds.npy"), raw.kinds)
+            if entry["numbers"]:
+                np.save(os.path.join(directory, f"c{i}.numbers.npy"), raw.numbers)
+            if entry["codes"]:
+                np.save(os.path.join(directory, f"c{i}.codes.npy"), raw.codes)
+                np.save(os.path.join(directory, f"c{i}.categories.npy"), raw.categories, allow_pickle=True)
+            manifest["columns"].append(entry)
+
+        with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+    @classmethod
+    def open(cls, directory, mmap_mode="r"):
+        """
+        save()로 저장한 디렉터리를 엽니다 (숫자/종류/코드 배열은 memmap, 읽기 전용).
+
+        Raises:
+        - ValueError: 저장 형식 버전이 다르거나 manifest가 잘못된 경우
+        """
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 저장소 형식입니다: {manifest.get('version')}")
+
+        def load(i, part):
+            return np.load(os.path.join(directory, f"c{i}.{part}.npy"), mmap_mode=mmap_mode)
+
+        columns = {}
+        for i, entry in enumerate(manifest["columns"]):
+            columns[entry["name"]] = RawColumn(
+                load(i, "kinds"),
+                load(i, "numbers") if entry["numbers"] else None,
+                load(i, "codes") if entry["codes"] else None,
+                np.load(os.path.join(directory, f"c{i}.categories.npy"), allow_pickle=True)
+                if entry["codes"] else None,
+            )
+        return cls(columns, manifest["rows"])
@@ -0,0 +1,409 @@
+# evaluator.py
+# 양적기준을 Excel 수식 대신 DataFrame 위에서 직접 계산 (CriteriaFormulaGenerator와 동일한 규칙)
+import logging
+import math
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from metrics import BLANK, NUMBER, TEXT, ScreeningMetrics
+
+logger = logging.getLogger(__name__)
+
+# CriteriaFormulaGenerator._get_column_range와 동일한 Flow 매핑 순서
+FLOW_FIELD_MAPPING = {
+    "Debtors": "Debtors\nth USD ",
+    "Creditors": "Creditors\nth USD ",
+    "Stock": "Stock\nth USD ",
+    "Intangible assets": "Intangible assets\nth USD ",
+    "Tangible fixed assets": "Tangible fixed assets\nth USD ",
+    "Total assets": "Total assets\nth USD ",
+}
+
+_COMPARATORS = {
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "lt": np.less,
+    "lte": np.less_equal,
+    "eq": np.equal,
+}
+
+
+# COUNTIF 기준의 연산자 접두사 (2글자 연산자를 먼저 확인, 접두사가 없으면 "=")
+_COUNTIF_OPERATORS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<>": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "=": operator.eq,
+}
+
+
+def _split_countif_criterion(value):
+    """COUNTIF 기준 문자열 → (연산자, 피연산자)."""
+    for symbol in _COUNTIF_OPERATORS:
+        if value.startswith(symbol):
+            return symbol, value[len(symbol):]
+    return "=", value
+
+
+def _finite_number(text):
+    """Excel이 숫자로 해석하는 문자열 → float (아니면 None, "inf" 등 무한대/NaN 표기는 텍스트)."""
+    try:
+        number = float(text)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) and "_" not in text else None
+
+
+def _excel_number_text(value):
+    """숫자 셀을 Excel이 텍스트로 변환한 값 (일반 서식)."""
+    return str(int(value)) if value.is_integer() else format(value, ".15g")
+
+
+def _category_texts(categories):
+    """사전 값 → 문자열 Series (텍스트 비교용)."""
+    return pd.Series(categories, dtype=object).astype(str)
+
+
+def _broadcast(text, resolved):
+    """
+    사전 값별 결과(resolved, categories와 같은 길이의 bool 배열)를 코드로 행에 펼칩니다.
+
+    codes의 NO_CODE(-1)는 끝에 덧붙인 False를 가리키므로 텍스트가 아닌 셀은 False가 됩니다.
+    """
+    codes, _ = text
+    return np.append(np.asarray(resolved, dtype=bool), False)[codes]
+
+
+def _wildcard_pattern(value):
+    """Excel 와일드카드(*, ?, ~ 이스케이프)를 정규식으로 변환."""
+    parts = []
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch == "~" and i + 1 < len(value) and value[i + 1] in "*?~":
+            parts.append(re.escape(value[i + 1]))
+            i += 2
+            continue
+        parts.append(".*" if ch == "*" else "." if ch == "?" else re.escape(ch))
+        i += 1
+    return "".join(parts)
+
+
+def cumulative_counts(masks, num_rows, number_of_criteria=None):
+    """
+    기준 순서대로 누적 적용한 [(탈락 건수, 통과 건수)] (insert_pass_fail_summary의 20/21행과 동일).
+
+    None mask(기준 컬럼이 비어 있음)는 "Yes"/"No" 모두 0건이므로 탈락 0건, 이후 통과 0건입니다.
+    """
+    if number_of_criteria is None:
+        number_of_criteria = len(masks)
+
+    survived = np.ones(num_rows, dtype=bool)
+    counts = []
+    for i in range(number_of_criteria):
+        mask = masks[i] if i < len(masks) else None
+        if mask is None:
+            fail_count = 0
+            survived = np.zeros(num_rows, dtype=bool)
+        else:
+            fail_count = int(np.count_nonzero(survived & ~mask))
+            survived &= mask
+        counts.append((fail_count, int(np.count_nonzero(survived))))
+    return counts
+
+
+class CriteriaEvaluator:
+    """
+    양적기준 평가 클래스 (CriteriaFormulaGenerator의 수식과 동일한 Yes/No 결과를 벡터 연산으로 계산)
+
+    - 각 evaluate_* 메서드는 "Yes"인 행을 True로 하는 bool 배열을 반환합니다.
+    - count_requirement(all/any/N), IFERROR 대체값, 공란/텍스트 비교 규칙은 수식과 동일합니다.
+      (Excel에서 텍스트는 모든 숫자보다 크고, 공란은 숫자 비교 시 0으로 취급)
+    - 텍스트 기준은 컬럼의 사전(ScreeningMetrics.text_codes)에서 고유 값마다 한 번만 비교하고,
+      결과를 정수 코드로 행에 펼칩니다.
+    """
+
+    def __init__(self, source_df, start_year, end_year, ordered_columns, metrics=None):
+        """
+        Parameters:
+        - source_df: ordered_columns 이름의 컬럼을 가진 원본 DataFrame (metrics가 ColumnarStore를 쓰면 None 가능)
+        - start_year, end_year: 분석 기간
+        - ordered_columns: Analysis.ordered_columns (원본에 없는 컬럼은 공란으로 취급)
+        - metrics: ScreeningMetrics (없으면 새로 생성)
+        """
+        self.source_df = source_df
+        self.start_year = start_year
+        self.end_year = end_year
+        self.ordered_columns = set(ordered_columns)
+        self.metrics = metrics if metrics is not None else ScreeningMetrics(source_df, start_year, end_year)
+        self.num_rows = self.metrics.num_rows
+
+    # -------------------------
+    # 셀 범위
+    # -------------------------
+    def _get_cells(self, field_name):
+        """필드명에 따른 [(numbers, kinds, text)] 목록 (CriteriaFormulaGenerator._get_column_range 규칙).
+
+        text: 텍스트 셀의 (codes, categories) — Flow 값처럼 텍스트 셀이 없으면 None
+        """
+        # Flow 데이터인 경우 (개별 연도 Flow 값)
+        for flow_key, asset in FLOW_FIELD_MAPPING.items():
+            if flow_key.lower() in field_name.lower():
+                kinds = np.full(self.num_rows, NUMBER, dtype=np.int8)
+                return [(values, kinds, None) for values in self.metrics.flow[asset]]
+
+        # Raw 데이터인 경우 (연도별)
+        if f"{field_name}{self.start_year}" in self.ordered_columns:
+            return [self._raw_cells(f"{field_name}{year}") for year in range(self.start_year, self.end_year + 1)]
+
+        # 단일 컬럼 (연도 없음)
+        if field_name in self.ordered_columns:
+            return [self._raw_cells(field_name)]
+
+        return []
+
+    def _raw_cells(self, column):
+        numbers, kinds = self.metrics.cells(column)
+        return numbers, kinds, self.metrics.text_codes(column)
+
+    def _full(self, value):
+        return np.full(self.num_rows, value, dtype=bool)
+
+    # -------------------------
+    # 기준별 평가
+    # -------------------------
+    def evaluate_text_criteria(self, field_name, condition_type, value, include=True):
+        """텍스트 기준 평가 (generate_text_criteria와 동일)."""
+        cells = self._get_cells(field_name)
+        if not cells:
+            return self._full(not include)
+
+        value = str(value)
+        matches = []
+        for numbers, kinds, text in cells:
+            if condition_type == "blank":
+                matches.append(self._text_blank(kinds, text))
+            elif condition_type == "not_blank":
+                matches.append(~self._text_blank(kinds, text))
+            elif condition_type == "equals" or (condition_type == "all_equals" and len(cells) == 1):
+                matches.append(self._text_equals(kinds, text, value))
+            elif condition_type == "all_equals":
+                matches.append(self._text_countif(numbers, kinds, text, value))
+            elif condition_type == "contains":
+                matches.append(self._text_search(numbers, kinds, text, value))
+            else:
+                return self._full(not include)
+
+        stacked = np.vstack(matches)
+        if condition_type in ("equals", "contains"):
+            condition = stacked.any(axis=0)  # OR
+        else:
+            condition = stacked.all(axis=0)  # AND / COUNTIF(...)=len
+        return condition if include else ~condition
+
+    def evaluate_numeric_criteria(self, field_name, condition_type, threshold, include=True,
+                                  count_requirement=None):
+        """숫자 기준 평가 (generate_numeric_criteria와 동일)."""
+        cells = self._get_cells(field_name)
+        threshold = self._parse_threshold(threshold)
+        if not cells or threshold is None:
+            return self._full(not include)
+
+        stacked = np.vstack([self._compare(numbers, kinds, condition_type, threshold)
+                             for numbers, kinds, _ in cells])
+
+        if count_requirement is None or count_requirement == "all":
+            condition = stacked.all(axis=0)
+        elif count_requirement == "any":
+            condition = stacked.any(axis=0)
+        elif isinstance(count_requirement, int):
+            condition = stacked.sum(axis=0) >= count_requirement
+        else:
+            return self._full(not include)
+        return condition if include else ~condition
+
+    def evaluate_ratio_criteria(self, ratio_name, condition_type, threshold, include=True):
+        """비율/WA3 기준 평가 (generate_ratio_criteria와 동일)."""
+        metric = self.metrics.metric_cells(ratio_name)
+        threshold = self._parse_threshold(threshold)
+        if metric is None or threshold is None:
+            return self._full(not include)
+
+        condition = self._compare(metric[0], metric[1], condition_type, threshold)
+        return condition if include else ~condition
+
+    def evaluate_data_availability_criteria(self, field_names, include=True):
+        """데이터 가용성 평가 (모든 셀이 숫자인지, generate_data_availability_criteria와 동일)."""
+        all_cells = [cell for field_name in field_names for cell in self._get_cells(field_name)]
+        if not all_cells:
+            return self._full(not include)
+
+        condition = np.vstack([kinds == NUMBER for _, kinds, _ in all_cells]).all(axis=0)
+        return condition if include else ~condition
+
+    def evaluate_wa3_numeric_criteria(self, ratio_name, condition_type, threshold, include=True):
+        """evaluate_ratio_criteria와 동일 — 위임."""
+        return self.evaluate_ratio_criteria(ratio_name, condition_type, threshold, include)
+
+    def evaluate_config(self, config):
+        """설정 딕셔너리(apply_quantitative_criteria_formulas와 동일 형식) 평가. "Yes"인 행이 True."""
+        criteria_type = config.get('type')
+
+        if criteria_type == 'text':
+            return self.evaluate_text_criteria(
+                field_name=config.get('field_name'),
+                condition_type=config.get('condition_type'),
+                value=config.get('value', ''),
+                include=config.get('include', True)
+            )
+        elif criteria_type == 'numeric':
+            return self.evaluate_numeric_criteria(
+                field_name=config.get('field_name'),
+                condition_type=config.get('condition_type'),
+                threshold=config.get('value', 0),
+                include=config.get('include', True),
+                count_requirement=config.get('count_requirement', None)
+            )
+        elif criteria_type in ('ratio', 'wa3'):
+            return self.evaluate_ratio_criteria(
+                ratio_name=config.get('field_name'),
+                condition_type=config.get('condition_type'),
+                threshold=config.get('value', 0),
+                include=config.get('include', True)
+            )
+        elif criteria_type == 'data_availability':
+            return self.evaluate_data_availability_criteria(
+                field_names=config.get('field_names', []),
+                include=config.get('include', True)
+            )
+
+        logger.warning("알 수 없는 기준 유형: %s", criteria_type)
+        return self._full(False)
+
+    def evaluate(self, criteria_configs, number_of_criteria=None):
+        """
+        전체 기준 평가 결과를 "Yes"/"No" DataFrame으로 반환합니다.
+
+        Returns:
+        - 컬럼: 기준1 ~ 기준N, 양적통과 (모든 기준이 Yes인 경우만 Yes)
+        """
+        if number_of_criteria is None:
+            number_of_criteria = len(criteria_configs)
+
+        masks = self.evaluate_masks(criteria_configs[:number_of_criteria])
+        result = {f"기준{i + 1}": np.where(mask, "Yes", "No") for i, mask in enumerate(masks) if mask is not None}
+
+        passed = self._full(number_of_criteria > 0)
+        for i in range(number_of_criteria):
+            mask = masks[i] if i < len(masks) else None
+            passed &= mask if mask is not None else False
+        result["양적통과"] = np.where(passed, "Yes", "No")
+        index = self.source_df.index if self.source_df is not None else pd.RangeIndex(self.num_rows)
+        return pd.DataFrame(result, index=index)
+
+    def evaluate_masks(self, criteria_configs):
+        """기준별 "Yes" bool 배열 목록 (None config는 None)."""
+        return [self.evaluate_config(config) if config is not None else None for config in criteria_configs]
+
+    # -------------------------
+    # 비교 규칙
+    # -------------------------
+    @staticmethod
+    def _parse_threshold(threshold):
+        """수식에 그대로 들어가는 기준값 → float (숫자가 아니면 수식 오류 → IFERROR 대체값)."""
+        try:
+            return float(threshold)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _compare(numbers, kinds, condition_type, threshold):
+        """셀 op 기준값 (공란은 0, 텍스트는 모든 숫자보다 큼)."""
+        op = _COMPARATORS.get(condition_type, np.greater)
+        condition = op(np.where(kinds == NUMBER, numbers, 0.0), threshold)
+        condition[kinds == TEXT] = op in (np.greater, np.greater_equal)
+        return condition
+
+    @staticmethod
+    def _text_blank(kinds, text):
+        """셀="" (공란 또는 빈 문자열)."""
+        blank = kinds == BLANK
+        if text is not None:
+            blank |= _broadcast(text, text[1] == "")
+        return blank
+
+    @staticmethod
+    def _text_equals(kinds, text, value):
+        """셀="값" (대소문자 무시, 숫자 셀은 항상 불일치)."""
+        if value == "":
+            return CriteriaEvaluator._text_blank(kinds, text)
+        if text is None:
+            return np.zeros(len(kinds), dtype=bool)
+        return _broadcast(text, _category_texts(text[1]).str.lower() == value.lower())
+
+    @staticmethod
+    def _text_countif(numbers, kinds, text, value):
+        """
+        COUNTIF(셀,"값")=1 — Excel COUNTIF 기준 규칙.
+
+        - 연산자 접두사(=, <>, <, >, <=, >=)가 없으면 "="
+        - "=": 숫자 기준은 같은 숫자 셀과 숫자로 해석되는 텍스트 셀, 텍스트 기준은 텍스트 셀
+          (대소문자 무시, 와일드카드 지원), 빈 기준은 공란
+        - "<>": "="의 반대 (공란과 형식이 다른 셀 포함)
+        - 크기 비교: 숫자 기준은 숫자 셀만, 텍스트 기준은 텍스트 셀만 (대소문자 무시 사전순)
+        """
+        symbol, operand = _split_countif_criterion(value)
+        if symbol in ("=", "<>"):
+            matched = CriteriaEvaluator._countif_equals(numbers, kinds, text, operand)
+            return matched if symbol == "=" else ~matched
+
+        compare = _COUNTIF_OPERATORS[symbol]
+        threshold = _finite_number(operand)
+        if threshold is not None:
+            return (kinds == NUMBER) & compare(numbers, threshold)
+        if text is None:
+            return np.zeros(len(kinds), dtype=bool)
+        return _broadcast(text, compare(_category_texts(text[1]).str.lower(), operand.lower()))
+
+    @staticmethod
+    def _countif_equals(numbers, kinds, text, operand):
+        """COUNTIF(셀,"=피연산자")=1."""
+        if operand == "":
+            return CriteriaEvaluator._text_blank(kinds, text)
+        number = _finite_number(operand)
+        if number is None:
+            if text is None:
+                return np.zeros(len(kinds), dtype=bool)
+            pattern = _wildcard_pattern(operand)
+            return _broadcast(text, _category_texts(text[1]).str.fullmatch(pattern, case=False))
+
+        matched = (kinds == NUMBER) & (numbers == number)
+        if text is not None:
+            matched |= _broadcast(text, [_finite_number(t) == number for t in _category_texts(text[1])])
+        return matched
+
+    @staticmethod
+    def _text_search(numbers, kinds, text, value):
+        """ISNUMBER(SEARCH("값",셀)) (대소문자 무시, 와일드카드 지원, 숫자는 텍스트로 변환)."""
+        if value == "":
+            return np.ones(len(kinds), dtype=bool)
+        pattern = _wildcard_pattern(value)
+
+        # 공란은 "" (패턴이 빈 문자열과 일치하면 참)
+        condition = np.full(len(kinds), re.search(pattern, "", re.IGNORECASE) is not None)
+        condition[kinds != BLANK] = False
+        if text is not None:
+            condition |= _broadcast(text, _category_texts(text[1]).str.contains(pattern, case=False, regex=True))
+
+        # 숫자 셀은 고유 값별로 텍스트 변환 후 비교
+        is_number = kinds == NUMBER
+        if is_number.any():
+            unique, inverse = np.unique(numbers[is_number], return_inverse=True)
+            texts = pd.Series([_excel_number_text(v) for v in unique.tolist()], dtype=object)
+            condition[is_number] = texts.str.contains(pattern, case=False, regex=True).to_numpy(dtype=bool)[inverse]
+        return condition
@@ -0,0 +1,305 @@
+# input_cache.py
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from columnar_store import ColumnarStore
+from loader import source_paths
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".quantitative_app", "input_cache")
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+CACHE_FORMAT_VERSION = 2  # 로더 동작이 바뀌면 올려서 기존 캐시 무효화
+MAX_INDEX_ENTRIES = 1000  # 내용 해시 인덱스에 보관할 최대 파일 수 (최근 해시한 파일 우선)
+
+_INDEX_FILE = "index.json"
+
+
+def _has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _file_hash(path):
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _combine_hashes(hashes):
+    """파일별 해시 목록 → 하나의 해시 (파일이 1개면 그 파일의 해시)."""
+    return hashes[0] if len(hashes) == 1 else hashlib.blake2b("".join(hashes).encode("ascii")).hexdigest()
+
+
+def content_hash(data_path):
+    """
+    Raw 파일(나눠 내보낸 여러 파일은 순서대로) 내용 해시 — 캐시 키와 같은 값.
+
+    ParsedInputCache와 달리 인덱스를 쓰지 않고 매번 파일 전체를 읽으므로, 크기/mtime을 유지한 채
+    내용만 바뀐 파일도 구분합니다 (증분 갱신 대상 판단용).
+
+    Raises:
+    - OSError: 파일을 읽을 수 없는 경우
+    """
+    return _combine_hashes([_file_hash(os.path.abspath(path)) for path in source_paths(data_path)])
+
+
+class ParsedInputCache:
+    """
+    파싱된 원본 DataFrame(source_df)의 디스크 캐시.
+
+    Raw 파일 내용을 cache_dir(기본값: ~/.quantitative_app/input_cache)에 복사하므로 payload의
+    useCache / CLI --cache / 화면의 "입력 캐시 사용"으로 켠 경우에만 사용하며, clear()
+    (CLI --clear-cache / 화면의 "캐시 비우기")로 전체 삭제합니다.
+
+    - 키: 파일 경로 + 크기 + 수정시각(mtime) + 내용 해시 + 요청 컬럼 목록
+      (경로/크기/mtime이 같으면 저장된 내용 해시를 재사용하여 재해싱을 생략,
+      나눠 내보낸 여러 파일은 파일별 해시를 순서대로 합친 값)
+    - 저장 형식: Parquet (pyarrow, requirements.txt) — pyarrow 없이 설치된 환경이거나 변환 실패,
+      다시 읽은 dtype이 달라지는 경우 pickle
+      (load_store()는 ColumnarStore 디렉터리로 저장하고 memmap으로 열기)
+    - 용량 제한: 전체 캐시 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    # -------------------------
+    # 공개 API
+    # -------------------------
+    def load(self, data_path, columns, read_fn):
+        """
+        캐시에 있으면 캐시에서, 없으면 read_fn(data_path, columns)로 읽은 뒤 캐시에 저장합니다.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            key = self._make_key(data_path, columns)
+            cached = self._read_entry(key)
+        except OSError as e:
+            # 캐시 디렉터리 권한 문제 등: 캐시 없이 진행
+            logger.warning("입력 캐시를 사용할 수 없습니다: %s", e)
+            return read_fn(data_path, columns)
+
+        if cached is not None:
+            logger.info("입력 캐시 사용: %s", data_path)
+            return cached
+
+        df = read_fn(data_path, columns)
+        try:
+            self._write_entry(key, df)
+            self._evict()
+        except OSError as e:
+            logger.warning("입력 캐시 저장 실패: %s", e)
+        return df
+
+    def load_store(self, data_path, columns, read_fn):
+        """
+        load()와 같지만 read_fn(data_path, columns)가 만든 ColumnarStore로 반환합니다.
+
+        캐시 항목은 컬럼별 .npy 디렉터리로 저장하고 memmap으로 열므로, 캐시 적중 시에는 텍스트 사전만
+        메모리에 올리고 숫자 배열은 필요한 페이지만 읽습니다.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            key = self._make_key(data_path, columns)
+            cached = self._read_store_entry(key)
+        except OSError as e:
+            logger.warning("입력 캐시를 사용할 수 없습니다: %s", e)
+            return read_fn(data_path, columns)
+
+        if cached is not None:
+            logger.info("입력 캐시 사용 (memmap): %s", data_path)
+            return cached
+
+        store = read_fn(data_path, columns)
+        try:
+            path = self._write_store_entry(key, store)
+            self._evict()
+            store = ColumnarStore.open(path)
+        except (OSError, ValueError) as e:
+            logger.warning("입력 캐시 저장 실패: %s", e)
+        return store
+
+    def clear(self):
+        """캐시 항목 전체 삭제."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            self._remove(os.path.join(self.cache_dir, name))
+
+    # -------------------------
+    # 키 계산
+    # -------------------------
+    def _make_key(self, data_path, columns):
+        content_hash = _combine_hashes([self._content_hash(path) for path in source_paths(data_path)])
+        columns_hash = hashlib.blake2b("\x1f".join(columns).encode("utf-8"), digest_size=8).hexdigest()
+        return f"v{CACHE_FORMAT_VERSION}_{content_hash[:32]}_{columns_hash}"
+
+    def _content_hash(self, data_path):
+        """파일 내용 해시. 경로/크기/mtime이 이전과 같으면 인덱스에 저장된 값을 재사용합니다."""
+        abs_path = os.path.abspath(data_path)
+        stat = os.stat(abs_path)
+        index = self._read_index()
+
+        entry = index.get(abs_path)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["hash"]
+
+        content_hash = _file_hash(abs_path)
+
+        index.pop(abs_path, None)  # 최근 해시한 파일이 뒤에 오도록 다시 추가
+        index[abs_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": content_hash}
+        self._write_index(index)
+        return content_hash
+
+    def _write_index(self, index):
+        """삭제/이동된 파일 항목을 제외하고 최근 MAX_INDEX_ENTRIES개만 저장합니다."""
+        paths = [path for path in index if os.path.exists(path)][-MAX_INDEX_ENTRIES:]
+        pruned = {path: index[path] for path in paths}
+        self._atomic_write(os.path.join(self.cache_dir, _INDEX_FILE),
+                           json.dumps(pruned, ensure_ascii=False).encode("utf-8"))
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, _INDEX_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    # -------------------------
+    # 항목 읽기/쓰기
+    # -------------------------
+    def _entry_paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".parquet", base + ".pkl"
+
+    def _read_entry(self, key):
+        for path in self._entry_paths(key):
+            if not os.path.exists(path):
+                continue
+            try:
+                df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_pickle(path)
+            except Exception as e:
+                logger.warning("입력 캐시 항목을 읽지 못해 삭제합니다 (%s): %s", path, e)
+                os.remove(path)
+                continue
+            os.utime(path)  # LRU: 최근 사용 시각 갱신
+            return df
+        return None
+
+    def _write_entry(self, key, df):
+        parquet_path, pickle_path = self._entry_paths(key)
+        if _has_pyarrow():
+            try:
+                self._atomic_write(parquet_path, lambda tmp: self._write_parquet(tmp, df))
+                return
+            except Exception as e:
+                # 혼합 타입 object 컬럼 등 Arrow 변환 불가 또는 dtype이 달라지는 경우 pickle로 저장
+                logger.info("Parquet 저장 실패, pickle로 저장합니다: %s", e)
+        self._atomic_write(pickle_path, lambda tmp: df.to_pickle(tmp))
+
+    @staticmethod
+    def _write_parquet(path, df):
+        """
+        df를 Parquet으로 저장하고 다시 읽어 dtype이 같은지 확인합니다.
+
+        숫자만 있는 object 컬럼(_restore_numbers 결과)은 Parquet에서 float64로 돌아오므로
+        캐시 적중 시 원본 파싱과 다른 DataFrame이 되지 않도록 이 경우 ValueError를 냅니다.
+        """
+        df.to_parquet(path, index=False)
+        restored = pd.read_parquet(path)
+        if not restored.dtypes.equals(df.dtypes):
+            changed = [column for column in df.columns if restored[column].dtype != df[column].dtype]
+            raise ValueError(f"Parquet 저장 후 dtype이 달라지는 컬럼: {changed}")
+
+    def _store_entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ".columnar")
+
+    def _read_store_entry(self, key):
+        path = self._store_entry_path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            store = ColumnarStore.open(path)
+        except Exception as e:
+            logger.warning("입력 캐시 항목을 읽지 못해 삭제합니다 (%s): %s", path, e)
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        os.utime(path)  # LRU: 최근 사용 시각 갱신
+        return store
+
+    def _write_store_entry(self, key, store):
+        """임시 디렉터리에 저장한 뒤 이름 변경 (이미 다른 실행이 저장했으면 그 항목 사용)."""
+        path = self._store_entry_path(key)
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            store.save(tmp_dir)
+            os.replace(tmp_dir, path)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.isdir(path):
+                raise
+        return path
+
+    def _atomic_write(self, path, content):
+        """임시 파일에 쓴 뒤 교체 (동시 실행 시 깨진 캐시 파일 방지). content는 bytes 또는 fn(tmp_path)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            if callable(content):
+                os.close(fd)
+                content(tmp_path)
+            else:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # -------------------------
+    # LRU 정리
+    # -------------------------
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name == _INDEX_FILE or name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            size = self._dir_size(path) if os.path.isdir(path) else stat.st_size
+            entries.append((stat.st_mtime, size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._remove(path)
+            except OSError as e:
+                # Windows에서 다른 실행이 memmap으로 열어 둔 항목 등
+                logger.info("입력 캐시 항목을 삭제하지 못했습니다 (%s): %s", path, e)
+                continue
+            total -= size
+            logger.info("입력 캐시 항목 삭제 (LRU): %s", path)
+
+    @staticmethod
+    def _dir_size(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    @staticmethod
+    def _remove(path):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
@@ -0,0 +1,134 @@
+# instrumentation.py
+# 파이프라인 단계별 소요 시간 / 메모리 측정
+import functools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+
+def current_rss_mb():
+    """현재 RSS (MB). psutil(requirements.txt)이 없으면 None."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return round(psutil.Process().memory_info().rss / _MB, 1)
+
+
+def peak_rss_mb():
+    """
+    프로세스 최대 RSS (MB, 프로세스 시작 이후 누적 최댓값 — 단계별 값은 PipelineProfiler 참고).
+
+    Unix는 resource 모듈, Windows는 psutil(peak_wset)로 측정하고 측정 불가 시 None.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return round(getattr(memory, "peak_wset", memory.rss) / _MB, 1)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return round(peak / (_MB if sys.platform == "darwin" else 1024), 1)
+
+
+class PipelineProfiler:
+    """
+    단계별 wall time / CPU time / RSS / (선택) tracemalloc 최대 할당량을 기록합니다.
+
+    RSS 항목:
+    - rss_start_mb / rss_end_mb: 단계 시작/종료 시점의 현재 RSS
+    - peak_rss_growth_mb: 단계 중 프로세스 최대 RSS가 늘어난 양 (이전 단계보다 많이 쓴 경우에만 0보다 큼)
+    - total의 peak_rss_mb: 프로세스 전체 최대 RSS
+
+    사용 예:
+        profiler = PipelineProfiler(trace_memory=True)
+        with profiler.stage("load"):
+            ...
+        profiler.counts.update(rows=1000)
+        profiler.to_dict()
+
+    trace_memory=True이면 tracemalloc으로 Python 객체 할당 최대치를 단계별로 측정합니다
+    (측정 중에는 실행 속도가 느려지므로 기본값은 False).
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.counts = {}
+        self._started_tracemalloc = False
+        self._peak_rss_mb = None  # 마지막 단계 종료 시점의 프로세스 최대 RSS
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록 하나를 단계 name으로 측정합니다 (예외가 나도 기록)."""
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+
+        rss_start = current_rss_mb()
+        peak_start = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            peak_end = self._peak_rss_mb = peak_rss_mb()
+            record = {
+                "name": name,
+                "wall_s": round(time.perf_counter() - wall_start, 4),
+                "cpu_s": round(time.process_time() - cpu_start, 4),
+                "rss_start_mb": rss_start,
+                "rss_end_mb": current_rss_mb(),
+                "peak_rss_growth_mb": None if peak_end is None else round(peak_end - peak_start, 1),
+            }
+            if self.trace_memory:
+                record["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / _MB, 1)
+            self.stages.append(record)
+            logger.debug("단계 %s: %.2fs (CPU %.2fs)", name, record["wall_s"], record["cpu_s"])
+
+    def timed(self, name):
+        """함수 실행을 단계 name으로 측정하는 데코레이터."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stop(self):
+        """이 profiler가 시작한 tracemalloc 추적을 종료합니다."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def to_dict(self):
+        """측정 결과 {"stages": [...], "total": {...}, **counts}."""
+        total = {
+            "wall_s": round(sum(s["wall_s"] for s in self.stages), 4),
+            "cpu_s": round(sum(s["cpu_s"] for s in self.stages), 4),
+            "peak_rss_mb": self._peak_rss_mb,
+        }
+        if self.trace_memory:
+            total["traced_peak_mb"] = max((s["traced_peak_mb"] for s in self.stages), default=None)
+        return {"stages": list(self.stages), "total": total, **self.counts}
+
+    def write_json(self, path):
+        """측정 결과를 JSON 파일로 저장합니다."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        logger.info("단계별 측정 결과 저장: %s", path)
@@ -0,0 +1,213 @@
+# loader.py
+import importlib.util
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import ColumnarStore
+
+logger = logging.getLogger(__name__)
+
+RESULTS_SHEET_NAME = "Results"
+# BvD가 행 수 제한으로 나눠 내보낸 시트: "Results", "Results (2)", "Results_3" 등
+RESULTS_SHEET_PATTERN = re.compile(r"^Results(?:[\s_-]*\(?\d+\)?)?$")
+CHUNK_ROWS = 50_000  # CSV/Parquet을 읽을 때 한 번에 변환하는 행 수
+
+
+def _has_calamine() -> bool:
+    """python-calamine 설치 여부 (설치된 경우 Rust 기반 엔진으로 빠르게 로딩)."""
+    return importlib.util.find_spec("python_calamine") is not None
+
+
+def _fallback_engine(data_path):
+    """
+    calamine을 쓸 수 없을 때의 pandas 엔진.
+
+    openpyxl은 이전 형식(.xls)을 읽지 못하므로 .xls는 엔진을 지정하지 않고 pandas가 고르게 합니다 (xlrd).
+    """
+    if str(data_path).lower().endswith(".xls"):
+        return None
+    return "openpyxl"
+
+
+def read_results_sheet(data_path, columns, sheet_name=RESULTS_SHEET_NAME) -> pd.DataFrame:
+    """
+    BvD Export의 Results 시트에서 필요한 컬럼만 읽어옵니다.
+
+    - columns에 포함된 헤더만 파싱 (나머지 컬럼은 읽지 않음)
+    - 헤더 바로 아래의 2번째 행(무가치한 헤더)은 읽는 단계에서 건너뜀
+    - python-calamine이 설치되어 있으면 calamine 엔진, 아니면 openpyxl read-only 모드 사용
+      (.xls는 pandas 기본 엔진 xlrd)
+
+    Parameters:
+    - data_path: 원본 Excel 파일 경로
+    - columns: 읽을 컬럼명 목록 (예: Analysis.ordered_columns)
+    - sheet_name: 시트명 (기본값: "Results")
+    """
+    wanted = set(columns)
+    read_kwargs = {
+        "sheet_name": sheet_name,
+        "header": 0,
+        "skiprows": [1],
+        "usecols": lambda name: name in wanted,
+    }
+
+    if _has_calamine():
+        try:
+            return pd.read_excel(data_path, engine="calamine", **read_kwargs)
+        except (ImportError, ValueError) as e:
+            # pandas < 2.2 등 calamine 엔진 미지원 환경
+            logger.info("calamine 엔진 사용 불가, 기본 엔진으로 읽습니다: %s", e)
+
+    # pandas의 openpyxl 엔진은 read_only=True 스트리밍 모드로 시트를 읽음
+    return pd.read_excel(data_path, engine=_fallback_engine(data_path), **read_kwargs)
+
+
+def results_sheet_names(data_path):
+    """
+    Excel 파일에서 Results 시트명 목록 (통합문서 순서).
+
+    나눠 내보낸 "Results (2)" 등도 포함하며, 해당 시트가 없으면 ["Results"]를 반환합니다
+    (read_results_sheet가 기존과 같은 "시트 없음" 오류를 내도록).
+    """
+    engine = "calamine" if _has_calamine() else _fallback_engine(data_path)
+    try:
+        with pd.ExcelFile(data_path, engine=engine) as book:
+            names = [name for name in book.sheet_names if RESULTS_SHEET_PATTERN.match(str(name))]
+    except (ImportError, ValueError) as e:
+        logger.info("시트 목록을 읽지 못해 '%s' 시트만 읽습니다: %s", RESULTS_SHEET_NAME, e)
+        return [RESULTS_SHEET_NAME]
+    return names or [RESULTS_SHEET_NAME]
+
+
+# -------------------------
+# 형식별 reader (청크 단위 DataFrame 생성)
+# -------------------------
+def _iter_excel_chunks(path, columns, chunk_rows):
+    """Results 시트마다 DataFrame 1개 (Excel 엔진은 행 단위 분할 읽기를 지원하지 않음)."""
+    for sheet_name in results_sheet_names(path):
+        yield read_results_sheet(path, columns, sheet_name)
+
+
+def _iter_csv_chunks(path, columns, chunk_rows):
+    """
+    CSV를 chunk_rows 행씩 읽습니다 (헤더 1행, columns에 포함된 컬럼만 파싱).
+
+    모든 값을 문자열로 읽은 뒤 숫자로 해석되는 값만 숫자로 바꾸므로, "n.a." 등이 섞인 숫자 컬럼도
+    Excel 셀과 같은 숫자/텍스트 구분을 유지하고 청크마다 dtype 추론이 달라지지 않습니다.
+    빈 칸만 결측으로 읽으며 "NA", "N/A", "null" 등은 Excel 셀처럼 텍스트로 남깁니다.
+
+    Excel Export처럼 헤더 아래에 무가치한 2번째 행이 있으면(읽은 컬럼이 모두 빈 칸인 첫 행) 건너뜁니다.
+    """
+    wanted = set(columns)
+    with pd.read_csv(path, usecols=lambda name: name in wanted, dtype=str, chunksize=chunk_rows,
+                     keep_default_na=False, na_values=[""], encoding="utf-8-sig") as reader:
+        for index, chunk in enumerate(reader):
+            if index == 0 and len(chunk) and chunk.iloc[0].isna().all():
+                chunk = chunk.iloc[1:].reset_index(drop=True)
+            yield _restore_numbers(chunk)
+
+
+def _iter_parquet_chunks(path, columns, chunk_rows):
+    """
+    Parquet을 chunk_rows 행씩 읽습니다 (pyarrow 필요, columns에 포함된 컬럼만 읽음).
+
+    Parquet은 컬럼 타입을 저장하므로 문자열 컬럼("12345" 등의 ID 포함)은 숫자로 바꾸지 않고 그대로 둡니다.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 파일을 읽으려면 pyarrow가 필요합니다 (pip install pyarrow).") from e
+
+    parquet_file = pq.ParquetFile(path)
+    wanted = set(columns)
+    present = [name for name in parquet_file.schema_arrow.names if name in wanted]
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=present):
+        yield batch.to_pandas()
+
+
+def _restore_numbers(df):
+    """
+    문자열 컬럼에서 숫자로 해석되는 값을 float로 바꿉니다 (결과 컬럼은 object dtype).
+
+    "0111"처럼 0으로 시작하는 숫자 문자열(산업 코드 등)과 나머지 텍스트는 그대로 둡니다.
+    "inf", "-Infinity" 등 무한대로 해석되는 문자열도 Excel에서는 텍스트이므로 그대로 둡니다.
+    """
+    for column in df.columns:
+        series = df[column]
+        if series.dtype.kind in "biufcmM":
+            continue
+        numbers = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        is_number = np.isfinite(numbers)
+        if not is_number.any():
+            continue
+        values = series.to_numpy(dtype=object, copy=True)
+        is_number[is_number] = [not (isinstance(v, str) and v[:1] == "0" and v[1:2].isdigit())
+                                for v in values[is_number]]
+        values[is_number] = numbers[is_number]
+        df[column] = values
+    return df
+
+
+# 확장자 → reader(path, columns, chunk_rows) — DataFrame 청크를 생성하는 함수를 추가하면 새 형식 지원
+INPUT_READERS = {
+    ".xlsx": _iter_excel_chunks,
+    ".xlsm": _iter_excel_chunks,
+    ".xls": _iter_excel_chunks,
+    ".csv": _iter_csv_chunks,
+    ".parquet": _iter_parquet_chunks,
+}
+
+
+def source_paths(data_path):
+    """rawFilePath(경로 1개 또는 나눠 내보낸 파일 경로 목록) → 경로 리스트."""
+    if isinstance(data_path, (list, tuple)):
+        return list(data_path)
+    return [data_path]
+
+
+def iter_input_chunks(data_path, columns, chunk_rows=CHUNK_ROWS):
+    """
+    Raw 입력(파일 1개 또는 여러 파일)을 파일 순서대로 DataFrame 청크로 읽습니다.
+
+    - 파일 형식은 확장자로 선택 (INPUT_READERS)
+    - 각 청크에는 columns에 포함된 컬럼만 있음 (파일에 없는 컬럼은 빠짐)
+
+    Raises:
+    - ValueError: 지원하지 않는 확장자
+    """
+    for path in source_paths(data_path):
+        extension = os.path.splitext(str(path))[1].lower()
+        reader = INPUT_READERS.get(extension)
+        if reader is None:
+            raise ValueError(f"지원하지 않는 Raw 파일 형식입니다: {path}")
+        yield from reader(path, columns, chunk_rows)
+
+
+def read_input(data_path, columns) -> pd.DataFrame:
+    """
+    Raw 입력을 하나의 DataFrame으로 읽습니다 (여러 파일/시트/청크는 순서대로 이어 붙임).
+
+    청크마다 columns만 파싱하므로 원본 전체가 메모리에 올라가지는 않지만, 이어 붙이는 동안
+    필요한 컬럼의 청크는 모두 보관합니다 — 메모리를 더 줄이려면 read_input_store()를 사용합니다.
+    """
+    frames = list(iter_input_chunks(data_path, columns))
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def read_input_store(data_path, columns) -> ColumnarStore:
+    """
+    Raw 입력을 ColumnarStore로 읽습니다.
+
+    청크를 읽는 즉시 컬럼 저장소(숫자 배열 + 텍스트 사전)로 변환하고 DataFrame은 버리므로,
+    한 번에 메모리에 있는 DataFrame은 청크 1개뿐입니다.
+    """
+    return ColumnarStore.concat(ColumnarStore.from_frame(chunk)
+                                for chunk in iter_input_chunks(data_path, columns))
@@ -0,0 +1,106 @@
+# mask_index.py
+# 기준별 통과 여부 비트셋 — 기준 부분집합/순서/하나 제외 조합의 통과 건수를 결과 파일 재생성 없이 계산
+import numpy as np
+
+# NumPy 2.0 미만에는 np.bitwise_count가 없으므로 바이트별 1비트 수 표로 계산
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words):
+    """uint64 배열의 1비트 수."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(_BYTE_POPCOUNT[words.view(np.uint8)].sum())
+
+
+class CriteriaMaskIndex:
+    """
+    기준별 "Yes" bool 배열을 np.packbits로 압축해 uint64 비트셋으로 보관합니다.
+
+    80,000행 기준 기준 1개가 10KB이고, 조합 질의는 비트 AND + popcount만 수행하므로
+    "기준4를 빼면 몇 개사가 더 통과하는가" 같은 질의를 CriteriaEvaluator 재평가 없이 바로 계산합니다.
+
+    기준 번호는 0부터 시작합니다 (결과 파일의 기준1 = 0). None mask(기준 컬럼이 비어 있음)는
+    모든 행이 탈락한 것으로 취급합니다 (양적통과 수식과 동일).
+    """
+
+    def __init__(self, masks, num_rows):
+        """
+        Parameters:
+        - masks: 기준별 "Yes" bool 배열 목록 (CriteriaEvaluator.evaluate_masks 결과)
+        - num_rows: 데이터 행 수
+        """
+        self.num_rows = num_rows
+        self.missing = frozenset(i for i, mask in enumerate(masks) if mask is None)
+        self.bits = np.zeros((len(masks), -(-num_rows // 64)), dtype=np.uint64)
+        for i, mask in enumerate(masks):
+            if mask is not None:
+                self._pack(mask, self.bits[i])
+        # 기준이 없을 때의 시작값 (행 수를 넘는 끝부분 비트는 0)
+        self._all = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        self._pack(np.ones(num_rows, dtype=bool), self._all)
+
+    @staticmethod
+    def _pack(mask, out):
+        packed = np.packbits(np.asarray(mask, dtype=bool))
+        out.view(np.uint8)[:len(packed)] = packed
+
+    def __len__(self):
+        return len(self.bits)
+
+    # -------------------------
+    # 조합 질의
+    # -------------------------
+    def _combined(self, indices):
+        combined = self._all.copy()
+        for i in indices:
+            np.bitwise_and(combined, self.bits[i], out=combined)
+        return combined
+
+    def count(self, indices=None):
+        """indices 기준을 모두 통과한 행 수 (None이면 전체 기준, 빈 목록이면 전체 행 수)."""
+        return _popcount(self._combined(range(len(self)) if indices is None else indices))
+
+    def survivors(self, indices=None):
+        """indices 기준을 모두 통과한 행의 bool 배열."""
+        combined = self._combined(range(len(self)) if indices is None else indices)
+        return np.unpackbits(combined.view(np.uint8), count=self.num_rows).astype(bool)
+
+    def cumulative(self, order=None):
+        """
+        order 순서대로 누적 적용한 [(탈락 건수, 통과 건수)] (evaluator.cumulative_counts와 같은 결과).
+
+        None mask 기준은 탈락 0건, 이후 통과 0건입니다 (결과 파일 20/21행 COUNTIFS와 동일).
+        """
+        survived = self._all.copy()
+        previous = self.num_rows
+        counts = []
+        for i in range(len(self)) if order is None else order:
+            if i in self.missing:
+                survived[:] = 0
+                counts.append((0, 0))
+                previous = 0
+                continue
+            np.bitwise_and(survived, self.bits[i], out=survived)
+            current = _popcount(survived)
+            counts.append((previous - current, current))
+            previous = current
+        return counts
+
+    def leave_one_out(self, indices=None):
+        """
+        {기준 번호: 그 기준만 빼고 나머지 indices 기준을 모두 통과한 행 수}.
+
+        앞/뒤 누적 AND를 한 번씩 만들어 기준마다 AND 1회 + popcount로 계산합니다.
+        기준 i를 뺐을 때 추가로 통과하는 행 수는 result[i] - count(indices)입니다.
+        """
+        indices = list(range(len(self)) if indices is None else indices)
+        prefix = [self._all]
+        for i in indices:
+            prefix.append(prefix[-1] & self.bits[i])
+        suffix = self._all
+        result = {}
+        for position in range(len(indices) - 1, -1, -1):
+            result[indices[position]] = _popcount(prefix[position] & suffix)
+            suffix = suffix & self.bits[indices[position]]
+        return {i: result[i] for i in indices}
@@ -0,0 +1,459 @@
+# metrics.py
+# Analysis 시트의 Flow / WA3 / 비율 / Unadjusted 수식을 NumPy로 직접 계산 (Excel 수식과 동일한 규칙)
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+# 셀 종류 (Excel 값 모델)
+BLANK, NUMBER, TEXT = 0, 1, 2
+NO_CODE = -1  # 텍스트가 아닌 셀의 사전 코드 (dictionary_encode)
+
+FLOW_ASSETS = [
+    "Debtors\nth USD ",
+    "Creditors\nth USD ",
+    "Stock\nth USD ",
+    "Intangible assets\nth USD ",
+    "Tangible fixed assets\nth USD ",
+    "Total assets\nth USD ",
+]
+
+WA3_METRICS = ["매출액", "영업이익", "영업비용", "재고자산", "연구개발비", "무형자산", "유형자산", "총자산", "매출원가", "종업원수"]
+
+# WA3 지표 → 원천 (P&L 연도별 컬럼의 기간 평균 또는 자산 Flow 가중평균)
+WA3_SOURCES = {
+    "매출액": ("pl", "Operating revenue (Turnover)\nth USD "),
+    "영업이익": ("pl", "Operating profit (loss) [EBIT]\nth USD "),
+    "영업비용": ("pl", "Other operating expense (income)\nth USD "),
+    "재고자산": ("flow", "Stock\nth USD "),
+    "연구개발비": ("pl", "Research & Development expenses\nth USD "),
+    "무형자산": ("flow", "Intangible assets\nth USD "),
+    "유형자산": ("flow", "Tangible fixed assets\nth USD "),
+    "총자산": ("flow", "Total assets\nth USD "),
+    "매출원가": ("pl", "Costs of goods sold\nth USD "),
+    "종업원수": ("pl", "Number of employees\n"),
+}
+
+# 비율 지표 → (분자, 분모) WA3 지표
+RATIO_SOURCES = {
+    "연구개발비/매출액": ("연구개발비", "매출액"),
+    "영업비용/매출액": ("영업비용", "매출액"),
+    "무형자산/총자산": ("무형자산", "총자산"),
+    "유형자산/총자산": ("유형자산", "총자산"),
+    "재고자산/총자산": ("재고자산", "총자산"),
+    "재고자산보유일수": ("재고자산", "매출원가"),  # 365/(매출원가/재고자산)
+}
+
+FLOW_LABELS = {
+    "Debtors\nth USD ": "매출채권",
+    "Creditors\nth USD ": "매입채무",
+    "Stock\nth USD ": "재고자산",
+    "Intangible assets\nth USD ": "무형자산",
+    "Tangible fixed assets\nth USD ": "유형자산",
+    "Total assets\nth USD ": "총자산",
+}
+
+UNADJUSTED_METRICS = ["OM", "MTC", "BR"]
+
+OPERATING_PROFIT = "Operating profit (loss) [EBIT]\nth USD "
+OPERATING_REVENUE = "Operating revenue (Turnover)\nth USD "
+GROSS_PROFIT = "Gross profit\nth USD "
+OPERATING_EXPENSE = "Other operating expense (income)\nth USD "
+
+
+def classify_cells(series):
+    """
+    컬럼 값을 Excel 셀 모델로 분류합니다.
+
+    Returns:
+    - (numbers, kinds)
+      numbers: float64 배열 (숫자가 아닌 셀은 NaN)
+      kinds: int8 배열 (BLANK / NUMBER / TEXT)
+    """
+    values = series.to_numpy()
+    if values.dtype.kind in "fiu":
+        numbers = values.astype(np.float64)
+        kinds = np.where(np.isnan(numbers), BLANK, NUMBER).astype(np.int8)
+        return numbers, kinds
+
+    values = values.astype(object)
+    blank = pd.isna(values)
+    is_number = np.fromiter(
+        (isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in values),
+        dtype=bool, count=len(values),
+    ) & ~blank
+    numbers = np.full(len(values), np.nan)
+    numbers[is_number] = values[is_number].astype(np.float64)
+    kinds = np.full(len(values), TEXT, dtype=np.int8)
+    kinds[blank] = BLANK
+    kinds[is_number] = NUMBER
+    return numbers, kinds
+
+
+def dictionary_encode(series, kinds):
+    """
+    텍스트 셀 값의 사전 인코딩 (category dtype 컬럼은 기존 사전을 그대로 사용).
+
+    Returns:
+    - (codes, categories)
+      codes: int32 배열 (텍스트가 아닌 셀은 NO_CODE)
+      categories: 고유 값 object 배열
+    """
+    is_text = kinds == TEXT
+    codes = np.full(len(kinds), NO_CODE, dtype=np.int32)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes[is_text] = series.cat.codes.to_numpy()[is_text]
+        return codes, series.cat.categories.to_numpy(dtype=object)
+    if not is_text.any():
+        return codes, np.empty(0, dtype=object)
+    text_codes, categories = pd.factorize(series.to_numpy(dtype=object)[is_text], use_na_sentinel=False)
+    codes[is_text] = text_codes
+    return codes, np.asarray(categories, dtype=object)
+
+
+def safe_divide(numerator, denominator):
+    """IFERROR(분자/분모, 0)과 동일 (분모가 0이거나 NaN(#VALUE!)이면 0)."""
+    result = np.zeros(np.broadcast(numerator, denominator).shape)
+    valid = (denominator != 0) & ~np.isnan(numerator) & ~np.isnan(denominator)
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+
+class PrefixSums:
+    """
+    연도별 배열의 누적합 — 연속된 임의 연도 구간의 합/평균을 행마다 O(1)로 계산합니다.
+
+    prefix[k]는 first_year부터 k개 연도의 합(prefix[0] = 0)이며, 앞에서부터 차례로 더하므로
+    first_year에서 시작하는 구간의 합은 연도별로 직접 더한 SUM과 비트 단위로 같습니다.
+    """
+
+    def __init__(self, first_year, yearly):
+        """
+        Parameters:
+        - first_year: yearly[0]의 연도
+        - yearly: 연도 순서의 행별 값 배열 목록 (SUM 기준 값, 공란/텍스트는 0)
+        """
+        self.first_year = first_year
+        self.last_year = first_year + len(yearly) - 1
+        self.prefix = np.zeros((len(yearly) + 1, len(yearly[0]) if yearly else 0))
+        if yearly:
+            np.cumsum(np.vstack(yearly), axis=0, out=self.prefix[1:])
+
+    def _index(self, year):
+        if not self.first_year - 1 <= year <= self.last_year:
+            raise ValueError(f"누적합 범위({self.first_year}~{self.last_year}) 밖의 연도입니다: {year}")
+        return year - self.first_year + 1
+
+    def window_sum(self, start_year, end_year):
+        """start_year ~ end_year 합 (=SUM(연도별 값))."""
+        if start_year > end_year:
+            raise ValueError(f"시작연도가 종료연도보다 큽니다: {start_year} > {end_year}")
+        return self.prefix[self._index(end_year)] - self.prefix[self._index(start_year - 1)]
+
+    def window_average(self, start_year, end_year):
+        """start_year ~ end_year 평균 (=SUM/연수, WA3와 같은 규칙)."""
+        return self.window_sum(start_year, end_year) / (end_year - start_year + 1)
+
+    def rolling_averages(self, length):
+        """
+        길이 length인 모든 연속 구간의 평균.
+
+        Returns:
+        - {종료연도: 배열} (first_year + length - 1 ~ last_year)
+
+        Raises:
+        - ValueError: length가 1 미만인 경우
+        """
+        if length < 1:
+            raise ValueError(f"구간 길이는 1 이상이어야 합니다: {length}")
+        averages = (self.prefix[length:] - self.prefix[:-length]) / length
+        return {self.first_year + length - 1 + i: values for i, values in enumerate(averages)}
+
+
+class ScreeningMetrics:
+    """
+    원본 DataFrame(source_df)으로부터 Flow / WA3 / 비율 / Unadjusted 지표를 컬럼 단위로 계산합니다.
+    store(ColumnarStore)가 주어지면 셀 분류 없이 저장소의 (memmap) 배열을 그대로 사용합니다.
+    cache(dict)를 넘기면 연도별 계산 결과(셀 분류, SUM 값, 연도별 Flow)를 같은 원본의 다른 분석 기간과
+    공유합니다 (기간이 겹치는 연도는 한 번만 계산).
+
+    Excel 수식 규칙을 그대로 따릅니다.
+    - SUM은 공란/텍스트 셀을 무시 (0으로 취급), 사칙연산에서 공란은 0, 텍스트는 오류
+    - IFERROR(x/0, 0) → 0, 재고자산보유일수의 IFERROR(..., "") → 텍스트 ""
+    """
+
+    def __init__(self, source_df, start_year, end_year, store=None, cache=None):
+        self.source_df = source_df
+        self.store = store
+        self.start_year = start_year
+        self.end_year = end_year
+        self.num_years = end_year - start_year + 1
+        self.num_rows = len(store) if store is not None else len(source_df)
+        # {("cells" | "text" | "sum", 컬럼명), ("flow", 자산, 연도) 또는
+        #  ("prefix", "pl" | "flow", 기본명, 첫 연도, 마지막 연도): 결과}
+        self._cache = cache if cache is not None else {}
+
+    # -------------------------
+    # Raw 셀
+    # -------------------------
+    def cells(self, column):
+        """Raw 컬럼의 (numbers, kinds). 원본에 없는 컬럼은 전체 공란."""
+        key = ("cells", column)
+        if key not in self._cache:
+            if self.store is not None:
+                self._cache[key] = self.store.cells(column) or self._blank_cells()
+            elif column in self.source_df.columns:
+                self._cache[key] = classify_cells(self.source_df[column])
+            else:
+                self._cache[key] = self._blank_cells()
+        return self._cache[key]
+
+    def text_codes(self, column):
+        """Raw 컬럼 텍스트 셀의 (codes, categories) — dictionary_encode 참고. 원본에 없는 컬럼은 None."""
+        key = ("text", column)
+        if key not in self._cache:
+            if self.store is not None:
+                self._cache[key] = self.store.text_codes(column)
+            elif column in self.source_df.columns:
+                self._cache[key] = dictionary_encode(self.source_df[column], self.cells(column)[1])
+            else:
+                self._cache[key] = None
+        return self._cache[key]
+
+    def _blank_cells(self):
+        return np.full(self.num_rows, np.nan), np.zeros(self.num_rows, dtype=np.int8)
+
+    def sum_values(self, column):
+        """SUM 기준 값 (숫자만, 공란/텍스트는 0)."""
+        key = ("sum", column)
+        if key not in self._cache:
+            numbers, kinds = self.cells(column)
+            self._cache[key] = np.where(kinds == NUMBER, numbers, 0.0)
+        return self._cache[key]
+
+    def arithmetic_values(self, column):
+        """
+        사칙연산 기준 값 (공란은 0, 숫자로 해석되는 텍스트(예: "150")는 그 숫자,
+        나머지 텍스트는 #VALUE! 오류 → NaN). Excel의 =a/b는 숫자 텍스트를 숫자로 변환합니다.
+        """
+        key = ("arith", column)
+        if key not in self._cache:
+            numbers, kinds = self.cells(column)
+            values = np.where(kinds == NUMBER, numbers, np.where(kinds == BLANK, 0.0, np.nan))
+            is_text = kinds == TEXT
+            if is_text.any():
+                # 텍스트는 고유 값(사전)별로 한 번만 변환
+                codes, categories = self.text_codes(column)
+                coerced = pd.to_numeric(pd.Series(categories, dtype=object), errors="coerce").to_numpy(dtype=float)
+                coerced = np.where(np.isfinite(coerced), coerced, np.nan)  # "inf" 등은 Excel에서도 #VALUE!
+                values[is_text] = coerced[codes[is_text]]
+            self._cache[key] = values
+        return self._cache[key]
+
+    def yearly_sum(self, base_name, years):
+        """연속된 연도별 컬럼 범위의 SUM."""
+        years = list(years)
+        return self._prefix_sums("pl", base_name, years[0], years[-1]).window_sum(years[0], years[-1])
+
+    # -------------------------
+    # 누적합 (임의 구간 평균)
+    # -------------------------
+    def prefix_sums(self, account, first_year=None, last_year=None):
+        """
+        계정의 연도별 누적합 (PrefixSums). 3WA / 5WA / 이동평균 / 최근 연도 제외 평균 등
+        여러 평균 기준을 연도 수와 무관하게 구간별 O(1)로 비교할 때 사용합니다.
+
+        Parameters:
+        - account: WA3 지표명(WA3_SOURCES, 예: "매출액", "총자산"), Flow 자산(FLOW_ASSETS) 또는
+          Raw 연도별 컬럼 기본명 (예: "Sales\nth USD ")
+        - first_year, last_year: 누적 범위 (기본값: 분석 기간)
+
+        분석 기간 밖 연도는 해당 연도 컬럼이 원본(source_df/store)에 있어야 합니다. Analysis는
+        ordered_columns(분석 기간)만 적재하므로, 그 밖의 연도는 해당 컬럼을 포함한 원본으로
+        ScreeningMetrics를 직접 만들어 사용합니다. 분석 기간 안의 없는 컬럼은 시트 수식과 같이 공란(0)입니다.
+
+        Raises:
+        - ValueError: 분석 기간 밖 연도의 컬럼이 원본에 없는 경우
+        """
+        source, base_name = WA3_SOURCES.get(account) or (("flow", account) if account in FLOW_ASSETS else ("pl", account))
+        first_year = first_year or self.start_year
+        last_year = last_year or self.end_year
+        self._require_loaded_years(source, base_name, first_year, last_year)
+        return self._prefix_sums(source, base_name, first_year, last_year)
+
+    def _require_loaded_years(self, source, base_name, first_year, last_year):
+        """분석 기간 밖 연도의 컬럼이 원본에 없으면 ValueError (전체 공란으로 계산되는 것 방지)."""
+        outside = [year for year in range(first_year, last_year + 1) if not self.start_year <= year <= self.end_year]
+        if source == "flow":
+            columns = [f"{base_name}{y}" for year in outside for y in (year - 1, year)]
+        else:
+            columns = [f"{base_name}{year}" for year in outside]
+        missing = [column for column in dict.fromkeys(columns) if not self._has_column(column)]
+        if missing:
+            raise ValueError(f"원본에 적재되지 않은 연도 컬럼입니다: {missing}")
+
+    def _has_column(self, column):
+        if self.store is not None:
+            return column in self.store
+        return column in self.source_df.columns
+
+    def window_average(self, account, start_year, end_year):
+        """
+        계정의 start_year ~ end_year 평균 (prefix_sums 참고).
+
+        Raises:
+        - ValueError: 분석 기간 밖 연도의 컬럼이 원본에 없는 경우
+        """
+        if start_year <= self.end_year and end_year >= self.start_year:
+            # 분석 기간과 겹치면 분석 기간 누적합을 넓혀 flow_wa / wa3와 같은 결과를 공유
+            first_year, last_year = min(start_year, self.start_year), max(end_year, self.end_year)
+        else:
+            first_year, last_year = start_year, end_year
+        return self.prefix_sums(account, first_year, last_year).window_average(start_year, end_year)
+
+    def _prefix_sums(self, source, base_name, first_year, last_year):
+        key = ("prefix", source, base_name, first_year, last_year)
+        if key not in self._cache:
+            if source == "flow":
+                yearly = [self.flow_year(base_name, year) for year in range(first_year, last_year + 1)]
+            else:
+                yearly = [self.sum_values(f"{base_name}{year}") for year in range(first_year, last_year + 1)]
+            self._cache[key] = PrefixSums(first_year, yearly)
+        return self._cache[key]
+
+    # -------------------------
+    # Flow (기초/기말 평균, 가중평균)
+    # -------------------------
+    @cached_property
+    def flow(self):
+        """{자산: [연도별 (전기+당기)/2 배열]} — =IFERROR(SUM(전기:당기)/2,0)."""
+        return {
+            asset: [self.flow_year(asset, year) for year in range(self.start_year, self.end_year + 1)]
+            for asset in FLOW_ASSETS
+        }
+
+    def flow_year(self, asset, year):
+        """year의 Flow 값 (전기+당기)/2."""
+        key = ("flow", asset, year)
+        if key not in self._cache:
+            self._cache[key] = (self.sum_values(f"{asset}{year - 1}") + self.sum_values(f"{asset}{year}")) / 2
+        return self._cache[key]
+
+    @cached_property
+    def flow_wa(self):
+        """{자산: 가중평균 배열} — =IFERROR(SUM(Flow 연도별)/num_years,0)."""
+        return {asset: self.window_average(asset, self.start_year, self.end_year) for asset in FLOW_ASSETS}
+
+    # -------------------------
+    # WA3 / 비율
+    # -------------------------
+    @cached_property
+    def wa3(self):
+        """{WA3 지표명: 배열} (WA3_METRICS 순서)."""
+        result = {}
+        for name in WA3_METRICS:
+            source, base_name = WA3_SOURCES[name]
+            if source == "flow":
+                result[name] = self.flow_wa[base_name]
+            else:
+                result[name] = self.window_average(name, self.start_year, self.end_year)
+        return result
+
+    @cached_property
+    def ratios(self):
+        """{비율명: (numbers, kinds)} — 재고자산보유일수는 오류 시 텍스트("")."""
+        result = {}
+        for name, (numerator, denominator) in RATIO_SOURCES.items():
+            num = self.wa3[numerator]
+            den = self.wa3[denominator]
+            if name == "재고자산보유일수":
+                # =IFERROR(365/(매출원가/재고자산), "")
+                valid = (num != 0) & (den != 0)
+                values = np.full(self.num_rows, np.nan)
+                values[valid] = 365 / (den[valid] / num[valid])
+                kinds = np.where(valid, NUMBER, TEXT).astype(np.int8)
+            else:
+                values = safe_divide(num, den)
+                kinds = np.full(self.num_rows, NUMBER, dtype=np.int8)
+            result[name] = (values, kinds)
+        return result
+
+    # -------------------------
+    # Unadjusted (OM / MTC / BR)
+    # -------------------------
+    @cached_property
+    def unadjusted(self):
+        """
+        {지표: {"yearly": [연도별 배열], "average": 기간 배열, "max_min": 배열}}
+
+        - OM  = 영업이익 / 매출액
+        - MTC = 영업이익 / (매출액 - 영업이익)
+        - BR  = 매출총이익 / 영업비용
+        연도별 값은 =IFERROR(a/b,0), 기간 값은 =IFERROR(SUM(a)/SUM(b),0),
+        Max-Min은 연도별 값의 =IFERROR(MAX-MIN,0)과 동일합니다.
+        """
+        years = range(self.start_year, self.end_year + 1)
+        op = [self.arithmetic_values(f"{OPERATING_PROFIT}{year}") for year in years]
+        rev = [self.arithmetic_values(f"{OPERATING_REVENUE}{year}") for year in years]
+        gp = [self.arithmetic_values(f"{GROSS_PROFIT}{year}") for year in years]
+        opex = [self.arithmetic_values(f"{OPERATING_EXPENSE}{year}") for year in years]
+
+        op_sum = self.yearly_sum(OPERATING_PROFIT, years)
+        rev_sum = self.yearly_sum(OPERATING_REVENUE, years)
+        gp_sum = self.yearly_sum(GROSS_PROFIT, years)
+        opex_sum = self.yearly_sum(OPERATING_EXPENSE, years)
+
+        components = {
+            "OM": ([safe_divide(o, r) for o, r in zip(op, rev)], safe_divide(op_sum, rev_sum)),
+            "MTC": ([safe_divide(o, r - o) for o, r in zip(op, rev)], safe_divide(op_sum, rev_sum - op_sum)),
+            "BR": ([safe_divide(g, e) for g, e in zip(gp, opex)], safe_divide(gp_sum, opex_sum)),
+        }
+
+        result = {}
+        for name, (yearly, average) in components.items():
+            stacked = np.vstack(yearly)
+            result[name] = {
+                "yearly": yearly,
+                "average": average,
+                "max_min": stacked.max(axis=0) - stacked.min(axis=0),
+            }
+        return result
+
+    def to_frame(self):
+        """
+        모든 지표를 하나의 DataFrame으로 반환합니다 (Excel 없이 후속 필터링/분석용).
+
+        컬럼명은 시트 헤더와 동일한 규칙을 따릅니다.
+        (예: "매출채권 (Flow) FY21", "매출채권 (Flow) 3WA", "매출액", "OM FY21", "OM FY21-23", "OM Max-Min")
+        """
+        year_labels = [f"FY{year - 2000}" for year in range(self.start_year, self.end_year + 1)]
+        period_label = f"FY{self.start_year - 2000}-{self.end_year - 2000}"
+        columns = {}
+
+        for asset, label in FLOW_LABELS.items():
+            for year_label, values in zip(year_labels, self.flow[asset]):
+                columns[f"{label} (Flow) {year_label}"] = values
+            columns[f"{label} (Flow) {self.num_years}WA"] = self.flow_wa[asset]
+
+        for name in WA3_METRICS:
+            columns[name] = self.wa3[name]
+        for name, (values, _) in self.ratios.items():
+            columns[name] = values
+
+        for name in UNADJUSTED_METRICS:
+            metric = self.unadjusted[name]
+            for year_label, values in zip(year_labels, metric["yearly"]):
+                columns[f"{name} {year_label}"] = values
+            columns[f"{name} {period_label}"] = metric["average"]
+            columns[f"{name} Max-Min"] = metric["max_min"]
+
+        index = self.source_df.index if self.source_df is not None else pd.RangeIndex(self.num_rows)
+        return pd.DataFrame(columns, index=index)
+
+    def metric_cells(self, name):
+        """WA3 또는 비율 지표의 (numbers, kinds). 알 수 없는 지표는 None."""
+        if name in self.wa3:
+            return self.wa3[name], np.full(self.num_rows, NUMBER, dtype=np.int8)
+        if name in self.ratios:
+            return self.ratios[name]
+        return None
@@ -0,0 +1,95 @@
+# preview.py
+# 기준 편집 중 탈락/통과 건수 미리보기 (결과 파일을 만들지 않고 CriteriaEvaluator로 바로 계산)
+import json
+
+from evaluator import cumulative_counts
+from mask_index import CriteriaMaskIndex
+from processor import Analysis, DirectCriteriaConverter
+
+MASK_CACHE_SIZE = 256  # 보관할 기준별 평가 결과 수 (80k행 기준 1건당 약 80KB)
+
+
+class FunnelPreview:
+    """
+    Raw 데이터를 한 번 적재해 두고, 기준 목록이 바뀔 때마다 insert_pass_fail_summary와 같은
+    누적 탈락/통과 건수를 다시 계산합니다.
+
+    기준 설정별 평가 결과(bool 배열)를 보관하므로 한 행만 바뀌면 그 기준만 다시 평가하고,
+    나머지는 누적 AND / count_nonzero만 수행합니다.
+    """
+
+    def __init__(self, analysis):
+        """
+        Parameters:
+        - analysis: Raw 데이터를 적재한 Analysis (_populate_raw_data_from_excel 실행 후)
+        """
+        self.start_year = analysis.start_year
+        self.end_year = analysis.end_year
+        self.row_count = analysis.data_row_count
+        self.ordered_columns = analysis.ordered_columns
+        self.evaluator = analysis.get_evaluator()
+        self._masks = {}
+
+    @classmethod
+    def load(cls, data_path, start_year, end_year, input_cache=None):
+        """
+        Raw 파일을 적재한 FunnelPreview를 만듭니다 (main_processor와 같은 로딩 경로/입력 캐시 사용).
+
+        Raises:
+        - ValueError: Raw 파일에서 데이터를 읽지 못한 경우
+        """
+        analysis = Analysis(start_year=start_year, end_year=end_year, data_path=data_path,
+                            write_only=True, input_cache=input_cache)
+        analysis._populate_raw_data_from_excel()
+        if not analysis.has_raw_data():
+            raise ValueError(f"Raw 파일에서 데이터를 읽지 못했습니다: {data_path}")
+        preview = cls(analysis)
+        preview.warm_up()
+        return preview
+
+    def warm_up(self):
+        """
+        Raw 셀 분류와 Flow/WA3/비율 지표를 미리 계산합니다 (로딩 스레드에서 호출).
+
+        이후 기준 변경 시에는 비교 연산만 수행하므로 첫 미리보기도 빠르게 갱신됩니다.
+        """
+        metrics = self.evaluator.metrics
+        for column in self.ordered_columns:
+            metrics.cells(column)
+        metrics.ratios  # flow / flow_wa / wa3 포함
+
+    def counts(self, criteria_list):
+        """
+        기준 목록(criteriaList 형식)의 행별 (탈락 건수, 통과 건수) — 결과 파일 20/21행과 같은 누적 건수.
+
+        DirectCriteriaConverter로 변환할 수 없는 행은 main_processor에서도 빠지므로
+        누적 계산에서 제외하고 None을 반환합니다.
+        """
+        converter = DirectCriteriaConverter(self.start_year, self.end_year)
+        configs = [next(iter(converter.convert([row])), None) for row in criteria_list]
+        valid = [config for config in configs if config is not None]
+        funnel = iter(cumulative_counts([self._mask(config) for config in valid], self.row_count))
+        return [next(funnel) if config is not None else None for config in configs]
+
+    def mask_index(self, criteria_list):
+        """
+        기준 목록의 CriteriaMaskIndex (변환할 수 없는 행은 빼고 결과 파일의 기준1, 기준2... 순서).
+
+        "기준4를 빼면 몇 개사가 더 통과하는가" 등 조합 질의용 — 보관된 평가 결과를 재사용합니다.
+        """
+        configs = DirectCriteriaConverter(self.start_year, self.end_year).convert(criteria_list)
+        return CriteriaMaskIndex([self._mask(config) for config in configs], self.row_count)
+
+    def _mask(self, config):
+        """설정별 "Yes" bool 배열 (같은 설정은 보관된 결과 재사용)."""
+        if config is None:
+            return None
+
+        key = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+        mask = self._masks.get(key)
+        if mask is None:
+            if len(self._masks) >= MASK_CACHE_SIZE:
+                self._masks.clear()
+            mask = self.evaluator.evaluate_config(config)
+            self._masks[key] = mask
+        return mask
@@ -1,11 +1,26 @@
+import json
 import logging
 import os
+from copy import copy
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.packaging.custom import StringProperty
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
 
+from columnar_store import ColumnarStore
+from evaluator import CriteriaEvaluator, cumulative_counts
+from input_cache import ParsedInputCache, content_hash
+from instrumentation import PipelineProfiler
+from loader import read_input, read_input_store, source_paths
+from mask_index import CriteriaMaskIndex
+from metrics import FLOW_ASSETS, NUMBER, UNADJUSTED_METRICS, WA3_METRICS, ScreeningMetrics
+from workbook_patch import (SHEET_CRC_KEY, WorkbookPatchError, patch_worksheet, read_json_property, save_workbook,
+                            sheet_unchanged)
+
 logger = logging.getLogger(__name__)
 
 # --- 상수 및 기본 설정 ---
@@ -76,7 +91,44 @@ THIN_BORDER = Border(left=Side(style='thin'),
                      bottom=Side(style='thin'))
 
 BOLD_FONT = Font(bold=True)
+# 고유 값이 적은 텍스트 컬럼 — 적재 시 category dtype으로 변환 (연도별 컬럼은 기본명)
+CATEGORICAL_COLUMNS = ["Consolidation code", "SH - BvD Independence Indicator", "Listing status", "Country", "Status", "Main activity"]
+CATEGORICAL_COLUMNS_YEARLY = ["Audit status\n"]
+RAW_CHUNK_ROWS = 10000  # Raw 데이터 NaN 변환/기록 단위 (행)
+REJECTED_SHEET_TITLE = "탈락"
+REJECTED_ID_COLUMNS = ["BvD ID number", "Company name Latin alphabet"]
+EXPORT_ID_COLUMN = "BvD ID number"  # 계산값 내보내기(export_values) 파일의 행 식별 컬럼
+VALUES_EXPORT_FORMATS = ("parquet", "csv")
 CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+HEADER_ALIGN = Alignment(wrap_text=True, horizontal='center', vertical='center')
+
+# 탈락/통과 요약 방식
+# - "countifs": 기준 i마다 기준 1..i 범위를 모두 나열한 COUNTIFS (기준 수의 제곱에 비례하는 범위 스캔)
+# - "helper":   숨김 보조 컬럼(기준 i까지 누적 통과 여부 1/0)을 두고 요약 셀마다 범위 1~2개만 스캔
+# - "values":   CriteriaEvaluator로 계산한 누적 통과/탈락 건수를 값으로 기록
+SUMMARY_MODES = ("countifs", "helper", "values")
+
+# main_processor 실행 단계 (진행률 보고/취소 확인 단위, 실행 순서)
+PIPELINE_STAGES = ("format", "load", "formulas", "criteria", "styles", "save")
+# 증분 갱신(기준만 변경) 실행 단계 — 헤더 영역만 만들고 이전 결과 파일의 기준 관련 셀만 교체
+INCREMENTAL_STAGES = ("format", "load", "criteria", "save")
+# 계산값만 내보내는(valuesOnly) 실행 단계 — 통합문서를 만들지 않음
+VALUES_ONLY_STAGES = ("load", "export")
+
+# 결과 파일에 저장하는 시트 구성 정보(사용자 지정 문서 속성) — 증분 갱신 가능 여부 판단용
+LAYOUT_PROPERTY = "quantitative_app_layout"
+LAYOUT_STATE_VERSION = 2  # 시트 배치/구성 정보 형식이 바뀌면 올려서 이전 결과 파일의 증분 갱신 방지
+
+# 수식 템플릿 컴파일 시 행 번호 자리에 넣는 표식 (수식/사용자 입력에 나올 수 없는 문자열)
+ROW_PLACEHOLDER = "\x00ROW\x00"
+
+
+class ProcessingCancelled(Exception):
+    """main_processor 실행 중 cancel_event로 작업이 취소된 경우."""
+
+
+class RawDataError(Exception):
+    """require_data=True로 실행했는데 Raw 파일에서 데이터를 읽지 못한 경우."""
 
 
 def _escape_excel_string(value: str) -> str:
@@ -416,7 +468,12 @@ class CriteriaFormulaGenerator:
         )
 
 class Analysis:
-    def __init__(self, tested_party="test", start_year=2021, end_year=2023, name="test", number_of_criteria=5, data_path="", criteria_list=None, output_path=None):
+    def __init__(self, tested_party="test", start_year=2021, end_year=2023, name="test", number_of_criteria=5, data_path="", criteria_list=None, output_path=None, write_only=False, input_cache=None, criteria_values=False, metric_values=False, summary_mode="countifs", prefilter_configs=None, rejected_sheet=False, columnar_store=False):
+        # write_only=True: self.wb/self.ws에는 헤더 영역만 작성하고,
+        # 데이터 행은 save_file()에서 write-only 통합문서로 한 행씩 스트리밍합니다.
+        # (메모리는 행 수와 무관하지만 저장 시간은 셀 XML 직렬화가 대부분 — 5,000행·3개년 약 15초,
+        #  20,000행은 그 4배 정도)
+        self.write_only = write_only
         self.wb = Workbook()
         self.ws = self.wb.active
         self.tested_party = tested_party
@@ -427,6 +484,29 @@ class Analysis:
         self.data_path = data_path
         self.criteria_list = criteria_list if criteria_list else []
         self.output_path = output_path
+        self.input_cache = input_cache  # ParsedInputCache (None이면 매번 원본 파싱)
+        # columnar_store=True: 원본을 object DataFrame(source_df) 대신 ColumnarStore(raw_store)로 보관
+        # (입력 캐시 사용 시 memmap으로 열어 지표를 복사 없이 계산)
+        self.columnar_store = columnar_store
+        # criteria_values=True: 양적기준/양적통과 컬럼에 수식 대신 Python에서 계산한 Yes/No 값 기록
+        self.criteria_values = criteria_values
+        # metric_values=True: Flow/WA3/비율/Unadjusted 컬럼에 수식 대신 ScreeningMetrics로 계산한 값 기록
+        self.metric_values = metric_values
+        # summary_mode: 탈락/통과 요약(20/21행) 방식 (SUMMARY_MODES 참고)
+        if summary_mode not in SUMMARY_MODES:
+            raise ValueError(f"지원하지 않는 summary_mode입니다: {summary_mode}")
+        self.summary_mode = summary_mode
+        # prefilter_configs: 설정되면 이 기준을 모두 통과한 행(생존 행)만 시트에 기록
+        # rejected_sheet=True: 탈락 행과 첫 번째 탈락 기준을 별도 시트(REJECTED_SHEET_TITLE)로 기록
+        self.prefilter_configs = prefilter_configs
+        self.rejected_sheet = rejected_sheet
+        self.rejected_df = None
+        self._prefilter_summary = None
+        self._criteria_configs = []
+        self._metrics = None
+        self._evaluator = None
+        # 같은 원본을 여러 분석 기간으로 처리할 때 공유하는 ScreeningMetrics 연도별 계산 결과 (multi_window_processor)
+        self.metrics_cache = None
         self.color_code = COLOR_CODES
         
         self.num_years = self.end_year - self.start_year + 1
@@ -448,6 +528,20 @@ class Analysis:
         
         self.max_formatted_col = 0
         self.max_formatted_row = 0
+
+        # 원본 데이터 및 write-only 모드용 행 생성 정보
+        self.source_df = None
+        self.raw_store = None            # columnar_store=True일 때 source_df 대신 사용
+        self.data_row_count = 0
+        self._row_formulas = {}          # {컬럼번호: fn(row) -> 수식}
+        self._block_columns = {}         # {컬럼번호: 블록명} — 현재 값이 수식 블록에서 온 컬럼
+        self._value_columns = set()      # 블록이 아닌 계산값(값 모드)으로 채운 컬럼
+        self.saved_path = None
+        self.export_path = None          # export_values()로 저장한 계산값 파일
+        self.incremental_source = None   # 증분 갱신 대상 이전 결과 파일 (prepare_incremental())
+        self._raw_hash = None            # Raw 파일 내용 해시 (_layout_state(), 처음 필요할 때 계산)
+        self._data_number_formats = {}   # {컬럼번호: number_format}
+        self._data_max_col = 0
         
         # CriteriaFormulaGenerator 초기화
         self.formula_generator = CriteriaFormulaGenerator(self)
@@ -508,8 +602,12 @@ class Analysis:
         self.max_formatted_col = max(self.max_formatted_col, max_col)
         self.max_formatted_row = max(self.max_formatted_row, max_row)
 
+    def _sheet_title(self):
+        """분석 시트명 (예: "Screening(FY2123)")."""
+        return f"Screening(FY{self.start_year - 2000}{self.end_year - 2000})"
+
     def _set_basic_info(self):
-        self.ws.title = f"Screening(FY{self.start_year - 2000}{self.end_year - 2000})"
+        self.ws.title = self._sheet_title()
         self.ws['A1'] = f"분석대상법인: {self.tested_party}"
         self.ws['A2'] = f"분석대상연도: FY{self.start_year}-{self.end_year}"
         self.ws['A3'] = f"{self.name}"
@@ -520,6 +618,27 @@ class Analysis:
         self.ws['A2'].font = big_bold_font
         self.ws['A3'].font = big_bold_font
 
+    def _criteria_description(self, i):
+        """i번째(0부터) 양적기준의 설명 문구 (criteria_list 기준, 없으면 빈 문자열)."""
+        if i >= len(self.criteria_list):
+            return ""
+        c = self.criteria_list[i]
+        account = c.get('account', '')
+        x_val = c.get('xValue', '')
+        x_comp = c.get('xCompare', '')
+        include = c.get('include') # True/False
+        
+        inc_str = "포함" if include else "제외"
+        
+        if x_comp == "존재함":
+            return f"{account} 데이터가 존재하는 경우 {inc_str}"
+        elif x_comp == "텍스트 일치":
+            return f"{account}이(가) '{x_val}'인 경우 {inc_str}"
+        elif x_comp == "All equals":
+            return f"{account}이(가) 모든 연도에서 '{x_val}'인 경우 {inc_str}"
+        else:
+            return f"{account} {x_val} {x_comp}인 경우 {inc_str}"
+
     def _set_quantitative_criteria_table(self):
         self.ws['A5'] = "양적기준"
         for i in range(self.number_of_criteria):
@@ -530,27 +649,8 @@ class Analysis:
             cell_a.border = THIN_BORDER
             
             # B열: 설명 (Merge B:H, Left Align, Wrap Text)
-            description = ""
-            if i < len(self.criteria_list):
-                c = self.criteria_list[i]
-                account = c.get('account', '')
-                x_val = c.get('xValue', '')
-                x_comp = c.get('xCompare', '')
-                include = c.get('include') # True/False
-                
-                inc_str = "포함" if include else "제외"
-                
-                if x_comp == "존재함":
-                    description = f"{account} 데이터가 존재하는 경우 {inc_str}"
-                elif x_comp == "텍스트 일치":
-                    description = f"{account}이(가) '{x_val}'인 경우 {inc_str}"
-                elif x_comp == "All equals":
-                    description = f"{account}이(가) 모든 연도에서 '{x_val}'인 경우 {inc_str}"
-                else:
-                    description = f"{account} {x_val} {x_comp}인 경우 {inc_str}"
-            
             cell_b = self.ws.cell(row=6 + i, column=2)
-            cell_b.value = description
+            cell_b.value = self._criteria_description(i)
             cell_b.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
             cell_b.border = THIN_BORDER
             
@@ -738,61 +838,238 @@ class Analysis:
         self.max_formatted_col = max(self.max_formatted_col, flow_col + total_flow_cols - 1)
         self.max_formatted_row = max(self.max_formatted_row, flow_row + 2)
 
-    def _populate_raw_data_from_excel(self):
-        if not self.data_path:
-            logger.error("data_path가 설정되지 않았습니다. Excel 파일 경로를 지정해주세요.")
-            return
+    def _populate_raw_data_from_excel(self, source=None):
+        """
+        Raw 데이터를 적재합니다.
 
-        try:
-            # Results 시트만 읽기
-            source_df = pd.read_excel(
-                self.data_path,
-                sheet_name="Results",
-                header=0
-            )
-        except FileNotFoundError:
-            logger.error("파일 '%s'을(를) 찾을 수 없습니다.", self.data_path)
-            return
-        except Exception as e:
-            logger.error("Excel 파일을 읽는 중 오류 발생: %s", e)
-            return
+        Parameters:
+        - source: 이미 읽은 원본 (read_source() 결과, ordered_columns를 포함하는 DataFrame/ColumnarStore).
+          None이면 data_path에서 ordered_columns만 읽습니다.
+        """
+        if source is None:
+            source = self.read_source(self.ordered_columns)
+            if source is None:
+                return
 
-        # =========================
-        # 2번째 행 제거 (무가치한 헤더)
-        # =========================
-        if len(source_df) >= 1:
-            source_df = source_df.drop(index=0).reset_index(drop=True)
+        for target_col_name in self.ordered_columns:
+            if target_col_name not in source.columns:
+                logger.warning("Raw 파일 '%s'에 '%s' 컬럼이 없습니다.", self.data_path, target_col_name)
+
+        if isinstance(source, ColumnarStore):
+            self.raw_store = source.select(self.ordered_columns)
+        else:
+            self.source_df = encode_categorical_columns(
+                source[[c for c in self.ordered_columns if c in source.columns]])
+        self.data_row_count = len(source)
+
+        if self.prefilter_configs is not None:
+            self._filter_survivors()
+
+        # write-only 모드에서는 데이터 행을 save_file()에서 한 번에 스트리밍
+        if self.write_only:
+            return
 
         # =========================
         # 데이터 시작 행 계산
         # =========================
         data_body_start_row = self.qualitative_start_row + 3
+        raw_padding = [None] * (self.raw_data_start_col - 2)
 
         # =========================
-        # Row number 채우기
+        # Row number + Raw 데이터를 행 단위로 한 번에 기록
         # =========================
-        for i in range(len(source_df)):
-            self.ws.cell(row=data_body_start_row + i, column=1).value = i + 1
+        if self.ws.max_row == data_body_start_row - 1:
+            # 헤더 바로 아래부터 append (셀 단위 ws.cell() 호출 없이 행 단위 기록)
+            append = self.ws.append
+            for i, raw_values in enumerate(self._iter_raw_rows()):
+                append([i + 1, *raw_padding, *raw_values])
+        else:
+            # 헤더가 없는 등 append 위치가 맞지 않는 경우: 행 번호를 지정하여 기록
+            for i, raw_values in enumerate(self._iter_raw_rows()):
+                row = data_body_start_row + i
+                self.ws.cell(row=row, column=1).value = i + 1
+                for col_idx, value in enumerate(raw_values):
+                    if value is not None:
+                        self.ws.cell(row=row, column=self.raw_data_start_col + col_idx).value = value
+
+    def read_source(self, columns):
+        """
+        data_path에서 columns만 읽습니다.
 
-        # =========================
-        # 컬럼별 데이터 매핑
-        # =========================
-        for col_idx, target_col_name in enumerate(self.ordered_columns):
-            sheet_col_num = self.raw_data_start_col + col_idx
+        - Excel: Results 시트 (나눠 내보낸 "Results (2)" 등 포함, 2번째 행의 무가치한 헤더는 건너뜀)
+        - CSV / Parquet: 청크 단위로 읽음 (columnar_store=False이면 청크를 이어 붙인 DataFrame 1개를
+          메모리에 보관 — 청크 1개만 유지하려면 columnarStore 사용)
+        - data_path가 경로 목록이면 파일 순서대로 이어 붙임 (loader.iter_input_chunks)
+
+        Returns:
+        - columnar_store=True이면 ColumnarStore, 아니면 DataFrame (읽지 못하면 None)
+        """
+        if not self.data_path:
+            logger.error("data_path가 설정되지 않았습니다. Raw 파일 경로를 지정해주세요.")
+            return None
+
+        try:
+            if self.columnar_store:
+                # 입력 캐시가 있으면 memmap 항목 사용
+                if self.input_cache is not None:
+                    return self.input_cache.load_store(self.data_path, columns, read_input_store)
+                return read_input_store(self.data_path, columns)
+            if self.input_cache is not None:
+                return self.input_cache.load(self.data_path, columns, read_input)
+            return read_input(self.data_path, columns)
+        except FileNotFoundError:
+            logger.error("파일 '%s'을(를) 찾을 수 없습니다.", self.data_path)
+        except Exception as e:
+            logger.error("Raw 파일을 읽는 중 오류 발생: %s", e)
+        return None
+
+    def has_raw_data(self):
+        """원본 데이터 적재 여부 (source_df 또는 raw_store)."""
+        return self.source_df is not None or self.raw_store is not None
+
+    def _raw_column_values(self, column):
+        """Raw 컬럼의 셀 값 object 배열 (원본에 없는 컬럼은 None)."""
+        if self.raw_store is not None:
+            return self.raw_store.column_values(column)
+        if column in self.source_df.columns:
+            return self.source_df[column].to_numpy(dtype=object)
+        return None
+
+    def _filter_survivors(self):
+        """
+        prefilter_configs를 원본 전체에 대해 평가하여 모든 기준을 통과한 행만 남깁니다.
 
-            if target_col_name in source_df.columns:
-                source_series = source_df[target_col_name]
+        - 20/21행 탈락/통과 요약은 필터링 전 전체 행 기준으로 미리 계산
+        - rejected_sheet=True이면 탈락 행별 첫 번째 탈락 기준을 self.rejected_df로 보관
+        """
+        configs = self.prefilter_configs[:self.number_of_criteria]
+        masks = self.get_evaluator().evaluate_masks(configs)
+        self._criteria_configs = configs
+        self._prefilter_summary = self._summary_counts(masks)
+
+        # 행별 첫 번째 탈락 기준 번호 (0 = 모든 기준 통과, 설정 없는 기준은 탈락으로 취급)
+        passed = np.full(self.data_row_count, self.number_of_criteria > 0)
+        first_failed = np.zeros(self.data_row_count, dtype=np.int64)
+        for i in range(self.number_of_criteria):
+            mask = masks[i] if i < len(masks) else None
+            failed = ~mask if mask is not None else np.ones(self.data_row_count, dtype=bool)
+            first_failed[passed & failed] = i + 1
+            passed &= ~failed
 
-                for row_idx, value in enumerate(source_series):
-                    if pd.isna(value):
-                        value = None
+        if self.rejected_sheet:
+            self.rejected_df = self._build_rejected_frame(~passed, first_failed)
 
-                    self.ws.cell(
-                        row=data_body_start_row + row_idx,
-                        column=sheet_col_num
-                    ).value = value
+        logger.info("생존 행만 기록: 전체 %d행 중 %d행 통과", self.data_row_count, int(np.count_nonzero(passed)))
+        if self.raw_store is not None:
+            self.raw_store = self.raw_store.take(passed)
+        else:
+            self.source_df = self.source_df[passed].reset_index(drop=True)
+        self.data_row_count = int(np.count_nonzero(passed))
+        # 필터링된 데이터 기준으로 지표/평가기를 다시 만들도록 초기화 (공유 계산 결과는 전체 행 기준이므로 분리)
+        self._metrics = None
+        self._evaluator = None
+        self.metrics_cache = None
+
+    def _build_rejected_frame(self, rejected, first_failed):
+        """탈락 행 요약 (원본 순번 / BvD ID / 회사명 / 탈락 기준 / 기준 설명)."""
+        frame = pd.DataFrame({"No": np.flatnonzero(rejected) + 1})
+        for column in REJECTED_ID_COLUMNS:
+            values = self._raw_column_values(column)
+            if values is not None:
+                frame[column] = [None if pd.isna(v) else v for v in values[rejected]]
+
+        failed_idx = first_failed[rejected]
+        frame["탈락기준"] = [f"기준{i}" for i in failed_idx]
+        descriptions = {i: self._criteria_description(i - 1) for i in set(failed_idx.tolist())}
+        frame["기준 설명"] = [descriptions[i] for i in failed_idx.tolist()]
+        return frame
+
+    def _write_rejected_sheet(self, wb):
+        """탈락 행 요약 시트를 wb에 추가합니다 (일반/write-only 통합문서 공용)."""
+        title = REJECTED_SHEET_TITLE
+        if title in wb.sheetnames:
+            # 여러 분석 기간을 한 통합문서에 쓰는 경우: 기간별 시트
+            title = f"{REJECTED_SHEET_TITLE}(FY{self.start_year - 2000}{self.end_year - 2000})"
+        ws = wb.create_sheet(title)
+        widths = {"No": 8, "BvD ID number": 16, "Company name Latin alphabet": 40, "탈락기준": 10, "기준 설명": 60}
+        for idx, column in enumerate(self.rejected_df.columns, start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = widths.get(column, 15)
+
+        ws.append(list(self.rejected_df.columns))
+        for row in self.rejected_df.itertuples(index=False, name=None):
+            ws.append(list(row))
+
+    def _iter_raw_rows(self, chunk_size=RAW_CHUNK_ROWS):
+        """
+        Raw 데이터를 ordered_columns 순서의 값 리스트로 한 행씩 반환합니다.
+
+        NaN → None 변환은 chunk_size 행 단위로 NumPy 배열 전체에 한 번에 적용하고,
+        원본에 없는 컬럼은 None으로 채웁니다.
+        """
+        if self.raw_store is not None:
+            yield from self.raw_store.iter_rows(self.ordered_columns, chunk_size)
+            return
+        if self.source_df is None:
+            return
+        for start in range(0, len(self.source_df), chunk_size):
+            block = self.source_df.iloc[start:start + chunk_size].reindex(columns=self.ordered_columns)
+            values = block.to_numpy(dtype=object)
+            values[pd.isna(values)] = None
+            yield from values.tolist()
+
+    def get_output_stats(self):
+        """
+        데이터 영역 기록량 {"rows", "cells", "formulas"}.
+
+        - cells: 행 번호 + 값이 있는 Raw 셀 + 행 수식/계산값 셀
+        - formulas: 수식 블록 컬럼 셀 + 20/21행 요약 수식
+        """
+        rows = self.data_row_count
+        if self.raw_store is not None:
+            raw_cells = self.raw_store.count_non_blank()
+        else:
+            raw_cells = int(self.source_df.notna().to_numpy().sum()) if self.source_df is not None else 0
+        row_columns = len(self._block_columns) + len(self._value_columns)
+        summary_formulas = 0 if self.summary_mode == "values" else 2 * self.number_of_criteria
+        return {
+            "rows": rows,
+            "cells": rows * (1 + row_columns) + raw_cells,
+            "formulas": rows * len(self._block_columns) + summary_formulas,
+        }
+
+    def _last_data_row(self):
+        """데이터 마지막 행 번호 (write-only 모드에서는 적재된 행 수로 계산)."""
+        return max(self.ws.max_row, self.qualitative_start_row + 2 + self.data_row_count)
+
+    def _write_row_block(self, block, *args):
+        """이름 있는 수식 컬럼 블록(self._{block}_formula_columns(*args))을 데이터 행에 적용합니다."""
+        self._write_row_formulas(getattr(self, f"_{block}_formula_columns")(*args), block=block)
+
+    def _write_row_formulas(self, columns, block=None):
+        """
+        컬럼별 행 수식(또는 값) 함수를 데이터 행에 적용합니다.
+
+        Parameters:
+        - columns: {컬럼번호: fn(row) -> 수식 문자열 또는 값}
+          write-only 모드에서는 즉시 쓰지 않고 save_file()의 행 스트리밍 시 사용합니다.
+        - block: _write_row_block()의 블록명 (직접 호출 시 None — 계산값 컬럼)
+        """
+        for col in columns:
+            if block is None:
+                self._block_columns.pop(col, None)
+                self._value_columns.add(col)
             else:
-                logger.warning("원본 Excel 파일 '%s'의 Results 시트에 '%s' 컬럼이 없습니다.", self.data_path, target_col_name)
+                self._block_columns[col] = block
+                self._value_columns.discard(col)
+
+        if self.write_only:
+            self._row_formulas.update(columns)
+            return
+
+        data_rows = range(self.qualitative_start_row + 3, self._last_data_row() + 1)
+        for col, formula_fn in columns.items():
+            for row in data_rows:
+                self.ws.cell(row=row, column=col).value = formula_fn(row)
 
     def create_format(self):
         self._set_basic_info()
@@ -811,14 +1088,70 @@ class Analysis:
 
     def insert_formular(self):
         """수식을 동적으로 생성하여 삽입합니다."""
-        self._insert_flow_formulas()
-        self._insert_pl_formulas()
-        self._insert_ratio_formulas()
-        self._insert_unadjusted_formulas()
+        if self.metric_values:
+            self._write_row_formulas(self._metric_value_columns())
+        else:
+            self._insert_flow_formulas()
+            self._insert_pl_formulas()
+            self._insert_ratio_formulas()
+            self._insert_unadjusted_formulas()
         self._insert_reference_formulas()
 
+    def _metric_value_columns(self):
+        """Flow / WA3 / 비율 / Unadjusted 컬럼별 계산값 함수 {컬럼번호: fn(row)}."""
+        metrics = self.get_metrics()
+        data_start_row = self.qualitative_start_row + 3
+        arrays = {}
+
+        num_flow_cols = self.num_years + 1
+        for asset_idx, asset in enumerate(FLOW_ASSETS):
+            asset_start_col = self.flow_start_col + asset_idx * num_flow_cols
+            for year_idx, values in enumerate(metrics.flow[asset]):
+                arrays[asset_start_col + year_idx] = values.tolist()
+            arrays[asset_start_col + self.num_years] = metrics.flow_wa[asset].tolist()
+
+        for idx, name in enumerate(WA3_METRICS):
+            arrays[self.wa3_start_col + idx] = metrics.wa3[name].tolist()
+
+        for idx, (values, kinds) in enumerate(metrics.ratios.values()):
+            # IFERROR(..., "")의 텍스트 ""는 빈 셀과 비교 결과가 다르므로 ="" 수식으로 유지
+            arrays[self.wa3_start_col + len(WA3_METRICS) + idx] = [
+                value if kind == NUMBER else '=""' for value, kind in zip(values.tolist(), kinds.tolist())
+            ]
+
+        num_cols_per_metric = len(self._get_unadj_list())
+        for metric_idx, name in enumerate(UNADJUSTED_METRICS):
+            metric = metrics.unadjusted[name]
+            metric_start = self.unadjusted_start_col + metric_idx * num_cols_per_metric
+            for year_idx, values in enumerate(metric["yearly"]):
+                arrays[metric_start + year_idx] = values.tolist()
+            arrays[metric_start + self.num_years] = metric["average"].tolist()
+            arrays[metric_start + self.num_years + 1] = metric["max_min"].tolist()
+
+        return {col: (lambda row, v=values: v[row - data_start_row]) for col, values in arrays.items()}
+
     def _insert_flow_formulas(self):
         """자산 Flow 탭 수식 삽입 (기초/기말 평균 및 가중평균)."""
+        self._write_row_block("flow")
+
+    def _insert_pl_formulas(self):
+        """P&L 항목 WA3(기간 평균) 수식 삽입."""
+        self._write_row_block("pl")
+
+    def _insert_ratio_formulas(self):
+        """WA3 비율 수식 삽입 (연구개발비율, 영업비용율 등)."""
+        self._write_row_block("ratio")
+
+    def _insert_unadjusted_formulas(self):
+        """Unadjusted 지표(OM / MTC / BR) 수식 삽입."""
+        self._write_row_block("unadjusted")
+
+    def _insert_reference_formulas(self):
+        """BvD ID / 회사명 / 질적기준 참조 수식 삽입."""
+        self._write_row_block("reference")
+
+    def _flow_formula_columns(self):
+        """Flow 탭 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
         asset_list = [
             "Debtors\nth USD ",
             "Creditors\nth USD ",
@@ -836,36 +1169,30 @@ class Analysis:
                 col_name[asset + str(year)] = self.raw_col_alphabet[asset + str(year)]
 
         num_flow_cols = self.num_years + 1
-        data_rows = range(self.qualitative_start_row + 3, self.ws.max_row + 1)
+        num_years = self.num_years
+        columns = {}
 
         for asset_idx, asset in enumerate(asset_list):
             for year_idx in range(self.num_years):
                 col = self.flow_start_col + asset_idx * num_flow_cols + year_idx
-                prev_year = self.start_year - 1 + year_idx
-                curr_year = self.start_year + year_idx
-                for row in data_rows:
-                    self.ws.cell(row=row, column=col).value = (
-                        f"=IFERROR(SUM({col_name[asset+str(prev_year)]}{row}:"
-                        f"{col_name[asset+str(curr_year)]}{row})/2,0)"
-                    )
+                prev_l = col_name[asset + str(self.start_year - 1 + year_idx)]
+                curr_l = col_name[asset + str(self.start_year + year_idx)]
+                columns[col] = lambda row, p=prev_l, c=curr_l: f"=IFERROR(SUM({p}{row}:{c}{row})/2,0)"
 
             wa_col = self.flow_start_col + asset_idx * num_flow_cols + self.num_years
             start_wa = get_column_letter(wa_col - self.num_years)
             end_wa = get_column_letter(wa_col - 1)
-            for row in data_rows:
-                self.ws.cell(row=row, column=wa_col).value = (
-                    f"=IFERROR(SUM({start_wa}{row}:{end_wa}{row})/{self.num_years},0)"
-                )
-                wa_col_letter = get_column_letter(wa_col)
-                for keyword, offset in wa3_offset.items():
-                    if keyword in asset:
-                        self.ws.cell(row=row, column=self.wa3_start_col + offset).value = (
-                            f"=IFERROR({wa_col_letter}{row},0)"
-                        )
-                        break
+            columns[wa_col] = lambda row, s=start_wa, e=end_wa: f"=IFERROR(SUM({s}{row}:{e}{row})/{num_years},0)"
 
-    def _insert_pl_formulas(self):
-        """P&L 항목 WA3(기간 평균) 수식 삽입."""
+            wa_col_letter = get_column_letter(wa_col)
+            for keyword, offset in wa3_offset.items():
+                if keyword in asset:
+                    columns[self.wa3_start_col + offset] = lambda row, w=wa_col_letter: f"=IFERROR({w}{row},0)"
+                    break
+        return columns
+
+    def _pl_formula_columns(self):
+        """P&L 항목 WA3 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
         pl_list = {
             f"Operating revenue (Turnover)\nth USD {self.start_year}": 0,
             f"Operating profit (loss) [EBIT]\nth USD {self.start_year}": 1,
@@ -874,122 +1201,99 @@ class Analysis:
             f"Costs of goods sold\nth USD {self.start_year}": 8,
             f"Number of employees\n{self.start_year}": 9,
         }
-        data_rows = range(self.qualitative_start_row + 3, self.ws.max_row + 1)
+        num_years = self.num_years
+        columns = {}
 
         for pl, col_idx in pl_list.items():
             start_col = self.raw_col_number[pl]
-            end_col = start_col + self.num_years - 1
-            for row in data_rows:
-                self.ws.cell(row=row, column=self.wa3_start_col + col_idx).value = (
-                    f"=IFERROR(SUM({get_column_letter(start_col)}{row}:"
-                    f"{get_column_letter(end_col)}{row})/{self.num_years},0)"
-                )
+            start_l = get_column_letter(start_col)
+            end_l = get_column_letter(start_col + self.num_years - 1)
+            columns[self.wa3_start_col + col_idx] = (
+                lambda row, s=start_l, e=end_l: f"=IFERROR(SUM({s}{row}:{e}{row})/{num_years},0)"
+            )
+        return columns
 
-    def _insert_ratio_formulas(self):
-        """WA3 비율 수식 삽입 (연구개발비율, 영업비용율 등)."""
+    def _ratio_formula_columns(self):
+        """WA3 비율 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
         # (numerator_offset, denominator_offset) — wa3_start_col 기준
         ratio_idx = {1: (4, 0), 2: (2, 0), 3: (5, 7), 4: (6, 7), 5: (3, 7), 6: (3, 8)}
-        data_rows = range(self.qualitative_start_row + 3, self.ws.max_row + 1)
+        columns = {}
 
         for col_idx, (numerator, denominator) in ratio_idx.items():
             num_col = get_column_letter(self.wa3_start_col + numerator)
             den_col = get_column_letter(self.wa3_start_col + denominator)
-            for row in data_rows:
-                cell = self.ws.cell(row=row, column=self.wa3_start_col + 9 + col_idx)
-                if col_idx == 6:
-                    cell.value = f'=IFERROR(365/({den_col}{row}/{num_col}{row}), "")'
-                else:
-                    cell.value = f"=IFERROR({num_col}{row}/{den_col}{row},0)"
+            target_col = self.wa3_start_col + 9 + col_idx
+            if col_idx == 6:
+                columns[target_col] = lambda row, n=num_col, d=den_col: f'=IFERROR(365/({d}{row}/{n}{row}), "")'
+            else:
+                columns[target_col] = lambda row, n=num_col, d=den_col: f"=IFERROR({n}{row}/{d}{row},0)"
+        return columns
 
-    def _insert_unadjusted_formulas(self):
-        """Unadjusted 지표(OM / MTC / BR) 수식 삽입."""
+    def _unadjusted_formula_columns(self):
+        """Unadjusted 지표(OM / MTC / BR) 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
         num_cols_per_metric = len(self._get_unadj_list())
-        data_rows = range(self.qualitative_start_row + 3, self.ws.max_row + 1)
+        years = range(self.start_year, self.end_year + 1)
+        columns = {}
 
-        def _insert_metric(metric_start, yearly_formula_fn, avg_formula_fn):
-            """연도별 수식 + 평균 수식 + MaxMin 수식을 한 번에 삽입."""
+        def raw_letters(base_name):
+            """연도별 Raw 컬럼 문자 리스트."""
+            return [self.raw_col_alphabet[f"{base_name}{year}"] for year in years]
+
+        op_l = raw_letters("Operating profit (loss) [EBIT]\nth USD ")
+        rev_l = raw_letters("Operating revenue (Turnover)\nth USD ")
+        gp_l = raw_letters("Gross profit\nth USD ")
+        opex_l = raw_letters("Other operating expense (income)\nth USD ")
+
+        def add_metric(metric_start, yearly_formula_fn, avg_formula_fn):
+            """연도별 수식 + 평균 수식 + MaxMin 수식 컬럼을 한 번에 등록."""
             for year_idx in range(self.num_years):
-                col = metric_start + year_idx
-                year = self.start_year + year_idx
-                for row in data_rows:
-                    self.ws.cell(row=row, column=col).value = yearly_formula_fn(row, year)
+                columns[metric_start + year_idx] = lambda row, i=year_idx: yearly_formula_fn(row, i)
 
-            avg_col = metric_start + self.num_years
-            for row in data_rows:
-                self.ws.cell(row=row, column=avg_col).value = avg_formula_fn(row)
+            columns[metric_start + self.num_years] = avg_formula_fn
 
-            maxmin_col = metric_start + self.num_years + 1
             start_l = get_column_letter(metric_start)
             end_l = get_column_letter(metric_start + self.num_years - 1)
-            for row in data_rows:
-                self.ws.cell(row=row, column=maxmin_col).value = (
-                    f"=IFERROR(MAX({start_l}{row}:{end_l}{row})-MIN({start_l}{row}:{end_l}{row}),0)"
-                )
+            columns[metric_start + self.num_years + 1] = (
+                lambda row: f"=IFERROR(MAX({start_l}{row}:{end_l}{row})-MIN({start_l}{row}:{end_l}{row}),0)"
+            )
 
         # OM
-        om_start = self.unadjusted_start_col
-        op_start_l = self.raw_col_alphabet[f"Operating profit (loss) [EBIT]\nth USD {self.start_year}"]
-        op_end_l = self.raw_col_alphabet[f"Operating profit (loss) [EBIT]\nth USD {self.end_year}"]
-        rev_start_l = self.raw_col_alphabet[f"Operating revenue (Turnover)\nth USD {self.start_year}"]
-        rev_end_l = self.raw_col_alphabet[f"Operating revenue (Turnover)\nth USD {self.end_year}"]
-
-        _insert_metric(
-            om_start,
-            yearly_formula_fn=lambda row, year: (
-                f"=IFERROR({self.raw_col_alphabet[f'Operating profit (loss) [EBIT]\\nth USD {year}']}{row}"
-                f"/{self.raw_col_alphabet[f'Operating revenue (Turnover)\\nth USD {year}']}{row},0)"
-            ),
+        add_metric(
+            self.unadjusted_start_col,
+            yearly_formula_fn=lambda row, i: f"=IFERROR({op_l[i]}{row}/{rev_l[i]}{row},0)",
             avg_formula_fn=lambda row: (
-                f"=IFERROR(SUM({op_start_l}{row}:{op_end_l}{row})"
-                f"/SUM({rev_start_l}{row}:{rev_end_l}{row}),0)"
+                f"=IFERROR(SUM({op_l[0]}{row}:{op_l[-1]}{row})"
+                f"/SUM({rev_l[0]}{row}:{rev_l[-1]}{row}),0)"
             ),
         )
 
         # MTC
-        mtc_start = self.unadjusted_start_col + num_cols_per_metric
-        _insert_metric(
-            mtc_start,
-            yearly_formula_fn=lambda row, year: (
-                f"=IFERROR({self.raw_col_alphabet[f'Operating profit (loss) [EBIT]\\nth USD {year}']}{row}"
-                f"/({self.raw_col_alphabet[f'Operating revenue (Turnover)\\nth USD {year}']}{row}"
-                f"-{self.raw_col_alphabet[f'Operating profit (loss) [EBIT]\\nth USD {year}']}{row}),0)"
-            ),
+        add_metric(
+            self.unadjusted_start_col + num_cols_per_metric,
+            yearly_formula_fn=lambda row, i: f"=IFERROR({op_l[i]}{row}/({rev_l[i]}{row}-{op_l[i]}{row}),0)",
             avg_formula_fn=lambda row: (
-                f"=IFERROR(SUM({op_start_l}{row}:{op_end_l}{row})"
-                f"/(SUM({rev_start_l}{row}:{rev_end_l}{row})"
-                f"-SUM({op_start_l}{row}:{op_end_l}{row})),0)"
+                f"=IFERROR(SUM({op_l[0]}{row}:{op_l[-1]}{row})"
+                f"/(SUM({rev_l[0]}{row}:{rev_l[-1]}{row})"
+                f"-SUM({op_l[0]}{row}:{op_l[-1]}{row})),0)"
             ),
         )
 
         # BR
-        br_start = self.unadjusted_start_col + num_cols_per_metric * 2
-        gp_start_l = self.raw_col_alphabet[f"Gross profit\nth USD {self.start_year}"]
-        gp_end_l = self.raw_col_alphabet[f"Gross profit\nth USD {self.end_year}"]
-        opex_start_l = self.raw_col_alphabet[f"Other operating expense (income)\nth USD {self.start_year}"]
-        opex_end_l = self.raw_col_alphabet[f"Other operating expense (income)\nth USD {self.end_year}"]
-
-        _insert_metric(
-            br_start,
-            yearly_formula_fn=lambda row, year: (
-                f"=IFERROR({self.raw_col_alphabet[f'Gross profit\\nth USD {year}']}{row}"
-                f"/{self.raw_col_alphabet[f'Other operating expense (income)\\nth USD {year}']}{row},0)"
-            ),
+        add_metric(
+            self.unadjusted_start_col + num_cols_per_metric * 2,
+            yearly_formula_fn=lambda row, i: f"=IFERROR({gp_l[i]}{row}/{opex_l[i]}{row},0)",
             avg_formula_fn=lambda row: (
-                f"=IFERROR(SUM({gp_start_l}{row}:{gp_end_l}{row})"
-                f"/SUM({opex_start_l}{row}:{opex_end_l}{row}),0)"
+                f"=IFERROR(SUM({gp_l[0]}{row}:{gp_l[-1]}{row})"
+                f"/SUM({opex_l[0]}{row}:{opex_l[-1]}{row}),0)"
             ),
         )
+        return columns
 
-    def _insert_reference_formulas(self):
-        """BvD ID / 회사명 / 질적기준 참조 수식 삽입."""
-        data_rows = range(self.qualitative_start_row + 3, self.ws.max_row + 1)
+    def _reference_formula_columns(self):
+        """BvD ID / 회사명 / 질적기준 참조 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
         raw_bvd_col = get_column_letter(self.raw_data_start_col)
         raw_name_col = get_column_letter(self.raw_data_start_col + 1)
 
-        for row in data_rows:
-            self.ws.cell(row=row, column=2).value = f"={raw_bvd_col}{row}"
-            self.ws.cell(row=row, column=3).value = f"={raw_name_col}{row}"
-
         qual_start = self.qualitative_start_col
         pbl_col = self.raw_col_alphabet["Primary business line"]
         fo_col = self.raw_col_alphabet["Full overview"]
@@ -998,17 +1302,20 @@ class Analysis:
         sic_col = self.raw_col_alphabet["US SIC, primary code(s)"]
         sic_desc_col = self.raw_col_alphabet["US SIC, primary code(s) - description"]
 
-        for row in data_rows:
-            self.ws.cell(row=row, column=qual_start).value = f"={pbl_col}{row}"
-            self.ws.cell(row=row, column=qual_start + 1).value = f"={fo_col}{row}"
-            self.ws.cell(row=row, column=qual_start + 2).value = f"={ma_col}{row}"
-            self.ws.cell(row=row, column=qual_start + 3).value = f"={mps_col}{row}"
-            self.ws.cell(row=row, column=qual_start + 4).value = f'={sic_col}{row} & " - " & {sic_desc_col}{row}'
+        return {
+            2: lambda row: f"={raw_bvd_col}{row}",
+            3: lambda row: f"={raw_name_col}{row}",
+            qual_start: lambda row: f"={pbl_col}{row}",
+            qual_start + 1: lambda row: f"={fo_col}{row}",
+            qual_start + 2: lambda row: f"={ma_col}{row}",
+            qual_start + 3: lambda row: f"={mps_col}{row}",
+            qual_start + 4: lambda row: f'={sic_col}{row} & " - " & {sic_desc_col}{row}',
+        }
 
     def insert_pass_fail_summary(self):
         """
         C20, C21에 탈락/통과 텍스트 입력 및 수식 적용
-        각 기준별 누적 통과/탈락 통계를 계산
+        각 기준별 누적 통과/탈락 통계를 계산 (방식은 self.summary_mode)
         """
         # 1. 텍스트 입력
         self.ws['C20'] = "탈락"
@@ -1018,19 +1325,34 @@ class Analysis:
         
         # 2. 수식 입력
         data_start_row = self.qualitative_start_row + 3
-        if self.ws.max_row < data_start_row:
+        if self._last_data_row() < data_start_row:
             data_end_row = data_start_row  # 데이터 없음 — 수식 범위 최소화
         else:
-            data_end_row = self.ws.max_row
+            data_end_row = self._last_data_row()
+
+        if self._prefilter_summary is not None:
+            # 생존 행만 기록한 경우: 필터링 전 전체 행 기준 건수
+            summary = self._prefilter_summary
+        elif self.summary_mode == "values":
+            summary = self._summary_counts()
+        elif self.summary_mode == "helper":
+            summary = self._summary_helper_formulas(data_start_row, data_end_row)
+        else:
+            summary = self._summary_countifs_formulas(data_start_row, data_end_row)
+
+        for target_col_idx, (fail_value, pass_value) in summary.items():
+            self.ws.cell(row=20, column=target_col_idx).value = fail_value
+            self.ws.cell(row=20, column=target_col_idx).border = THIN_BORDER
+            self.ws.cell(row=21, column=target_col_idx).value = pass_value
+            self.ws.cell(row=21, column=target_col_idx).border = THIN_BORDER
 
+    def _summary_countifs_formulas(self, data_start_row, data_end_row):
+        """{컬럼번호: (탈락 수식, 통과 수식)} — 이전 기준 범위를 모두 나열한 COUNTIFS."""
         start_col = self.quantitative_start_col
+        summary = {}
         
         for i in range(self.number_of_criteria):
             target_col_idx = start_col + i
-            target_col_letter = get_column_letter(target_col_idx)
-            
-            # 범위 문자열 (예: D25:D100)
-            range_str = f"${target_col_letter}${data_start_row}:${target_col_letter}${data_end_row}"
             
             # 누적으로 이전 기준들의 "Yes" 조건을 모두 포함해야 함
             # COUNTIFS(Criteria1, "Yes", Criteria2, "Yes", ..., TargetCriteria, "No/Yes")
@@ -1047,15 +1369,71 @@ class Analysis:
             fail_conditions = list(conditions)
             fail_conditions[-1] = '"No"'
             
-            fail_formula = f'=COUNTIFS({",".join(fail_conditions)})'
-            self.ws.cell(row=20, column=target_col_idx).value = fail_formula
-            self.ws.cell(row=20, column=target_col_idx).border = THIN_BORDER
-            
             # --- 통과 수식 (Row 21) ---
             # 마지막 조건도 "Yes"여야 함 (이미 conditions가 모두 "Yes"임)
-            pass_formula = f'=COUNTIFS({",".join(conditions)})'
-            self.ws.cell(row=21, column=target_col_idx).value = pass_formula
-            self.ws.cell(row=21, column=target_col_idx).border = THIN_BORDER
+            summary[target_col_idx] = (
+                f'=COUNTIFS({",".join(fail_conditions)})',
+                f'=COUNTIFS({",".join(conditions)})',
+            )
+        return summary
+
+    def _summary_helper_formulas(self, data_start_row, data_end_row):
+        """
+        {컬럼번호: (탈락 수식, 통과 수식)} — 누적 통과 보조 컬럼 기반.
+
+        테이블 오른쪽(한 칸 띄움)에 숨김 보조 컬럼 "누적통과i"를 추가합니다.
+        보조 컬럼 i = 기준 1..i를 모두 통과하면 1, 아니면 0 (=IF(기준i="Yes", 보조 i-1, 0))
+        - 통과 = SUM(보조 i)
+        - 탈락 = COUNTIFS(보조 i-1, 1, 기준i, "No")
+        """
+        start_col = self.quantitative_start_col
+        helper_start_col = self._layout_max_col() + 2
+        header_row = self.qualitative_start_row
+
+        def range_of(col):
+            letter = get_column_letter(col)
+            return f"${letter}${data_start_row}:${letter}${data_end_row}"
+
+        summary = {}
+        for i in range(self.number_of_criteria):
+            helper_col = helper_start_col + i
+            if i == 0:
+                fail_formula = f'=COUNTIF({range_of(start_col)},"No")'
+            else:
+                fail_formula = f'=COUNTIFS({range_of(helper_col - 1)},1,{range_of(start_col + i)},"No")'
+
+            summary[start_col + i] = (fail_formula, f'=SUM({range_of(helper_col)})')
+
+            self.ws.cell(row=header_row, column=helper_col).value = f"누적통과{i + 1}"
+            self.ws.column_dimensions[get_column_letter(helper_col)].hidden = True
+
+        self._write_row_block("summary_helper")
+        return summary
+
+    def _summary_helper_formula_columns(self):
+        """누적 통과 보조 컬럼별 행 수식 함수 {컬럼번호: fn(row)}."""
+        start_col = self.quantitative_start_col
+        helper_start_col = self._layout_max_col() + 2
+
+        columns = {}
+        for i in range(self.number_of_criteria):
+            criteria_letter = get_column_letter(start_col + i)
+            helper_col = helper_start_col + i
+            if i == 0:
+                columns[helper_col] = lambda row, c=criteria_letter: f'=IF(${c}{row}="Yes",1,0)'
+            else:
+                prev_letter = get_column_letter(helper_col - 1)
+                columns[helper_col] = (
+                    lambda row, c=criteria_letter, p=prev_letter: f'=IF(${c}{row}="Yes",${p}{row},0)'
+                )
+        return columns
+
+    def _summary_counts(self, masks=None):
+        """{컬럼번호: (탈락 건수, 통과 건수)} — CriteriaEvaluator 결과(masks)의 누적 AND로 계산."""
+        if masks is None:
+            masks = self.get_evaluator().evaluate_masks(self._criteria_configs)
+        counts = cumulative_counts(masks, self.data_row_count, self.number_of_criteria)
+        return {self.quantitative_start_col + i: count for i, count in enumerate(counts)}
             
     def apply_quantitative_criteria_formulas(self, criteria_configs):
         """
@@ -1081,33 +1459,101 @@ class Analysis:
         if len(criteria_configs) > self.number_of_criteria:
             logger.warning("설정된 기준(%d)이 number_of_criteria(%d)보다 많습니다.", len(criteria_configs), self.number_of_criteria)
             criteria_configs = criteria_configs[:self.number_of_criteria]
+        self._criteria_configs = criteria_configs
         
         # 데이터 시작 행 (헤더 3줄 아래)
         data_start_row = self.qualitative_start_row + 3
         
         # Raw 데이터가 있는 경우에만 수식 적용
-        if self.ws.max_row < data_start_row:
-            logger.warning("Raw 데이터가 없습니다. 먼저 _populate_raw_data_from_excel()을 실행하세요.")
+        if self._last_data_row() < data_start_row:
+            if self._prefilter_summary is not None:
+                # survivorsOnly: 사전 필터를 통과한 행이 없음 (20/21행 요약은 필터링 전 전체 행 기준으로 기록됨)
+                logger.info("통과 행 없음: 사전 필터 기준을 모두 통과한 행이 없어 양적기준 수식을 적용하지 않습니다.")
+            else:
+                logger.warning("Raw 데이터가 없습니다. 먼저 _populate_raw_data_from_excel()을 실행하세요.")
             return
         
-        # 각 기준에 대해 수식 생성 및 적용
-        for criteria_idx, config in enumerate(criteria_configs):
-            if config is None:
-                continue
+        if self.criteria_values:
+            self._apply_quantitative_criteria_values(criteria_configs, data_start_row)
+            logger.info("양적기준 값 적용 완료: %d개 기준, %d개 행", len(criteria_configs), self._last_data_row() - data_start_row + 1)
+            return
 
-            criteria_col = self.quantitative_start_col + criteria_idx
-            
-            # 각 데이터 행에 수식 적용
-            for row in range(data_start_row, self.ws.max_row + 1):
-                formula = self._generate_formula_from_config(config, row, criteria_idx + 1)
-                cell = self.ws.cell(row=row, column=criteria_col)
-                cell.value = formula
+        # 각 기준에 대해 수식 생성 및 적용
+        self._write_row_block("criteria", criteria_configs)
         
         # 양적통과 컬럼 (모든 기준을 통과한 경우만 Yes)
         self._apply_quantitative_pass_formula(data_start_row)
         
-        logger.info("양적기준 수식 적용 완료: %d개 기준, %d개 행", len(criteria_configs), self.ws.max_row - data_start_row + 1)
+        logger.info("양적기준 수식 적용 완료: %d개 기준, %d개 행", len(criteria_configs), self._last_data_row() - data_start_row + 1)
     
+    def _criteria_formula_columns(self, criteria_configs):
+        """양적기준 컬럼별 행 수식 함수 {컬럼번호: fn(row)} (설정별 수식 템플릿)."""
+        columns = {}
+        for criteria_idx, config in enumerate(criteria_configs):
+            if config is None:
+                continue
+
+            criteria_col = self.quantitative_start_col + criteria_idx
+            columns[criteria_col] = self._compile_formula_template(config, criteria_idx + 1)
+        return columns
+
+    def get_metrics(self):
+        """적재된 원본 데이터에 대한 ScreeningMetrics (최초 호출 시 생성)."""
+        if self._metrics is None:
+            if self.raw_store is not None:
+                self._metrics = ScreeningMetrics(None, self.start_year, self.end_year, store=self.raw_store,
+                                                 cache=self.metrics_cache)
+            else:
+                source_df = self.source_df if self.source_df is not None else pd.DataFrame()
+                self._metrics = ScreeningMetrics(source_df, self.start_year, self.end_year, cache=self.metrics_cache)
+        return self._metrics
+
+    def get_evaluator(self):
+        """적재된 원본 데이터에 대한 CriteriaEvaluator (최초 호출 시 생성)."""
+        if self._evaluator is None:
+            self._evaluator = CriteriaEvaluator(self.get_metrics().source_df, self.start_year, self.end_year,
+                                                self.ordered_columns, metrics=self.get_metrics())
+        return self._evaluator
+
+    def get_mask_index(self, criteria_configs):
+        """
+        기준별 "Yes" 결과를 비트셋으로 보관한 CriteriaMaskIndex.
+
+        기준 부분집합/순서/하나 제외 조합의 통과 건수를 결과 파일을 다시 만들지 않고 계산합니다
+        (criteria_configs는 number_of_criteria개까지 사용, 설정이 없는 기준은 None).
+        """
+        masks = self.get_evaluator().evaluate_masks(criteria_configs[:self.number_of_criteria])
+        masks += [None] * (self.number_of_criteria - len(masks))
+        return CriteriaMaskIndex(masks, self.data_row_count)
+
+    def _apply_quantitative_criteria_values(self, criteria_configs, data_start_row):
+        """양적기준/양적통과 컬럼에 CriteriaEvaluator로 계산한 Yes/No 값을 기록합니다."""
+        results = self.get_evaluator().evaluate(criteria_configs, self.number_of_criteria)
+
+        columns = {}
+        for criteria_idx in range(self.number_of_criteria):
+            name = f"기준{criteria_idx + 1}"
+            if name in results.columns:
+                columns[self.quantitative_start_col + criteria_idx] = (
+                    lambda row, v=results[name].tolist(): v[row - data_start_row]
+                )
+        pass_values = results["양적통과"].tolist()
+        columns[self.quantitative_start_col + self.number_of_criteria] = lambda row: pass_values[row - data_start_row]
+        self._write_row_formulas(columns)
+
+    def _compile_formula_template(self, config, criteria_index):
+        """
+        설정을 한 번만 해석하여 행 번호만 바꿔 끼우는 수식 함수 fn(row)로 컴파일합니다.
+
+        행 번호 대신 ROW_PLACEHOLDER로 수식을 생성한 뒤 표식 위치에서 잘라 두므로,
+        행마다 컬럼 범위 탐색/문자열 조립을 반복하지 않습니다.
+        """
+        formula = self._generate_formula_from_config(config, ROW_PLACEHOLDER, criteria_index)
+        parts = formula.split(ROW_PLACEHOLDER)
+        if len(parts) == 1:
+            return lambda row: formula
+        return lambda row: str(row).join(parts)
+
     def _generate_formula_from_config(self, config, row_number, criteria_index):
         """설정 딕셔너리로부터 수식을 생성합니다."""
         criteria_type = config.get('type')
@@ -1167,22 +1613,23 @@ class Analysis:
     
     def _apply_quantitative_pass_formula(self, data_start_row):
         """양적통과 컬럼에 수식을 적용합니다 (모든 기준이 Yes인 경우만 Yes)."""
+        self._write_row_block("pass")
+
+    def _pass_formula_columns(self):
+        """양적통과 컬럼 행 수식 함수 {컬럼번호: fn(row)}."""
         pass_col = self.quantitative_start_col + self.number_of_criteria
-        
-        for row in range(data_start_row, self.ws.max_row + 1):
-            # 모든 양적기준 셀 참조
-            criteria_cells = []
-            for i in range(self.number_of_criteria):
-                col_letter = get_column_letter(self.quantitative_start_col + i)
-                criteria_cells.append(f'{col_letter}{row}')
-            
-            # COUNTIF를 사용하여 모든 기준이 "Yes"인지 확인
-            criteria_range_start = criteria_cells[0].replace(str(row), '')
-            criteria_range_end = criteria_cells[-1].replace(str(row), '')
-            formula = f'=IF(COUNTIF(${criteria_range_start}${row}:${criteria_range_end}${row},"Yes")={self.number_of_criteria},"Yes","No")'
-            
-            cell = self.ws.cell(row=row, column=pass_col)
-            cell.value = formula
+
+        # COUNTIF를 사용하여 모든 기준이 "Yes"인지 확인
+        criteria_range_start = get_column_letter(self.quantitative_start_col)
+        criteria_range_end = get_column_letter(self.quantitative_start_col + self.number_of_criteria - 1)
+        number_of_criteria = self.number_of_criteria
+
+        return {
+            pass_col: lambda row: (
+                f'=IF(COUNTIF(${criteria_range_start}${row}:${criteria_range_end}${row},"Yes")'
+                f'={number_of_criteria},"Yes","No")'
+            )
+        }
 
     def apply_final_styles(self):
         """최종 서식을 적용합니다."""
@@ -1190,36 +1637,85 @@ class Analysis:
         PERCENTAGE_FORMAT = '0.00%'
 
         flow_total_cols = 6 * (self.num_years + 1)  # 6개 자산 × (연도 + WA열)
-        final_max_col = max(self.max_formatted_col, self.flow_start_col + flow_total_cols - 1)
+        final_max_col = self._layout_max_col()
 
         data_start_row = self.qualitative_start_row + 3
-        max_row = self.ws.max_row
+        max_row = self._last_data_row()
 
-        self._apply_number_formats(data_start_row, max_row, ACCOUNTING_FORMAT, PERCENTAGE_FORMAT, flow_total_cols)
-        self._apply_borders(max_row, final_max_col)
+        number_formats = self._get_data_number_formats(ACCOUNTING_FORMAT, PERCENTAGE_FORMAT, flow_total_cols)
+        self._data_number_formats = number_formats
+        self._data_max_col = final_max_col
+
+        self._apply_data_styles(data_start_row, max_row)
+        self._apply_borders(final_max_col)
         self._apply_header_alignment(final_max_col)
         self._apply_column_widths(data_start_row, max_row, final_max_col)
 
-    def _apply_number_formats(self, data_start_row, max_row, accounting_fmt, percentage_fmt, flow_total_cols):
-        """숫자 포맷 적용 (Unadjusted %, WA3 Accounting/%, Raw Accounting, Flow Accounting)."""
+    def _layout_max_col(self):
+        """테이블 마지막 컬럼 번호 (Flow 컬럼 끝까지)."""
+        flow_total_cols = 6 * (self.num_years + 1)  # 6개 자산 × (연도 + WA열)
+        return max(self.max_formatted_col, self.flow_start_col + flow_total_cols - 1)
+
+    def _apply_data_styles(self, data_start_row, max_row):
+        """
+        데이터 행에 컬럼별 서식(테두리 + 숫자 포맷)을 한 번에 적용합니다.
+
+        컬럼마다 서식 템플릿을 한 번만 만들고 셀에는 스타일 인덱스만 복사하므로
+        셀마다 Border/number_format 객체를 만들고 등록하는 비용이 없습니다.
+        write-only 모드에서는 save_file()의 행 스트리밍 시 같은 템플릿을 사용합니다.
+        """
+        if self.write_only:
+            return
+
+        templates = self._data_style_templates(self.ws, self._data_max_col)
+        for row_cells in self.ws.iter_rows(min_row=data_start_row, max_row=max_row, max_col=len(templates)):
+            for cell, template in zip(row_cells, templates):
+                if template is None:
+                    continue
+                if cell.has_style:
+                    # 날짜 값 등 기존 서식이 있는 셀은 테두리/지정된 숫자 포맷만 덮어씀
+                    style = copy(cell._style)
+                    style.borderId = template._style.borderId
+                    if cell.column in self._data_number_formats:
+                        style.numFmtId = template._style.numFmtId
+                    cell._style = style
+                else:
+                    cell._style = copy(template._style)
+
+    def _data_style_templates(self, ws, row_width):
+        """컬럼별 데이터 셀 서식 템플릿 목록 (1 ~ row_width열), 서식이 없는 컬럼은 None."""
+        templates = [None] * row_width
+        for col in range(1, row_width + 1):
+            border = self._get_border(col) if col <= self._data_max_col else None
+            number_format = self._data_number_formats.get(col)
+            if (border is None or border == Border()) and number_format is None:
+                continue
+            template = WriteOnlyCell(ws)
+            if border is not None:
+                template.border = border
+            if number_format is not None:
+                template.number_format = number_format
+            templates[col - 1] = template
+        return templates
+
+    def _get_data_number_formats(self, accounting_fmt, percentage_fmt, flow_total_cols):
+        """데이터 영역 컬럼별 숫자 포맷 {컬럼번호: number_format}."""
+        number_formats = {}
+
         # 1. Unadjusted → 퍼센트
         for col in range(self.unadjusted_start_col, self.unadjusted_start_col + self.unadjusted_num_cols):
-            for row in range(data_start_row, max_row + 1):
-                self.ws.cell(row=row, column=col).number_format = percentage_fmt
+            number_formats[col] = percentage_fmt
 
         # 2. WA3 지표 → Accounting
         wa3_metrics_count = len(self._get_wa3_list())
         for col in range(self.wa3_start_col, self.wa3_start_col + wa3_metrics_count):
-            for row in range(data_start_row, max_row + 1):
-                self.ws.cell(row=row, column=col).number_format = accounting_fmt
+            number_formats[col] = accounting_fmt
 
         # 3. WA3 비율 → 퍼센트 (재고자산보유일수는 Accounting)
         ratio_start_col = self.wa3_start_col + wa3_metrics_count
         for idx, ratio_name in enumerate(self._get_ratio_tab_list()):
             fmt = accounting_fmt if "재고자산보유일수" in ratio_name else percentage_fmt
-            col = ratio_start_col + idx
-            for row in range(data_start_row, max_row + 1):
-                self.ws.cell(row=row, column=col).number_format = fmt
+            number_formats[ratio_start_col + idx] = fmt
 
         # 4. Raw Data (Turnover 이후) → Accounting
         try:
@@ -1231,33 +1727,34 @@ class Analysis:
                 abs_turnover_col = self.raw_data_start_col + turnover_start_index
                 raw_data_end_col = self.raw_data_start_col + len(self.ordered_columns)
                 for col in range(abs_turnover_col, raw_data_end_col):
-                    for row in range(data_start_row, max_row + 1):
-                        self.ws.cell(row=row, column=col).number_format = accounting_fmt
+                    number_formats[col] = accounting_fmt
         except Exception as e:
             logger.warning("Raw Data 서식 적용 중 오류 발생: %s", e)
 
         # 5. Flow → Accounting
         for col in range(self.flow_start_col, self.flow_start_col + flow_total_cols):
-            for row in range(data_start_row, max_row + 1):
-                self.ws.cell(row=row, column=col).number_format = accounting_fmt
+            number_formats[col] = accounting_fmt
+
+        return number_formats
 
-    def _apply_borders(self, max_row, final_max_col):
-        """전체 테이블에 테두리 적용 (Final Selection ~ Unadjusted 사이 빈 열 제외)."""
-        for row in range(self.qualitative_start_row, max_row + 1):
+    def _apply_borders(self, final_max_col):
+        """헤더 3행에 테두리 적용 (Final Selection ~ Unadjusted 사이 빈 열 제외, 데이터 행은 _apply_data_styles)."""
+        for row in range(self.qualitative_start_row, self.qualitative_start_row + 3):
             for col in range(1, final_max_col + 1):
-                if self.final_selection_start_col < col < self.unadjusted_start_col:
-                    self.ws.cell(row=row, column=col).border = Border()
-                else:
-                    self.ws.cell(row=row, column=col).border = THIN_BORDER
+                self.ws.cell(row=row, column=col).border = self._get_border(col)
+
+    def _get_border(self, col):
+        """컬럼 위치에 따른 테두리 (Final Selection ~ Unadjusted 사이 빈 열은 테두리 없음)."""
+        if self.final_selection_start_col < col < self.unadjusted_start_col:
+            return Border()
+        return THIN_BORDER
 
     def _apply_header_alignment(self, final_max_col):
         """헤더 3행에 중앙 정렬 + 줄바꿈 적용."""
         header_start_row = self.qualitative_start_row
         for r in range(header_start_row, header_start_row + 3):
             for c in range(1, final_max_col + 1):
-                self.ws.cell(row=r, column=c).alignment = Alignment(
-                    wrap_text=True, horizontal='center', vertical='center'
-                )
+                self.ws.cell(row=r, column=c).alignment = HEADER_ALIGN
 
     def _apply_column_widths(self, data_start_row, max_row, final_max_col):
         """헤더 텍스트 길이 기준으로 컬럼 너비 설정 (Unadjusted 이후)."""
@@ -1272,16 +1769,181 @@ class Analysis:
             width = max(10, min(50, max_len + 4))
             self.ws.column_dimensions[get_column_letter(col_idx)].width = width
 
-    def save_file(self):
+    def _layout_state(self):
+        """
+        양적기준 외의 시트 구성을 결정하는 입력값 (결과 파일에 LAYOUT_PROPERTY로 저장).
+
+        Raw 파일은 경로와 내용 해시(input_cache.content_hash)로 식별하므로, 복사/동기화 도구가 크기와
+        수정시각을 유지한 채 내용을 바꾼 경우에도 증분 갱신하지 않습니다.
+        Raw 파일을 읽을 수 없으면 None (증분 갱신 불가). 나눠 내보낸 여러 파일이면 raw_file은 파일별 목록.
+        """
+        paths = source_paths(self.data_path)
+        try:
+            if self._raw_hash is None:
+                self._raw_hash = content_hash(self.data_path)
+        except (OSError, TypeError):
+            return None
+        raw_files = [os.path.abspath(path) for path in paths]
+        return {
+            "version": LAYOUT_STATE_VERSION,
+            "raw_file": raw_files[0] if len(raw_files) == 1 else raw_files,
+            "raw_hash": self._raw_hash,
+            "start_year": self.start_year,
+            "end_year": self.end_year,
+            "number_of_criteria": self.number_of_criteria,
+            "summary_mode": self.summary_mode,
+            "prefiltered": self.prefilter_configs is not None,
+            "data_rows": self.data_row_count,
+        }
+
+    def _save_with_layout_state(self, wb, ws, filepath):
+        """wb를 저장하면서 시트 구성 정보와 ws 시트 파트의 CRC를 사용자 지정 문서 속성으로 기록합니다."""
+        state = self._layout_state()
+        if state is None:
+            wb.save(filepath)
+            return
+        wb.custom_doc_props.append(StringProperty(name=LAYOUT_PROPERTY, value=json.dumps(state)))
+        save_workbook(wb, filepath, LAYOUT_PROPERTY, ws)
+
+    def prepare_incremental(self, previous_path):
+        """
+        previous_path가 같은 Raw 파일/기간/기준 수로 만든 결과 파일이면 증분 갱신을 준비하고 True를 반환합니다.
+
+        증분 갱신 시에는 헤더 영역만 작성하고(write-only 모드와 동일), 저장 시 이전 파일에서
+        기본정보 / 기준 설명표 / 기준 계정명 / 20·21행 요약 / 기준·양적통과 컬럼만 교체합니다.
+        생존 행만 기록하는 모드(prefilter_configs)는 기준에 따라 행이 달라지므로 지원하지 않습니다.
+
+        이전 파일의 셀은 이 앱이 기록한 XML 형식 그대로라고 가정하고 고치므로, 시트 구성 정보가 일치하고
+        시트 파트가 저장 당시 CRC(SHEET_CRC_KEY) 그대로인 파일만 대상입니다. Excel 등 다른 프로그램에서
+        다시 저장한 파일은 전체를 다시 생성합니다.
+        """
+        if not previous_path or self.prefilter_configs is not None or not os.path.isfile(previous_path):
+            return False
+
+        stored = read_json_property(previous_path, LAYOUT_PROPERTY)
+        current = self._layout_state()
+        if stored is None or current is None:
+            logger.info("증분 갱신 불가 (시트 구성 정보 없음): %s", previous_path)
+            return False
+
+        data_rows = stored.pop("data_rows", None)
+        sheet_crc = stored.pop(SHEET_CRC_KEY, None)
+        current.pop("data_rows")
+        if stored != current or data_rows is None:
+            logger.info("증분 갱신 불가 (Raw 파일/기간/기준 수 변경): %s", previous_path)
+            return False
+        if sheet_crc is None or not sheet_unchanged(previous_path, self._sheet_title(), sheet_crc):
+            logger.info("증분 갱신 불가 (저장 후 다른 프로그램에서 수정된 파일): %s", previous_path)
+            return False
+
+        self.write_only = True
+        self.data_row_count = data_rows
+        self.incremental_source = previous_path
+        logger.info("증분 갱신: %s의 양적기준 관련 셀만 다시 작성합니다.", previous_path)
+        return True
+
+    def load_incremental_data(self):
+        """증분 갱신 시 Raw 데이터 적재 (기준/요약을 값으로 기록하는 경우에만 필요)."""
+        if self.criteria_values or self.summary_mode == "values":
+            self._populate_raw_data_from_excel()
+
+    def _patch_previous_output(self, filepath):
+        """incremental_source의 양적기준 관련 셀만 현재 값으로 바꿔 filepath로 저장합니다."""
+        q_col = self.quantitative_start_col
+        criteria_cols = range(q_col, q_col + self.number_of_criteria)
+        header_cells = [
+            *[(row, [1]) for row in (1, 2, 3)],                                 # 기본정보
+            *[(6 + i, [2]) for i in range(self.number_of_criteria)],            # 기준 설명표 (B:H 병합)
+            (20, criteria_cols), (21, criteria_cols),                           # 탈락/통과 요약
+            (self.quantitative_start_row + 2, criteria_cols),                   # 기준 계정명
+        ]
+        header_values = {}
+        for row, cols in header_cells:
+            header_values.setdefault(row, {}).update(
+                {col: self.ws.cell(row=row, column=col).value for col in cols}
+            )
+
+        data_start_row = self.qualitative_start_row + 3
+        data_rows = range(data_start_row, self._last_data_row() + 1) if self.data_row_count else range(0)
+        data_columns = [(col, self._row_formulas.get(col)) for col in range(q_col, q_col + self.number_of_criteria + 1)]
+
+        def row_values(row):
+            if row in header_values:
+                return header_values[row]
+            return {col: None if fn is None else fn(row) for col, fn in data_columns}
+
+        patch_worksheet(self.incremental_source, filepath, self.ws.title,
+                        set(header_values).union(data_rows), row_values, json_property=LAYOUT_PROPERTY)
+
+    def build_values_frame(self, criteria_configs):
+        """
+        시트의 계산 결과를 값으로만 담은 DataFrame.
+
+        - 컬럼: BvD ID number, Flow/WA3/비율/Unadjusted 지표 (ScreeningMetrics.to_frame()),
+          기준1 ~ 기준N, 양적통과 ("Yes"/"No")
+        - 수식과 같은 규칙으로 NumPy에서 계산하므로 결과 통합문서를 열어 재계산할 필요가 없습니다.
+        """
+        configs = criteria_configs[:self.number_of_criteria]
+        metrics = self.get_metrics().to_frame().reset_index(drop=True)
+        results = self.get_evaluator().evaluate(configs, self.number_of_criteria).reset_index(drop=True)
+        frame = pd.concat([metrics, results], axis=1)
+
+        ids = self._raw_column_values(EXPORT_ID_COLUMN)
+        if ids is not None:
+            # Parquet 컬럼 타입을 문자열로 고정 (공란은 None)
+            ids = [None if pd.isna(v) else str(v) for v in ids]
+        frame.insert(0, EXPORT_ID_COLUMN, ids)
+        return frame
+
+    def export_values(self, criteria_configs, fmt="parquet", period_str=None):
+        """
+        build_values_frame() 결과를 Parquet 또는 CSV 파일로 저장합니다 (파일명 규칙은 결과 통합문서와 같음).
+
+        Raw 데이터가 아직 적재되지 않았으면 먼저 적재합니다 (증분 갱신 등).
+
+        Returns:
+        - 저장한 파일 경로 (Raw 데이터가 없으면 None)
+
+        Raises:
+        - ValueError: 지원하지 않는 형식
+        - ImportError: Parquet 저장에 필요한 pyarrow가 없는 경우
+        """
+        if fmt not in VALUES_EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt} (가능한 값: {', '.join(VALUES_EXPORT_FORMATS)})")
+        if not self.has_raw_data():
+            self._populate_raw_data_from_excel()
+        if not self.has_raw_data():
+            logger.warning("Raw 데이터가 없어 계산값을 내보내지 않습니다.")
+            return None
+
+        frame = self.build_values_frame(criteria_configs)
+        filepath = self._output_filepath(period_str, extension=fmt)
+        if fmt == "parquet":
+            frame.to_parquet(filepath, index=False)
+        else:
+            # Excel에서 바로 열어도 한글 헤더가 깨지지 않도록 BOM 포함
+            frame.to_csv(filepath, index=False, encoding="utf-8-sig")
+        self.export_path = filepath
+        logger.info("계산값 저장 완료: %s (%d행)", filepath, len(frame))
+        return filepath
+
+    def _period_label(self):
+        """파일명용 분석 기간 (예: "21-23")."""
+        return f"{str(self.start_year)[-2:]}-{str(self.end_year)[-2:]}"
+
+    def _output_filepath(self, period_str=None, extension="xlsx"):
+        """
+        결과 파일 경로 (같은 이름의 파일이 있으면 (1), (2)... 를 붙인 새 경로).
+
+        period_str: 파일명의 기간 부분 (기본값: _period_label(), 여러 기간을 한 파일에 쓸 때 지정)
+        extension: 확장자 (계산값 내보내기는 "parquet" / "csv")
+        """
         # Naming Rule: [Company]_QuantitativeAnalysis_[Period].xlsx
         # e.g. Samsung_QuantitativeAnalysis_22-24.xlsx
+        if period_str is None:
+            period_str = self._period_label()
         
-        # Period string: e.g. "21-23"
-        start_yy = str(self.start_year)[-2:]
-        end_yy = str(self.end_year)[-2:]
-        period_str = f"{start_yy}-{end_yy}"
-        
-        base_filename = f"{self.name}_양적분석_{period_str}.xlsx"
+        base_filename = f"{self.name}_양적분석_{period_str}.{extension}"
         
         if self.output_path:
             target_dir = self.output_path
@@ -1302,9 +1964,20 @@ class Analysis:
                     filepath = new_filepath
                     break
                 counter += 1
-                
+        return filepath
+
+    def save_file(self):
+        filepath = self._output_filepath()
         try:
-            self.wb.save(filepath)
+            if self.incremental_source is not None:
+                self._patch_previous_output(filepath)
+            elif self.write_only:
+                self._stream_workbook(filepath)
+            else:
+                if self.rejected_df is not None:
+                    self._write_rejected_sheet(self.wb)
+                self._save_with_layout_state(self.wb, self.ws, filepath)
+            self.saved_path = filepath
             logger.info("파일 저장 완료: %s", filepath)
 
         except PermissionError:
@@ -1322,6 +1995,128 @@ class Analysis:
             self.wb.close()
 
 
+    def _stream_workbook(self, filepath):
+        """
+        write-only 통합문서로 시트를 한 행씩 스트리밍하여 저장합니다.
+
+        헤더 영역(1행 ~ 헤더 3행)은 self.ws에 작성된 셀을 그대로 복사하고,
+        데이터 행은 원본 값 + 행 수식 + 컬럼별 서식으로 행 순서대로 생성하므로
+        행 수와 무관하게 메모리 사용량이 일정합니다.
+        """
+        out_wb = Workbook(write_only=True)
+        out_ws = self._stream_sheet(out_wb)
+
+        if self.rejected_df is not None:
+            self._write_rejected_sheet(out_wb)
+
+        self._save_with_layout_state(out_wb, out_ws, filepath)
+
+    def _stream_sheet(self, out_wb):
+        """self.ws와 같은 이름의 시트를 write-only 통합문서 out_wb에 스트리밍하고 그 시트를 반환합니다."""
+        out_ws = out_wb.create_sheet(self.ws.title)
+
+        # 컬럼 너비 / 병합 범위 (행 기록 전에 설정)
+        for key, dim in self.ws.column_dimensions.items():
+            if dim.width:
+                out_ws.column_dimensions[key].width = dim.width
+            if dim.hidden:
+                out_ws.column_dimensions[key].hidden = True
+        for merged_range in self.ws.merged_cells.ranges:
+            out_ws.merged_cells.add(str(merged_range))
+
+        # 1. 헤더 영역 복사
+        header_end_row = self.qualitative_start_row + 2
+        for row_cells in self.ws.iter_rows(min_row=1, max_row=header_end_row):
+            out_ws.append([self._to_write_only_cell(out_ws, cell) for cell in row_cells])
+
+        # 2. 데이터 행 스트리밍
+        for row_values in self._iter_data_rows(out_ws):
+            out_ws.append(row_values)
+        return out_ws
+
+    @staticmethod
+    def _to_write_only_cell(ws, cell):
+        """일반 셀을 값과 서식을 유지한 WriteOnlyCell로 변환합니다."""
+        if not cell.has_style:
+            return cell.value
+        new_cell = WriteOnlyCell(ws, value=cell.value)
+        new_cell.font = copy(cell.font)
+        new_cell.fill = copy(cell.fill)
+        new_cell.border = copy(cell.border)
+        new_cell.alignment = copy(cell.alignment)
+        new_cell.number_format = cell.number_format
+        new_cell.protection = copy(cell.protection)
+        return new_cell
+
+    def _data_row_columns(self):
+        """데이터 행 구성 (시작 행, Raw 컬럼 범위, 행 너비, 행 수식 목록)."""
+        data_start_row = self.qualitative_start_row + 3
+        raw_offset = self.raw_data_start_col - 1
+        raw_end = raw_offset + len(self.ordered_columns)
+        row_width = max([self._data_max_col, raw_end, *self._row_formulas])
+        formulas = sorted(self._row_formulas.items())
+        return data_start_row, (raw_offset, raw_end), row_width, formulas
+
+    def _data_row_layout(self, ws):
+        """_data_row_columns() + 컬럼별 서식 템플릿."""
+        data_start_row, raw_range, row_width, formulas = self._data_row_columns()
+        templates = self._data_style_templates(ws, row_width)
+        return data_start_row, raw_range, row_width, formulas, templates
+
+    def _iter_data_values(self, data_start_row, raw_range, row_width, formulas):
+        """데이터 행 값 리스트 (행 번호 + Raw 값 + formulas 컬럼)를 행 순서대로 생성합니다."""
+        raw_offset, raw_end = raw_range
+        for i, raw_values in enumerate(self._iter_raw_rows()):
+            row = data_start_row + i
+            values = [None] * row_width
+            values[0] = i + 1
+            values[raw_offset:raw_end] = raw_values
+            for col, formula_fn in formulas:
+                values[col - 1] = formula_fn(row)
+            yield values
+
+    def _iter_data_rows(self, ws):
+        """데이터 행을 행 순서대로 하나씩 생성합니다 (값 리스트, 서식 셀 포함)."""
+        data_start_row, raw_range, row_width, formulas, templates = self._data_row_layout(ws)
+        date_styles = {}
+        for values in self._iter_data_values(data_start_row, raw_range, row_width, formulas):
+            yield [
+                value if template is None else self._make_data_cell(ws, value, template, date_styles)
+                for value, template in zip(values, templates)
+            ]
+
+    @staticmethod
+    def _make_data_cell(ws, value, template, date_styles):
+        """
+        템플릿 서식의 데이터 셀 생성 (날짜 값의 자동 포맷은 유지).
+
+        셀마다 서식을 복사하지 않고 컬럼 템플릿의 StyleArray를 공유합니다 (write-only 셀의 서식은 저장 시
+        번호로만 기록되고 이후 바뀌지 않음). 날짜 포맷을 더한 StyleArray는 date_styles
+        ({(템플릿 id, 포맷): StyleArray})에 한 번만 만듭니다.
+        """
+        cell = WriteOnlyCell(ws, value=value)
+        if cell.is_date and template.number_format == "General":
+            key = (id(template), cell.number_format)
+            style = date_styles.get(key)
+            if style is None:
+                cell._style = copy(template._style)
+                cell.number_format = key[1]
+                style = date_styles[key] = cell._style
+            cell._style = style
+        else:
+            cell._style = template._style
+        return cell
+
+
+def encode_categorical_columns(df):
+    """CATEGORICAL_COLUMNS(연도별 포함) 중 텍스트 컬럼을 category dtype으로 변환 (행마다 같은 문자열 보관 방지)."""
+    columns = {
+        column: df[column].astype("category") for column in df.columns
+        if (column in CATEGORICAL_COLUMNS or column.rstrip("0123456789") in CATEGORICAL_COLUMNS_YEARLY)
+        and pd.api.types.is_string_dtype(df[column].dtype)
+    }
+    return df.assign(**columns) if columns else df
+
 
 class SimpleUserInputConverter:
     """단순화된 사용자 입력 변환 클래스. Account명만 받아서 타입과 계산구분을 자동 결정."""
@@ -1609,28 +2404,292 @@ class DirectCriteriaConverter:
         return config
 
 
-def main_processor(payload):
-    input_data    = payload["inputData"]
-    criteria_list = payload["criteriaList"]
+def _input_cache_from_input(input_data):
+    """useCache가 True일 때만 입력 캐시 사용 (클라이언트 데이터를 디스크에 복사하므로 opt-in)."""
+    return ParsedInputCache(input_data.get("cacheDir")) if input_data.get("useCache", False) else None
 
-    converter = DirectCriteriaConverter(input_data["yearFrom"], input_data["yearTo"])
-    converted = converter.convert(criteria_list)
 
-    processor = Analysis(
+def _analysis_from_input(input_data, criteria_list, converted, start_year, end_year, input_cache):
+    """payload inputData 옵션으로 start_year ~ end_year 기간의 Analysis 생성."""
+    return Analysis(
         tested_party=input_data["targetCorp"],
         name=input_data["corpName"],
-        start_year=input_data["yearFrom"],
-        end_year=input_data["yearTo"],
+        start_year=start_year,
+        end_year=end_year,
         number_of_criteria=len([c for c in converted if c is not None]),
         data_path=input_data["rawFilePath"],
         criteria_list=criteria_list,
         output_path=input_data.get("outputDir"),
+        write_only=input_data.get("writeOnly", False) or input_data.get("valuesOnly", False),
+        criteria_values=input_data.get("criteriaValues", False),
+        metric_values=input_data.get("metricValues", False),
+        summary_mode=input_data.get("summaryMode", "countifs"),
+        prefilter_configs=converted if input_data.get("survivorsOnly", False) else None,
+        rejected_sheet=input_data.get("rejectedSheet", False),
+        columnar_store=input_data.get("columnarStore", False),
+        input_cache=input_cache,
     )
 
-    processor.create_format()
-    processor._populate_raw_data_from_excel()
-    processor.insert_formular()
-    processor.apply_quantitative_criteria_formulas(converted)
-    processor.insert_pass_fail_summary()
-    processor.apply_final_styles()
-    processor.save_file()
+
+def _values_export_options(input_data):
+    """
+    inputData의 valuesOnly / valuesExport → (values_only, 내보내기 형식 또는 None).
+
+    Raises:
+    - ValueError: 지원하지 않는 형식 (결과 파일을 만들기 전에 확인)
+    """
+    values_only = bool(input_data.get("valuesOnly", False))
+    values_format = input_data.get("valuesExport") or ("parquet" if values_only else None)
+    if values_format is not None and values_format not in VALUES_EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {values_format} "
+                         f"(가능한 값: {', '.join(VALUES_EXPORT_FORMATS)})")
+    return values_only, values_format
+
+
+def main_processor(payload, progress_callback=None, cancel_event=None, require_data=False):
+    """
+    payload로 양적분석 파일을 생성하고 단계별 측정 결과를 반환합니다.
+
+    Parameters:
+    - payload: {"inputData": {...}, "criteriaList": [...]}
+    - progress_callback: fn(stage, index, total) — 각 단계(PIPELINE_STAGES) 시작 시 호출 (선택)
+    - cancel_event: threading.Event — 설정되면 다음 단계 시작 전에 ProcessingCancelled 발생 (선택)
+    - require_data: True이면 Raw 파일을 읽지 못한 경우 빈 결과 파일을 만들지 않고 RawDataError 발생
+
+    inputData 옵션:
+    - traceMemory: True이면 tracemalloc으로 단계별 최대 할당량도 측정 (느려짐)
+    - profileOutput: 측정 결과 JSON 저장 경로
+    - incrementalFrom: 이전 결과 파일 경로 — 같은 Raw 파일/기간/기준 수로 만든 파일이면
+      양적기준 관련 셀만 교체한 새 파일을 만들고(INCREMENTAL_STAGES), 아니면 전체를 다시 생성
+    - windows: [[시작연도, 종료연도], ...] — 설정되면 multi_window_processor로 처리
+      (separateWorkbooks: True이면 기간별 파일로 저장)
+    - valuesExport: "parquet" | "csv" — 결과 파일 저장 후 지표/기준별 Yes·No/양적통과 계산값을
+      같은 이름 규칙의 파일로 저장 ("export" 단계)
+    - valuesOnly: True이면 통합문서를 만들지 않고 계산값 파일만 저장 (VALUES_ONLY_STAGES,
+      valuesExport가 없으면 Parquet)
+    - useCache: True이면 파싱한 Raw 데이터를 입력 캐시(cacheDir, 기본값 input_cache.DEFAULT_CACHE_DIR,
+      최대 DEFAULT_MAX_BYTES)에 저장/재사용 (기본값: 사용 안 함)
+
+    Returns:
+    - PipelineProfiler.to_dict() — {"stages": [{"name", "wall_s", "cpu_s", "rss_start_mb", "rss_end_mb", ...}],
+      "total": {...}, "rows", "cells", "formulas", "output_file", "export_file"}
+    """
+    input_data    = payload["inputData"]
+    criteria_list = payload["criteriaList"]
+    if input_data.get("windows"):
+        return multi_window_processor(payload, input_data["windows"], input_data.get("separateWorkbooks", False),
+                                      progress_callback, cancel_event, require_data)
+
+    values_only, values_format = _values_export_options(input_data)
+    profiler = PipelineProfiler(trace_memory=input_data.get("traceMemory", False))
+
+    with profiler.stage("convert"):
+        converter = DirectCriteriaConverter(input_data["yearFrom"], input_data["yearTo"])
+        converted = converter.convert(criteria_list)
+
+    processor = _analysis_from_input(input_data, criteria_list, converted, input_data["yearFrom"], input_data["yearTo"],
+                                     _input_cache_from_input(input_data))
+
+    def apply_criteria():
+        processor.apply_quantitative_criteria_formulas(converted)
+        processor.insert_pass_fail_summary()
+
+    incremental = not values_only and processor.prepare_incremental(input_data.get("incrementalFrom"))
+    if values_only:
+        pipeline = VALUES_ONLY_STAGES
+        stages = {"load": processor._populate_raw_data_from_excel}
+    elif incremental:
+        pipeline = INCREMENTAL_STAGES
+        stages = {
+            "format": processor.create_format,
+            "load": processor.load_incremental_data,
+            "criteria": apply_criteria,
+            "save": processor.save_file,
+        }
+    else:
+        pipeline = PIPELINE_STAGES
+        stages = {
+            "format": processor.create_format,
+            "load": processor._populate_raw_data_from_excel,
+            "formulas": processor.insert_formular,
+            "criteria": apply_criteria,
+            "styles": processor.apply_final_styles,
+            "save": processor.save_file,
+        }
+    if values_format is not None:
+        pipeline = pipeline if "export" in pipeline else pipeline + ("export",)
+        stages["export"] = lambda: processor.export_values(converted, values_format)
+    try:
+        for index, stage in enumerate(pipeline):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ProcessingCancelled(f"'{stage}' 단계 전에 작업이 취소되었습니다.")
+            if progress_callback is not None:
+                progress_callback(stage, index, len(pipeline))
+            with profiler.stage(stage):
+                stages[stage]()
+            if stage == "load" and require_data and not processor.has_raw_data() and not incremental:
+                raise RawDataError(f"Raw 파일에서 데이터를 읽지 못했습니다: {input_data['rawFilePath']}")
+    except WorkbookPatchError as e:
+        # 이전 결과 파일이 Excel 등에서 다시 저장되어 구조가 바뀐 경우: 전체 재생성
+        logger.warning("증분 갱신 실패, 전체를 다시 생성합니다: %s", e)
+        input_data = {key: value for key, value in input_data.items() if key != "incrementalFrom"}
+        return main_processor({**payload, "inputData": input_data}, progress_callback, cancel_event, require_data)
+    finally:
+        profiler.stop()
+
+    profiler.counts.update(processor.get_output_stats())
+    profiler.counts["output_file"] = processor.saved_path
+    profiler.counts["export_file"] = processor.export_path
+    if input_data.get("profileOutput"):
+        profiler.write_json(input_data["profileOutput"])
+    return profiler.to_dict()
+
+
+def multi_window_processor(payload, windows, separate_workbooks=False, progress_callback=None, cancel_event=None,
+                           require_data=False):
+    """
+    같은 Raw 파일을 여러 분석 기간으로 처리합니다 (예: FY21-23, FY22-24, FY20-24).
+
+    - Raw 파일은 모든 기간의 컬럼을 합쳐 한 번만 읽고, 기간별 Analysis가 필요한 컬럼만 공유합니다.
+    - 기간별 ScreeningMetrics는 연도별 계산 결과(셀 분류, SUM 값, 연도별 Flow)를 공유하므로
+      겹치는 연도는 한 번만 계산합니다 (생존 행만 기록하는 경우 필터링 이후에는 기간별로 계산).
+    - 기본값은 기간별 Screening 시트를 한 통합문서에 저장하고, separate_workbooks=True이면
+      main_processor와 같은 이름 규칙으로 기간별 파일에 저장합니다.
+      (한 통합문서로 저장한 파일은 증분 갱신(incrementalFrom) 대상이 아닙니다.)
+    - valuesExport / valuesOnly는 main_processor와 같고, 계산값 파일은 기간별로 저장합니다.
+
+    Parameters:
+    - payload: main_processor와 같은 형식 (inputData의 yearFrom/yearTo 대신 windows 사용)
+    - windows: [(시작연도, 종료연도), ...]
+    - progress_callback / cancel_event / require_data: main_processor와 동일
+
+    Returns:
+    - PipelineProfiler.to_dict() — 단계명은 "convert", "load"(공통), "FY2123:formulas" 형식,
+      "output_files": 저장한 파일 목록 ("output_file"은 첫 번째 파일), "export_files": 계산값 파일 목록
+    """
+    input_data = payload["inputData"]
+    criteria_list = payload["criteriaList"]
+    windows = list(dict.fromkeys((int(start_year), int(end_year)) for start_year, end_year in windows))
+    if not windows:
+        raise ValueError("분석 기간(windows)이 비어 있습니다.")
+    values_only, values_format = _values_export_options(input_data)
+    profiler = PipelineProfiler(trace_memory=input_data.get("traceMemory", False))
+    input_cache = _input_cache_from_input(input_data)
+
+    with profiler.stage("convert"):
+        jobs = []
+        for start_year, end_year in windows:
+            converted = DirectCriteriaConverter(start_year, end_year).convert(criteria_list)
+            jobs.append((_analysis_from_input(input_data, criteria_list, converted, start_year, end_year, input_cache),
+                         converted))
+    analyses = [analysis for analysis, _ in jobs]
+    write_only = analyses[0].write_only
+
+    # 한 통합문서에 저장: 일반 모드는 첫 번째 Analysis의 통합문서에 기간별 시트 추가,
+    # write-only 모드는 기간별 처리가 끝날 때마다 시트를 스트리밍
+    out_wb = None
+    if not separate_workbooks and not values_only:
+        if write_only:
+            out_wb = Workbook(write_only=True)
+        else:
+            for analysis in analyses[1:]:
+                analysis.wb = analyses[0].wb
+                analysis.ws = analysis.wb.create_sheet()
+
+    def window_stages(analysis, converted, source):
+        def load():
+            if source is not None:
+                analysis._populate_raw_data_from_excel(source)
+
+        def apply_criteria():
+            analysis.apply_quantitative_criteria_formulas(converted)
+            analysis.insert_pass_fail_summary()
+
+        def export():
+            analysis.export_values(converted, values_format)
+
+        if values_only:
+            return [("load", load), ("export", export)]
+        stages = [
+            ("format", analysis.create_format),
+            ("load", load),
+            ("formulas", analysis.insert_formular),
+            ("criteria", apply_criteria),
+            ("styles", analysis.apply_final_styles),
+        ]
+        if separate_workbooks:
+            stages.append(("save", analysis.save_file))
+        elif write_only:
+            stages.append(("write", lambda: analysis._stream_sheet(out_wb)))
+        if values_format is not None:
+            stages.append(("export", export))
+        return stages
+
+    if values_only:
+        window_total = 2
+    else:
+        window_total = (6 if separate_workbooks or write_only else 5) + (1 if values_format is not None else 0)
+    total = 1 + len(jobs) * window_total + (0 if separate_workbooks or values_only else 1)
+    step = iter(range(total))
+
+    def run_stage(name, fn):
+        index = next(step)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ProcessingCancelled(f"'{name}' 단계 전에 작업이 취소되었습니다.")
+        if progress_callback is not None:
+            progress_callback(name, index, total)
+        with profiler.stage(name):
+            fn()
+
+    try:
+        # 모든 기간의 컬럼을 합쳐 한 번만 읽기
+        columns = list(dict.fromkeys(column for analysis in analyses for column in analysis.ordered_columns))
+        loaded = []
+
+        def load_source():
+            source = analyses[0].read_source(columns)
+            if isinstance(source, pd.DataFrame):
+                source = encode_categorical_columns(source)
+            loaded.append(source)
+
+        run_stage("load", load_source)
+        source = loaded[0]
+        if source is None and require_data:
+            raise RawDataError(f"Raw 파일에서 데이터를 읽지 못했습니다: {input_data['rawFilePath']}")
+
+        metrics_cache = {}
+        for analysis, converted in jobs:
+            analysis.metrics_cache = metrics_cache
+            label = f"FY{analysis.start_year - 2000}{analysis.end_year - 2000}"
+            for name, fn in window_stages(analysis, converted, source):
+                run_stage(f"{label}:{name}", fn)
+
+        if not separate_workbooks and not values_only:
+            period_str = "_".join(analysis._period_label() for analysis in analyses)
+            filepath = analyses[0]._output_filepath(period_str)
+
+            def save():
+                wb = out_wb if write_only else analyses[0].wb
+                for analysis in analyses:
+                    if analysis.rejected_df is not None:
+                        analysis._write_rejected_sheet(wb)
+                wb.save(filepath)
+                for analysis in analyses:
+                    analysis.saved_path = filepath
+                logger.info("파일 저장 완료: %s", filepath)
+
+            run_stage("save", save)
+    finally:
+        profiler.stop()
+        if not separate_workbooks and not write_only:
+            analyses[0].wb.close()
+
+    for key in ("rows", "cells", "formulas"):
+        profiler.counts[key] = sum(analysis.get_output_stats()[key] for analysis in analyses)
+    output_files = list(dict.fromkeys(analysis.saved_path for analysis in analyses if analysis.saved_path))
+    profiler.counts["output_files"] = output_files
+    profiler.counts["output_file"] = output_files[0] if output_files else None
+    profiler.counts["export_files"] = [analysis.export_path for analysis in analyses if analysis.export_path]
+    if input_data.get("profileOutput"):
+        profiler.write_json(input_data["profileOutput"])
+    return profiler.to_dict()
@@ -0,0 +1,77 @@
+# tests/conftest.py
+# 공통 fixture: 저장소 루트 import 경로 + 경계값 행을 추가한 합성 BvD Export
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+START_YEAR = 2021
+END_YEAR = 2023
+SYNTHETIC_ROWS = 40
+
+# 합성 행 뒤에 덮어쓰는 경계값 행 — {Raw 컬럼 기본명: 연도별 값}
+EDGE_ROWS = [
+    # 매출원가 전체 공란 → WA3 매출원가 0 → 재고자산보유일수 IFERROR(..., "")
+    {"Costs of goods sold\nth USD ": [None, None, None]},
+    # 매출원가 0 → 재고자산보유일수 "" / 감사의견 모든 연도 일치
+    {"Costs of goods sold\nth USD ": [0, 0, 0], "Audit status\n": ["Unqualified"] * 3},
+    # 재고자산 "n.a." 텍스트 / 직원수 일부 공란
+    {"Stock\nth USD ": ["n.a.", "n.a.", "n.a."], "Number of employees\n": [None, 120, None]},
+    # 영업이익 음수·0·양수 (1개년이라도 / 모든연도 경계)
+    {"Operating profit (loss) [EBIT]\nth USD ": [-5, 0, 10], "Audit status\n": ["Unqualified"] * 3},
+    # 매출 텍스트 숫자 / 공란 혼합
+    {"Operating revenue (Turnover)\nth USD ": ["150", None, "n.a."]},
+]
+
+
+def calculated_values(path):
+    """formulas 라이브러리로 결과 파일을 계산한 {셀 주소: 값} (첫 시트)."""
+    import formulas
+
+    solution = formulas.ExcelModel().loads(path).finish().calculate()
+    values = {}
+    for key, value in solution.items():
+        key = str(key)
+        if "!" in key and ":" not in key:
+            values[key.split("!")[1]] = value.value[0, 0] if hasattr(value, "value") else value
+    return values
+
+
+@pytest.fixture(scope="session")
+def synthetic_raw(tmp_path_factory):
+    """합성 Results 시트 (SYNTHETIC_ROWS행 + EDGE_ROWS) 파일 경로."""
+    from openpyxl import load_workbook
+
+    from benchmarks.synthetic import generate_results_sheet
+
+    path = str(tmp_path_factory.mktemp("raw") / "results.xlsx")
+    generate_results_sheet(path, SYNTHETIC_ROWS + len(EDGE_ROWS), START_YEAR, END_YEAR, seed=7)
+
+    wb = load_workbook(path)
+    ws = wb["Results"]
+    header = [cell.value for cell in ws[1]]
+    for offset, overrides in enumerate(EDGE_ROWS):
+        row = ws.max_row - len(EDGE_ROWS) + 1 + offset
+        for base_name, values in overrides.items():
+            for year, value in zip(range(START_YEAR, END_YEAR + 1), values):
+                # ws.cell(..., value=None)은 기존 값을 지우지 않으므로 직접 대입
+                ws.cell(row=row, column=header.index(f"{base_name}{year}") + 1).value = value
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def make_payload(synthetic_raw, tmp_path):
+    """fn(criteria_list, **inputData 옵션) → main_processor payload (결과는 tmp_path에 저장)."""
+    def make(criteria_list, **options):
+        input_data = {
+            "corpName": "Test", "targetCorp": "Target", "yearFrom": START_YEAR, "yearTo": END_YEAR,
+            "rawFilePath": synthetic_raw, "outputDir": str(tmp_path),
+        }
+        input_data.update(options)
+        return {"inputData": input_data, "criteriaList": [dict(criteria) for criteria in criteria_list]}
+    return make
@@ -0,0 +1,22 @@
+# tests/test_cli.py
+# 명령행 옵션이 payload 검증 전에 반영되는지 확인
+import json
+
+import cli
+from conftest import END_YEAR, START_YEAR
+
+CRITERIA = [{"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True}]
+
+
+def test_windows_option_replaces_year_keys(make_payload, tmp_path):
+    """payload에 yearFrom/yearTo가 없어도 --windows가 있으면 실행합니다."""
+    payload = make_payload(CRITERIA)
+    for key in ("yearFrom", "yearTo"):
+        del payload["inputData"][key]
+    payload_path = tmp_path / "payload.json"
+    payload_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    windows = f"{START_YEAR}-{END_YEAR},{START_YEAR + 1}-{END_YEAR}"
+    assert cli.main([str(payload_path), "--windows", windows]) == cli.EXIT_OK
+    assert len(list(tmp_path.glob("*_양적분석_*.xlsx"))) == 1
+    assert cli.main([str(payload_path)]) == cli.EXIT_INVALID_INPUT
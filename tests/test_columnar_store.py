@@ -0,0 +1,38 @@
+# tests/test_columnar_store.py
+# ColumnarStore 저장/memmap 열기 왕복과 여러 부분을 이어 붙일 때의 텍스트 사전 병합 확인
+import numpy as np
+import pandas as pd
+
+from columnar_store import ColumnarStore
+from loader import read_input
+
+
+def _values(store, column):
+    return list(store.column_values(column))
+
+
+def test_save_open_round_trip(synthetic_raw, tmp_path):
+    frame = read_input(synthetic_raw, ["BvD ID number", "Audit status\n2023", "Stock\nth USD 2023",
+                                       "Number of employees\n2022"])
+    store = ColumnarStore.from_frame(frame)
+    store.save(str(tmp_path))
+    opened = ColumnarStore.open(str(tmp_path))
+
+    assert len(opened) == len(frame)
+    for column in frame.columns:
+        assert _values(opened, column) == _values(store, column)
+        assert isinstance(opened.columns[column].kinds, np.memmap)
+
+
+def test_concat_merges_text_dictionaries():
+    first = pd.DataFrame({"Status": ["Active", "n.a.", None], "Sales": [1.0, "n.a.", None]})
+    second = pd.DataFrame({"Status": ["Dissolved", "Active"], "City": ["Seoul", None]})
+    store = ColumnarStore.concat([ColumnarStore.from_frame(first), ColumnarStore.from_frame(second)])
+
+    assert list(store.columns) == ["Status", "Sales", "City"]
+    assert _values(store, "Status") == ["Active", "n.a.", None, "Dissolved", "Active"]
+    assert _values(store, "Sales") == [1.0, "n.a.", None, None, None]
+    assert _values(store, "City") == [None, None, None, "Seoul", None]
+    codes, categories = store.text_codes("Status")
+    assert sorted(categories) == ["Active", "Dissolved", "n.a."]
+    assert codes[0] == codes[4]
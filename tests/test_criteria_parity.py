@@ -0,0 +1,131 @@
+# tests/test_criteria_parity.py
+# CriteriaEvaluator(값 계산)와 결과 파일 수식(formulas 라이브러리로 계산)의 Yes/No 일치 확인
+# (formulas는 requirements-dev.txt에 포함 — 설치되지 않은 환경에서는 건너뜀)
+import pandas as pd
+import pytest
+from openpyxl.utils import get_column_letter
+
+from conftest import END_YEAR, START_YEAR, calculated_values
+
+formulas = pytest.importorskip("formulas")
+
+from evaluator import CriteriaEvaluator  # noqa: E402
+from metrics import classify_cells, dictionary_encode  # noqa: E402
+from processor import Analysis, DirectCriteriaConverter, main_processor  # noqa: E402
+
+INVENTORY_DAYS = "재고자산보유일수\n(365/재고자산회전율)"
+
+# 결과 파일 기준 표가 20행(탈락/통과 요약) 위에 들어가도록 한 파일당 12개 이하로 나눔
+NUMERIC_CRITERIA = [
+    # 숫자-개별연도: count_requirement all / any / N (텍스트 "n.a."·공란 셀 포함)
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "초과",
+     "yearCondition": "모든연도", "include": True},
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "미만",
+     "yearCondition": "1개년이라도", "include": False},
+    {"type": "숫자-개별연도", "account": "직원수", "xValue": "100", "xCompare": "이상",
+     "yearCondition": "N개년이상", "nYears": "2", "include": True},
+    {"type": "숫자-개별연도", "account": "매출액(Turnover)", "xValue": "10000", "xCompare": "초과",
+     "yearCondition": "1개년이라도", "include": True},
+    {"type": "숫자-개별연도", "account": "재고자산", "xValue": "0", "xCompare": "같음",
+     "yearCondition": "N개년이상", "nYears": "1", "include": False},
+    # 데이터가용성 / WA3 평균 / 비율 (재고자산보유일수 IFERROR "" 대체값 포함)
+    {"type": "데이터가용성", "account": "재무정보가용성", "xValue": "", "xCompare": "존재함", "include": True},
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "10000", "xCompare": "이상", "include": True},
+    {"type": "비율", "account": "영업비용/매출액", "xValue": "0.05", "xCompare": "미만", "include": True},
+    {"type": "비율", "account": INVENTORY_DAYS, "xValue": "400", "xCompare": "초과", "include": True},
+    {"type": "비율", "account": INVENTORY_DAYS, "xValue": "400", "xCompare": "이하", "include": False},
+]
+TEXT_CRITERIA = [
+    # 텍스트: 일치 / 모든 연도 일치 / 포함 / 공란 / 공란아님
+    {"type": "텍스트", "account": "감사의견", "xValue": "Unqualified", "xCompare": "All equals", "include": True},
+    {"type": "텍스트", "account": "상장여부", "xValue": "listed", "xCompare": "텍스트 일치", "include": True},
+    {"type": "텍스트", "account": "주요활동", "xValue": "Manu", "xCompare": "텍스트 포함", "include": False},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란", "include": False},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True},
+    {"type": "텍스트", "account": "SIC코드", "xValue": "357", "xCompare": "텍스트 포함", "include": True},
+    {"type": "텍스트", "account": "감사의견", "xValue": "Qualified", "xCompare": "All equals", "include": False},
+    # 모든 연도 일치(COUNTIF)의 연산자/숫자 기준
+    {"type": "텍스트", "account": "감사의견", "xValue": "<>Unqualified", "xCompare": "All equals", "include": True},
+    {"type": "텍스트", "account": "감사의견", "xValue": "=Unqualified*", "xCompare": "All equals", "include": True},
+    {"type": "텍스트", "account": "감사의견", "xValue": "150", "xCompare": "All equals", "include": False},
+]
+# 양적통과 Yes 행이 생기도록 기준 수를 줄인 세트
+FUNNEL_CRITERIA = [
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "이상", "include": True},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란", "include": False},
+    {"type": "비율", "account": INVENTORY_DAYS, "xValue": "400", "xCompare": "초과", "include": True},
+]
+CRITERIA_SETS = {"numeric": NUMERIC_CRITERIA, "text": TEXT_CRITERIA, "funnel": FUNNEL_CRITERIA}
+
+
+@pytest.fixture(scope="module", params=sorted(CRITERIA_SETS))
+def parity(request, synthetic_raw, tmp_path_factory):
+    """기준 세트별 (결과 파일 계산값, 평가기 결과 DataFrame, Analysis)."""
+    criteria_list = CRITERIA_SETS[request.param]
+    output_dir = str(tmp_path_factory.mktemp("parity"))
+    payload = {
+        "inputData": {"corpName": "Test", "targetCorp": "Target", "yearFrom": START_YEAR, "yearTo": END_YEAR,
+                      "rawFilePath": synthetic_raw, "outputDir": output_dir},
+        "criteriaList": criteria_list,
+    }
+    profile = main_processor(payload, require_data=True)
+
+    configs = DirectCriteriaConverter(START_YEAR, END_YEAR).convert(criteria_list)
+    analysis = Analysis(start_year=START_YEAR, end_year=END_YEAR, number_of_criteria=len(configs),
+                        data_path=synthetic_raw, write_only=True)
+    analysis._populate_raw_data_from_excel()
+    expected = analysis.get_evaluator().evaluate(configs)
+    return calculated_values(profile["output_file"]), expected, analysis
+
+
+@pytest.mark.parametrize("name", sorted(CRITERIA_SETS))
+def test_all_criteria_converted(name):
+    criteria_list = CRITERIA_SETS[name]
+    assert len(DirectCriteriaConverter(START_YEAR, END_YEAR).convert(criteria_list)) == len(criteria_list)
+
+
+def test_inventory_days_fallback_present(parity):
+    """경계값 행(매출원가 공란/0)이 재고자산보유일수 "" 대체값을 실제로 만드는지 확인."""
+    values, _, analysis = parity
+    ratio_col = analysis.wa3_start_col + len(analysis._get_wa3_list()) + analysis._get_ratio_tab_list().index(INVENTORY_DAYS)
+    data_start_row = analysis.qualitative_start_row + 3
+    cells = [values.get(f"{get_column_letter(ratio_col)}{data_start_row + i}") for i in range(analysis.data_row_count)]
+    assert "" in cells
+    assert any(not isinstance(cell, str) for cell in cells)
+
+
+def test_evaluator_matches_formulas(parity):
+    """기준별(마지막은 양적통과) 행마다 수식 계산 결과와 평가기 결과가 같아야 합니다."""
+    values, expected, analysis = parity
+    data_start_row = analysis.qualitative_start_row + 3
+    for index, name in enumerate(expected.columns):
+        column = get_column_letter(analysis.quantitative_start_col + index)
+        actual = [str(values.get(f"{column}{data_start_row + i}")) for i in range(analysis.data_row_count)]
+        assert actual == list(expected[name]), name
+
+
+COUNTIF_CELLS = [150, "150", " 150 ", "n.a.", None, 5, "", "Unqualified", "inf"]
+
+
+@pytest.mark.parametrize("criterion, expected", [
+    # 숫자 기준 "="은 숫자 셀과 숫자로 해석되는 텍스트 셀 ("inf"는 텍스트)
+    ("150", [1, 1, 1, 0, 0, 0, 0, 0, 0]),
+    ("=150", [1, 1, 1, 0, 0, 0, 0, 0, 0]),
+    ("<>150", [0, 0, 0, 1, 1, 1, 1, 1, 1]),
+    # 크기 비교는 숫자 셀만
+    (">0", [1, 0, 0, 0, 0, 1, 0, 0, 0]),
+    ("<=5", [0, 0, 0, 0, 0, 1, 0, 0, 0]),
+    # 텍스트 기준: 와일드카드(대소문자 무시) / 반대 / 사전순 비교는 텍스트 셀만
+    ("unq*", [0, 0, 0, 0, 0, 0, 0, 1, 0]),
+    ("<>unq*", [1, 1, 1, 1, 1, 1, 1, 0, 1]),
+    (">m", [0, 0, 0, 1, 0, 0, 0, 1, 0]),
+    # 빈 기준은 공란 셀(빈 문자열 포함), "<>"는 공란이 아닌 셀
+    ("", [0, 0, 0, 0, 1, 0, 1, 0, 0]),
+    ("<>", [1, 1, 1, 1, 0, 1, 0, 1, 1]),
+])
+def test_countif_criteria(criterion, expected):
+    """모든 연도 일치(COUNTIF)는 Excel COUNTIF 기준 규칙(연산자 접두사, 숫자 기준)을 따릅니다."""
+    series = pd.Series(COUNTIF_CELLS, dtype=object)
+    numbers, kinds = classify_cells(series)
+    text = dictionary_encode(series, kinds)
+    assert CriteriaEvaluator._text_countif(numbers, kinds, text, criterion).astype(int).tolist() == expected
@@ -0,0 +1,128 @@
+# tests/test_incremental_patch.py
+# 기준만 바꾼 증분 갱신(incrementalFrom, workbook_patch) 결과가 전체 재생성 결과와 같은지 확인
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from processor import INCREMENTAL_STAGES, PIPELINE_STAGES, main_processor
+
+CRITERIA_BEFORE = [
+    {"type": "텍스트", "account": "감사의견", "xValue": "Unqualified", "xCompare": "All equals", "include": True},
+    {"type": "데이터가용성", "account": "재무정보가용성", "xValue": "", "xCompare": "존재함", "include": True},
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "초과", "include": True},
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "미만",
+     "yearCondition": "1개년이라도", "include": False},
+]
+# 기준 수는 같고 유형/계정/기준값/순서가 바뀐 목록
+CRITERIA_AFTER = [
+    {"type": "숫자-개별연도", "account": "매출원가", "xValue": "100", "xCompare": "이상",
+     "yearCondition": "N개년이상", "nYears": "2", "include": True},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True},
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "5000", "xCompare": "초과", "include": True},
+    {"type": "비율", "account": "재고자산보유일수\n(365/재고자산회전율)", "xValue": "400", "xCompare": "이하",
+     "include": False},
+]
+
+
+def _stages(profile):
+    """실행된 파이프라인 단계 (기준 변환 "convert" 제외)."""
+    return [stage["name"] for stage in profile["stages"] if stage["name"] != "convert"]
+
+
+def _cells(path):
+    """{시트명: [(좌표, 값, 셀 서식 번호)]} — 값과 서식을 모두 비교."""
+    wb = load_workbook(path)
+    return {
+        ws.title: [(cell.coordinate, cell.value, cell.style_id) for row in ws.iter_rows() for cell in row]
+        for ws in wb.worksheets
+    }
+
+
+@pytest.mark.parametrize("options", [{}, {"writeOnly": True}], ids=["default", "writeOnly"])
+def test_incremental_patch_matches_full_rebuild(make_payload, tmp_path, options):
+    previous = main_processor(make_payload(CRITERIA_BEFORE, **options), require_data=True)
+    assert _stages(previous) == list(PIPELINE_STAGES)
+
+    patched = main_processor(
+        make_payload(CRITERIA_AFTER, incrementalFrom=previous["output_file"], targetCorp="Other", **options),
+        require_data=True,
+    )
+    assert _stages(patched) == list(INCREMENTAL_STAGES)
+
+    rebuild_dir = tmp_path / "rebuild"
+    rebuild_dir.mkdir()
+    rebuilt = main_processor(
+        make_payload(CRITERIA_AFTER, outputDir=str(rebuild_dir), targetCorp="Other", **options),
+        require_data=True,
+    )
+    assert patched["output_file"] != previous["output_file"]
+    assert _cells(patched["output_file"]) == _cells(rebuilt["output_file"])
+
+
+def test_incremental_falls_back_when_criteria_count_changes(make_payload):
+    previous = main_processor(make_payload(CRITERIA_BEFORE), require_data=True)
+    rebuilt = main_processor(
+        make_payload(CRITERIA_AFTER[:3], incrementalFrom=previous["output_file"]), require_data=True
+    )
+    assert _stages(rebuilt) == list(PIPELINE_STAGES)
+
+
+def test_incremental_falls_back_when_raw_content_changes(make_payload, synthetic_raw, tmp_path):
+    """크기/수정시각이 같아도 Raw 파일 내용이 바뀌면 전체를 다시 생성합니다."""
+    raw_path = tmp_path / "results.csv"
+    pd.read_excel(synthetic_raw, sheet_name="Results").to_csv(raw_path, index=False)
+    previous = main_processor(make_payload(CRITERIA_BEFORE, rawFilePath=str(raw_path)), require_data=True)
+
+    stat = os.stat(raw_path)
+    text = raw_path.read_text(encoding="utf-8")
+    raw_path.write_text(text.replace("Unqualified", "Unqualifie_", 1), encoding="utf-8")
+    os.utime(raw_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(raw_path).st_size == stat.st_size
+
+    rebuilt = main_processor(
+        make_payload(CRITERIA_AFTER, rawFilePath=str(raw_path), incrementalFrom=previous["output_file"]),
+        require_data=True,
+    )
+    assert _stages(rebuilt) == list(PIPELINE_STAGES)
+
+
+def test_incremental_patch_can_be_repeated(make_payload):
+    """패치한 파일에도 시트 파트 CRC가 갱신되어 다시 증분 갱신할 수 있습니다."""
+    previous = main_processor(make_payload(CRITERIA_BEFORE, writeOnly=True), require_data=True)
+    patched = main_processor(
+        make_payload(CRITERIA_AFTER, writeOnly=True, incrementalFrom=previous["output_file"]), require_data=True
+    )
+    again = main_processor(
+        make_payload(CRITERIA_BEFORE, writeOnly=True, incrementalFrom=patched["output_file"]), require_data=True
+    )
+    assert _stages(again) == list(INCREMENTAL_STAGES)
+    assert _cells(again["output_file"]) == _cells(previous["output_file"])
+
+
+def _resave_with_openpyxl(path):
+    load_workbook(path).save(path)
+
+
+def _rewrite_sheet_part(path):
+    """시트 XML의 셀 형식만 바꾸고 문서 속성은 그대로 둔 파일 (접두사 붙은 셀 요소)."""
+    with zipfile.ZipFile(path) as zf:
+        parts = {info.filename: zf.read(info) for info in zf.infolist()}
+    sheet = parts["xl/worksheets/sheet1.xml"].decode("utf-8")
+    sheet = sheet.replace("<worksheet ", '<worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main" ', 1)
+    parts["xl/worksheets/sheet1.xml"] = sheet.replace("<c ", "<x:c ").replace("</c>", "</x:c>").encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+@pytest.mark.parametrize("modify", [_resave_with_openpyxl, _rewrite_sheet_part], ids=["resaved", "rewritten"])
+def test_incremental_rebuilds_files_modified_elsewhere(make_payload, modify):
+    previous = main_processor(make_payload(CRITERIA_BEFORE, writeOnly=True), require_data=True)
+    modify(previous["output_file"])
+    rebuilt = main_processor(
+        make_payload(CRITERIA_AFTER, writeOnly=True, incrementalFrom=previous["output_file"]), require_data=True
+    )
+    assert _stages(rebuilt) == list(PIPELINE_STAGES)
@@ -0,0 +1,80 @@
+# tests/test_input_cache.py
+# 입력 캐시(ParsedInputCache) 키 / LRU 정리 / 캐시 적중 시 원본 재파싱 생략 확인
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import processor
+from input_cache import ParsedInputCache
+from loader import read_input, read_input_store
+
+CRITERIA = [{"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True}]
+COLUMNS = ["BvD ID number", "Company name Latin alphabet", "Sales\nth USD 2023"]
+
+
+def _fail_read(*args):
+    raise AssertionError("캐시 적중 시 원본을 다시 읽으면 안 됩니다.")
+
+
+def test_cached_run_skips_parsing(make_payload, tmp_path, monkeypatch):
+    options = {"useCache": True, "cacheDir": str(tmp_path / "cache"), "writeOnly": True}
+    first = processor.main_processor(make_payload(CRITERIA, **options), require_data=True)
+
+    monkeypatch.setattr(processor, "read_input", _fail_read)
+    second = processor.main_processor(make_payload(CRITERIA, **options), require_data=True)
+    assert (second["rows"], second["cells"]) == (first["rows"], first["cells"])
+
+
+@pytest.mark.parametrize("columns", [
+    ["BvD ID number", "Blank", "Mixed", "Number"],
+    ["BvD ID number", "Blank", "Number"],
+])
+def test_load_round_trip(tmp_path, columns):
+    """텍스트/숫자 혼합, 전부 빈 칸, 숫자만 있는 컬럼도 캐시 적중 시 원본 파싱과 같은 값/dtype."""
+    raw_path = tmp_path / "raw.csv"
+    raw_path.write_text("BvD ID number,Blank,Mixed,Number\nA1,,n.a.,1\nA2,,12,2.5\nA3,,,\n", encoding="utf-8")
+    cache = ParsedInputCache(str(tmp_path / "cache"))
+    expected = read_input(str(raw_path), columns)
+
+    pd.testing.assert_frame_equal(cache.load(str(raw_path), columns, read_input), expected)
+    pd.testing.assert_frame_equal(cache.load(str(raw_path), columns, _fail_read), expected)
+
+
+def test_load_store_round_trip(synthetic_raw, tmp_path):
+    """ColumnarStore 항목은 memmap으로 다시 열어도 원본과 같은 셀 값."""
+    cache = ParsedInputCache(str(tmp_path))
+    expected = read_input_store(synthetic_raw, COLUMNS)
+    cache.load_store(synthetic_raw, COLUMNS, read_input_store)
+    cached = cache.load_store(synthetic_raw, COLUMNS, _fail_read)
+
+    assert isinstance(cached.columns[COLUMNS[2]].kinds, np.memmap)
+    for column in COLUMNS:
+        assert list(cached.column_values(column)) == list(expected.column_values(column))
+
+
+def test_key_follows_content_and_columns(tmp_path):
+    raw_path = tmp_path / "raw.csv"
+    raw_path.write_text("BvD ID number\nA1\n", encoding="utf-8")
+    cache = ParsedInputCache(str(tmp_path / "cache"))
+    os.makedirs(cache.cache_dir)
+    key = cache._make_key(str(raw_path), COLUMNS)
+
+    assert cache._make_key(str(raw_path), COLUMNS) == key
+    assert cache._make_key(str(raw_path), COLUMNS[:1]) != key
+    raw_path.write_text("BvD ID number\nA2\nA3\n", encoding="utf-8")
+    assert cache._make_key(str(raw_path), COLUMNS) != key
+
+
+def test_evict_removes_least_recently_used(synthetic_raw, tmp_path):
+    cache = ParsedInputCache(str(tmp_path))
+    cache.load(synthetic_raw, COLUMNS[:1], read_input)
+    cache.load(synthetic_raw, COLUMNS[1:], read_input)
+    old_entry, new_entry = sorted((name for name in os.listdir(tmp_path) if name.startswith("v")),
+                                  key=lambda name: os.path.getmtime(tmp_path / name))
+    os.utime(tmp_path / old_entry, (0, 0))
+
+    cache.max_bytes = os.path.getsize(tmp_path / new_entry)
+    cache._evict()
+    assert [name for name in os.listdir(tmp_path) if name.startswith("v")] == [new_entry]
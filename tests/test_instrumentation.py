@@ -0,0 +1,18 @@
+# tests/test_instrumentation.py
+# 단계별 RSS 항목이 누적 최댓값이 아니라 단계마다의 값인지 확인
+from instrumentation import PipelineProfiler
+
+
+def test_stage_rss_is_per_stage():
+    profiler = PipelineProfiler()
+    with profiler.stage("allocate"):
+        block = b"\x01" * (200 * 1024 * 1024)  # 값을 채워 실제 페이지 할당
+    del block
+    with profiler.stage("idle"):
+        pass
+    allocate, idle = profiler.to_dict()["stages"]
+
+    assert allocate["peak_rss_growth_mb"] > 100
+    assert idle["peak_rss_growth_mb"] == 0
+    assert idle["rss_end_mb"] < allocate["rss_start_mb"] + 100
+    assert profiler.to_dict()["total"]["peak_rss_mb"] >= allocate["rss_start_mb"] + 100
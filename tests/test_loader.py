@@ -0,0 +1,71 @@
+# tests/test_loader.py
+# Raw 파일 형식별 pandas 엔진 선택 확인
+import pandas as pd
+import pytest
+
+import loader
+
+
+@pytest.mark.parametrize("filename, engine", [("raw.xlsx", "openpyxl"), ("raw.XLS", None)])
+def test_excel_engine_without_calamine(monkeypatch, filename, engine):
+    """calamine이 없으면 .xlsx는 openpyxl, .xls는 pandas 기본 엔진(xlrd)으로 읽습니다."""
+    calls = []
+    monkeypatch.setattr(loader, "_has_calamine", lambda: False)
+    monkeypatch.setattr(pd, "read_excel", lambda path, engine, **kwargs: calls.append(engine) or pd.DataFrame())
+
+    loader.read_results_sheet(filename, ["BvD ID number"])
+    assert calls == [engine]
+
+
+def _write_csv(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_csv_keeps_text_markers_and_infinity(tmp_path):
+    """"NA"/"null"/"inf" 등은 Excel 셀처럼 텍스트로, 빈 칸만 결측으로 읽습니다."""
+    path = _write_csv(tmp_path / "raw.csv", [
+        "BvD ID number,Revenue,Code",
+        "A1,NA,0111",
+        "A2,N/A,12",
+        "A3,null,",
+        "A4,nan,7",
+        "A5,inf,1e3",
+        "A6,-Infinity,8",
+        "A7,150,9",
+        "A8,,10",
+    ])
+    frame = loader.read_input(path, ["BvD ID number", "Revenue", "Code"])
+
+    assert list(frame["Revenue"][:6]) == ["NA", "N/A", "null", "nan", "inf", "-Infinity"]
+    assert frame["Revenue"][6] == 150.0
+    assert pd.isna(frame["Revenue"][7])
+    assert frame["Code"][0] == "0111"
+    assert pd.isna(frame["Code"][2])
+    assert frame["Code"][4] == 1000.0
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, loader.CHUNK_ROWS])
+def test_csv_skips_blank_second_header(tmp_path, chunk_rows):
+    """Excel Export처럼 헤더 아래 빈 2번째 행이 있으면 건너뜁니다 (첫 청크에서만)."""
+    path = _write_csv(tmp_path / "raw.csv", ["BvD ID number,Revenue", ",", "A1,10", ",", "A2,20"])
+    chunks = loader.iter_input_chunks(path, ["BvD ID number", "Revenue"], chunk_rows)
+    frame = pd.concat(list(chunks), ignore_index=True)
+    assert list(frame["BvD ID number"].fillna("")) == ["A1", "", "A2"]
+
+
+def test_parquet_keeps_string_columns(tmp_path):
+    """Parquet의 문자열 컬럼은 숫자처럼 보여도 문자열로, 숫자 컬럼은 그대로 읽습니다."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "raw.parquet"
+    pd.DataFrame({
+        "BvD ID number": ["12345", "1e3", "0111", None],
+        "Revenue": [150.0, None, 7.0, 8.0],
+    }).to_parquet(path)
+
+    frame = loader.read_input(str(path), ["BvD ID number", "Revenue"])
+
+    assert list(frame["BvD ID number"][:3]) == ["12345", "1e3", "0111"]
+    assert pd.isna(frame["BvD ID number"][3])
+    assert frame["Revenue"].dtype == float
+    assert frame["Revenue"][0] == 150.0
@@ -0,0 +1,67 @@
+# tests/test_mask_index.py
+# CriteriaMaskIndex 조합 질의가 평가기 bool 배열로 직접 계산한 결과와 같은지 확인
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from conftest import END_YEAR, START_YEAR
+from evaluator import cumulative_counts
+from mask_index import CriteriaMaskIndex
+from processor import Analysis, DirectCriteriaConverter
+
+CRITERIA = [
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "10000", "xCompare": "이상", "include": True},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란", "include": False},
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "초과",
+     "yearCondition": "모든연도", "include": True},
+    {"type": "텍스트", "account": "감사의견", "xValue": "Unqualified", "xCompare": "All equals", "include": False},
+]
+
+
+@pytest.fixture(scope="module")
+def masks(synthetic_raw):
+    """CRITERIA의 평가기 "Yes" bool 배열 목록."""
+    configs = DirectCriteriaConverter(START_YEAR, END_YEAR).convert(CRITERIA)
+    analysis = Analysis(start_year=START_YEAR, end_year=END_YEAR, number_of_criteria=len(configs),
+                        data_path=synthetic_raw, write_only=True)
+    analysis._populate_raw_data_from_excel()
+    return analysis.get_evaluator().evaluate_masks(configs)
+
+
+def _passed(masks, indices, num_rows):
+    return reduce(np.logical_and, [masks[i] for i in indices], np.ones(num_rows, dtype=bool))
+
+
+# 8의 배수가 아닌 행 수(packbits 끝 바이트 패딩)와 64비트 워드 경계 전후
+@pytest.mark.parametrize("num_rows", [1, 7, 8, 13, 40, None])
+def test_queries_match_masks(masks, num_rows):
+    num_rows = num_rows or len(masks[0])
+    masks = [mask[:num_rows] for mask in masks]
+    index = CriteriaMaskIndex(masks, num_rows)
+    subsets = [None, [], [0], [1, 3], [3, 0, 2]]
+
+    for subset in subsets:
+        indices = range(len(masks)) if subset is None else subset
+        expected = _passed(masks, indices, num_rows)
+        assert index.count(subset) == int(np.count_nonzero(expected)), subset
+        assert index.survivors(subset).tolist() == expected.tolist(), subset
+
+    for order in [None, [2, 0, 3, 1]]:
+        ordered = masks if order is None else [masks[i] for i in order]
+        assert index.cumulative(order) == cumulative_counts(ordered, num_rows), order
+
+    for subset in [None, [1, 3], [3, 0, 2]]:
+        indices = list(range(len(masks)) if subset is None else subset)
+        expected = {i: int(np.count_nonzero(_passed(masks, [j for j in indices if j != i], num_rows))) for i in indices}
+        assert index.leave_one_out(subset) == expected, subset
+
+
+def test_missing_mask_matches_summary(masks):
+    """None mask(빈 기준 컬럼)는 이후 모든 행을 탈락시키는 결과 파일 20/21행 규칙을 따릅니다."""
+    num_rows = len(masks[0])
+    with_missing = [masks[0], None, masks[2]]
+    index = CriteriaMaskIndex(with_missing, num_rows)
+    assert index.cumulative() == cumulative_counts(with_missing, num_rows)
+    assert index.count() == 0
+    assert index.count([0, 2]) == int(np.count_nonzero(masks[0] & masks[2]))
@@ -0,0 +1,35 @@
+# tests/test_metrics.py
+# ScreeningMetrics 셀 규칙 — 사칙연산 기준 값의 숫자 텍스트 변환
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import OPERATING_PROFIT, OPERATING_REVENUE, ScreeningMetrics
+
+REVENUE = ["150", "n.a.", None, 200, "inf", " 75 ", "150"]
+
+
+def _copy_on_write():
+    """pandas 2.x는 Copy-on-Write를 켜서 실행 (3.x는 항상 켜져 있고 옵션 설정은 경고)."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return nullcontext()
+    return pd.option_context("mode.copy_on_write", True)
+
+
+@pytest.mark.parametrize("dtype", [object, "category"])
+def test_arithmetic_values_numeric_text(dtype):
+    """=a/b처럼 숫자 텍스트는 숫자, 나머지 텍스트(무한대 포함)는 #VALUE!(NaN), 공란은 0."""
+    df = pd.DataFrame({
+        f"{OPERATING_REVENUE}2023": pd.Series(REVENUE, dtype=object).astype(dtype),
+        f"{OPERATING_PROFIT}2023": [15.0] * len(REVENUE),
+    })
+
+    with _copy_on_write():
+        metrics = ScreeningMetrics(df, 2023, 2023)
+        values = metrics.arithmetic_values(f"{OPERATING_REVENUE}2023")
+        om = metrics.unadjusted["OM"]["yearly"][0]
+
+    np.testing.assert_array_equal(values, [150.0, np.nan, 0.0, 200.0, np.nan, 75.0, 150.0])
+    np.testing.assert_allclose(om, [0.1, 0.0, 0.0, 0.075, 0.0, 0.2, 0.1])
@@ -0,0 +1,39 @@
+# tests/test_multi_window.py
+# 여러 분석 기간(windows)을 한 번 읽어 처리한 결과 시트가 기간별 평가 결과와 맞는지 확인
+import pytest
+from openpyxl import load_workbook
+
+from conftest import END_YEAR, START_YEAR
+from evaluator import cumulative_counts
+from processor import Analysis, DirectCriteriaConverter, main_processor
+
+CRITERIA = [
+    {"type": "숫자-개별연도", "account": "매출원가", "xValue": "100", "xCompare": "이상",
+     "yearCondition": "N개년이상", "nYears": "2", "include": True},
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "초과", "include": True},
+]
+WINDOWS = [[START_YEAR, END_YEAR], [START_YEAR + 1, END_YEAR]]
+
+
+@pytest.mark.parametrize("separate", [False, True], ids=["one-workbook", "separate"])
+def test_window_sheets_match_per_window_evaluation(make_payload, synthetic_raw, separate):
+    payload = make_payload(CRITERIA, windows=WINDOWS, separateWorkbooks=separate, summaryMode="values",
+                           writeOnly=True)
+    profile = main_processor(payload, require_data=True)
+    assert len(profile["output_files"]) == (len(WINDOWS) if separate else 1)
+    sheets = {ws.title: ws for path in profile["output_files"] for ws in load_workbook(path).worksheets}
+
+    for start_year, end_year in WINDOWS:
+        analysis = Analysis(start_year=start_year, end_year=end_year, number_of_criteria=len(CRITERIA),
+                            data_path=synthetic_raw, write_only=True)
+        analysis._populate_raw_data_from_excel()
+        configs = DirectCriteriaConverter(start_year, end_year).convert(payload["criteriaList"])
+        counts = cumulative_counts(analysis.get_evaluator().evaluate_masks(configs), analysis.data_row_count)
+
+        ws = sheets[analysis._sheet_title()]
+        assert counts[-1][1] > 0
+        assert ws["A2"].value == f"분석대상연도: FY{start_year}-{end_year}"
+        assert ws.max_row == analysis.qualitative_start_row + 2 + analysis.data_row_count
+        q_col = analysis.quantitative_start_col
+        assert [(ws.cell(20, q_col + i).value, ws.cell(21, q_col + i).value)
+                for i in range(len(CRITERIA))] == counts
@@ -0,0 +1,62 @@
+# tests/test_prefix_sums.py
+# 누적합 구간 평균(ScreeningMetrics.window_average / PrefixSums)과 결과 파일 WA3 수식 계산값 비교
+import numpy as np
+import pytest
+from openpyxl.utils import get_column_letter
+
+from conftest import END_YEAR, START_YEAR, calculated_values
+from processor import Analysis, main_processor
+
+CRITERIA = [{"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "이상", "include": True}]
+ACCOUNTS = ["매출액", "총자산"]  # P&L 기간 평균 / 자산 Flow 가중평균
+
+
+@pytest.fixture(scope="module")
+def metrics(synthetic_raw):
+    """분석 기간(START_YEAR ~ END_YEAR)으로 적재한 ScreeningMetrics."""
+    analysis = Analysis(start_year=START_YEAR, end_year=END_YEAR, number_of_criteria=len(CRITERIA),
+                        data_path=synthetic_raw, write_only=True)
+    analysis._populate_raw_data_from_excel()
+    return analysis.get_metrics()
+
+
+def _wa3_formula_values(payload, start_year, end_year):
+    """start_year ~ end_year 기간으로 만든 결과 파일의 {WA3 지표: 행별 수식 계산값}."""
+    pytest.importorskip("formulas")
+    profile = main_processor(payload(CRITERIA, yearFrom=start_year, yearTo=end_year), require_data=True)
+    values = calculated_values(profile["output_file"])
+    layout = Analysis(start_year=start_year, end_year=end_year, number_of_criteria=len(CRITERIA))
+    data_start_row = layout.qualitative_start_row + 3
+    result = {}
+    for name in ACCOUNTS:
+        column = get_column_letter(layout.wa3_start_col + layout._get_wa3_list().index(name))
+        result[name] = [values.get(f"{column}{data_start_row + i}") for i in range(profile["rows"])]
+    return result
+
+
+@pytest.mark.parametrize("start_year", [START_YEAR, START_YEAR + 1], ids=["full", "inner"])
+def test_window_average_matches_wa3_formulas(make_payload, metrics, start_year):
+    """분석 기간 안쪽 구간 평균은 그 구간으로 만든 결과 파일의 WA3 수식 값과 같아야 합니다."""
+    expected = _wa3_formula_values(make_payload, start_year, END_YEAR)
+    for name in ACCOUNTS:
+        actual = metrics.window_average(name, start_year, END_YEAR)
+        np.testing.assert_allclose(actual, np.asarray(expected[name], dtype=float), err_msg=name)
+
+
+def test_rolling_averages_match_windows(metrics):
+    prefix = metrics.prefix_sums("매출액")
+    rolling = prefix.rolling_averages(2)
+    assert sorted(rolling) == list(range(START_YEAR + 1, END_YEAR + 1))
+    for end_year, values in rolling.items():
+        np.testing.assert_allclose(values, metrics.window_average("매출액", end_year - 1, end_year))
+    with pytest.raises(ValueError):
+        prefix.rolling_averages(0)
+
+
+@pytest.mark.parametrize("account", ACCOUNTS)
+def test_window_average_rejects_unloaded_years(metrics, account):
+    """분석 기간 밖 연도 컬럼이 적재되지 않았으면 공란(0) 평균 대신 ValueError."""
+    with pytest.raises(ValueError, match="적재되지 않은"):
+        metrics.window_average(account, START_YEAR - 2, START_YEAR)
+    with pytest.raises(ValueError, match="적재되지 않은"):
+        metrics.window_average(account, END_YEAR + 1, END_YEAR + 2)
@@ -0,0 +1,47 @@
+# tests/test_survivors_only.py
+# 생존 행만 기록(survivorsOnly)한 결과 파일과 탈락 시트가 평가기의 기준별 결과와 맞는지 확인
+import numpy as np
+from openpyxl import load_workbook
+
+from conftest import END_YEAR, START_YEAR
+from processor import REJECTED_SHEET_TITLE, Analysis, DirectCriteriaConverter, main_processor
+
+CRITERIA = [
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "이상", "include": True},
+    {"type": "텍스트", "account": "웹사이트", "xValue": "", "xCompare": "공란아님", "include": True},
+    {"type": "숫자-개별연도", "account": "영업이익(EBIT)", "xValue": "0", "xCompare": "미만",
+     "yearCondition": "1개년이라도", "include": False},
+]
+
+
+def test_survivors_and_rejected_rows_follow_first_failed_criterion(make_payload, synthetic_raw):
+    payload = make_payload(CRITERIA, survivorsOnly=True, rejectedSheet=True, writeOnly=True)
+    profile = main_processor(payload, require_data=True)
+
+    # 필터링 전 전체 행의 기준별 결과 → 행별 첫 번째 탈락 기준 (0 = 모두 통과)
+    analysis = Analysis(start_year=START_YEAR, end_year=END_YEAR, number_of_criteria=len(CRITERIA),
+                        data_path=synthetic_raw, write_only=True)
+    analysis._populate_raw_data_from_excel()
+    configs = DirectCriteriaConverter(START_YEAR, END_YEAR).convert(payload["criteriaList"])
+    failed = ~np.array(analysis.get_evaluator().evaluate_masks(configs))
+    first_failed = np.where(failed.any(axis=0), failed.argmax(axis=0) + 1, 0)
+    ids = list(analysis._raw_column_values("BvD ID number"))
+    assert 0 < np.count_nonzero(first_failed) < len(ids)
+
+    wb = load_workbook(profile["output_file"])
+    ws = wb.worksheets[0]
+    data_rows = range(analysis.qualitative_start_row + 3, ws.max_row + 1)
+    id_col = analysis.raw_col_number["BvD ID number"]
+    assert [ws.cell(row, id_col).value for row in data_rows] == [
+        id_ for id_, first in zip(ids, first_failed) if first == 0
+    ]
+    # 요약(21행 통과)은 필터링 전 전체 행 기준 누적 건수
+    cumulative_pass = (~failed).cumprod(axis=0).sum(axis=1)
+    q_col = analysis.quantitative_start_col
+    assert [ws.cell(21, q_col + i).value for i in range(len(CRITERIA))] == cumulative_pass.tolist()
+
+    rejected = [row[:4] for row in wb[REJECTED_SHEET_TITLE].iter_rows(min_row=2, values_only=True)]
+    assert rejected == [
+        (i + 1, ids[i], analysis._raw_column_values("Company name Latin alphabet")[i], f"기준{first}")
+        for i, first in enumerate(first_failed) if first
+    ]
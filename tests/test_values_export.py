@@ -0,0 +1,64 @@
+# tests/test_values_export.py
+# 계산값 모드(metricValues)와 계산값 내보내기(valuesExport/valuesOnly) 결과 확인
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+from conftest import END_YEAR, START_YEAR, calculated_values
+from metrics import OPERATING_PROFIT, OPERATING_REVENUE
+from processor import Analysis, main_processor
+
+CRITERIA = [
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "이상", "include": True},
+    {"type": "비율", "account": "영업비용/매출액", "xValue": "0.05", "xCompare": "미만", "include": True},
+]
+
+
+def _last_raw_row(path, base_name):
+    """Results 시트 마지막 행(EDGE_ROWS의 마지막 경계값 행)의 연도별 값."""
+    ws = load_workbook(path, read_only=True)["Results"]
+    rows = list(ws.values)
+    header, last = rows[0], rows[-1]
+    return [last[header.index(f"{base_name}{year}")] for year in range(START_YEAR, END_YEAR + 1)]
+
+
+def test_metric_values_with_numeric_text(make_payload, synthetic_raw):
+    """매출 "150" 텍스트는 =a/b처럼 숫자로, "n.a."는 #VALUE! → IFERROR 0으로 계산합니다."""
+    profile = main_processor(make_payload(CRITERIA, metricValues=True, valuesExport="csv"), require_data=True)
+    assert profile["output_file"] is not None
+
+    frame = pd.read_csv(profile["export_file"], encoding="utf-8-sig")
+    operating_profit = _last_raw_row(synthetic_raw, OPERATING_PROFIT)
+    assert _last_raw_row(synthetic_raw, OPERATING_REVENUE) == ["150", None, "n.a."]
+
+    edge = frame.iloc[-1]
+    assert edge[f"OM FY{START_YEAR - 2000}"] == pytest.approx(operating_profit[0] / 150)
+    assert edge[f"OM FY{END_YEAR - 2000}"] == 0
+
+
+def _read_export(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path, encoding="utf-8-sig")
+
+
+@pytest.mark.parametrize("options", [{"valuesOnly": True}, {"valuesExport": "csv"}], ids=["values-only", "csv"])
+def test_export_matches_formulas(make_payload, tmp_path, options):
+    """내보낸 기준별 Yes/No와 양적통과가 결과 파일 수식 계산값과 같아야 합니다."""
+    pytest.importorskip("formulas")
+    formula_dir = tmp_path / "formulas"
+    formula_dir.mkdir()
+    workbook = main_processor(make_payload(CRITERIA, outputDir=str(formula_dir)), require_data=True)["output_file"]
+    values = calculated_values(workbook)
+
+    profile = main_processor(make_payload(CRITERIA, **options), require_data=True)
+    assert (profile["output_file"] is None) == bool(options.get("valuesOnly"))
+    frame = _read_export(profile["export_file"])
+
+    layout = Analysis(start_year=START_YEAR, end_year=END_YEAR, number_of_criteria=len(CRITERIA))
+    data_start_row = layout.qualitative_start_row + 3
+    names = [f"기준{i + 1}" for i in range(len(CRITERIA))] + ["양적통과"]
+    assert "Yes" in set(frame["양적통과"])
+    for index, name in enumerate(names):
+        column = get_column_letter(layout.quantitative_start_col + index)
+        actual = [str(values.get(f"{column}{data_start_row + i}")) for i in range(len(frame))]
+        assert actual == list(frame[name]), name
@@ -0,0 +1,43 @@
+# tests/test_write_only.py
+# write-only 모드(writeOnly) 결과 파일이 일반 모드와 같은 값·서식인지 확인
+from openpyxl import load_workbook
+
+from processor import main_processor
+
+CRITERIA = [
+    {"type": "숫자-WA3평균", "account": "매출액", "xValue": "1000", "xCompare": "이상", "include": True},
+    {"type": "텍스트", "account": "감사의견", "xValue": "Unqualified", "xCompare": "All equals", "include": False},
+]
+
+
+def _cell_state(cell):
+    """비교할 셀 값과 서식 (값, 숫자 포맷, 테두리, 글꼴, 채우기, 정렬)."""
+    border = tuple(getattr(side, "style", None) for side in
+                   (cell.border.left, cell.border.right, cell.border.top, cell.border.bottom))
+    font = (cell.font.b, cell.font.color.rgb if cell.font.color else None)
+    return (cell.value, cell.number_format, border, font, cell.fill.fill_type, cell.fill.fgColor.rgb,
+            cell.alignment.horizontal, cell.alignment.wrap_text)
+
+
+def _build(make_payload, tmp_path, name, **options):
+    output_dir = tmp_path / name
+    output_dir.mkdir()
+    profile = main_processor(make_payload(CRITERIA, outputDir=str(output_dir), **options), require_data=True)
+    return load_workbook(profile["output_file"]).active
+
+
+def test_write_only_matches_normal(make_payload, tmp_path):
+    """헤더/데이터 행의 표본 셀이 일반 모드와 같은 값·서식이어야 합니다."""
+    normal = _build(make_payload, tmp_path, "normal")
+    streamed = _build(make_payload, tmp_path, "write-only", writeOnly=True)
+
+    assert (streamed.max_row, streamed.max_column) == (normal.max_row, normal.max_column)
+    # 헤더·데이터 영역의 3행마다 (1행과 마지막 행 포함), 모든 컬럼
+    rows = sorted({*range(1, normal.max_row + 1, 3), normal.max_row})
+    mismatches = []
+    for row in rows:
+        for col in range(1, normal.max_column + 1):
+            expected, actual = _cell_state(normal.cell(row, col)), _cell_state(streamed.cell(row, col))
+            if expected != actual:
+                mismatches.append((normal.cell(row, col).coordinate, expected, actual))
+    assert not mismatches, mismatches[:10]
@@ -1,6 +1,9 @@
 # ui.py
 import logging
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
@@ -9,6 +12,20 @@ from preset import PRESET
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
+# main_processor 단계별 진행 상태 표시 문구
+STAGE_LABELS = {
+    "format":   "서식 생성 중...",
+    "load":     "Raw 데이터 로딩 중...",
+    "formulas": "수식 입력 중...",
+    "criteria": "양적기준 적용 중...",
+    "styles":   "서식 적용 중...",
+    "save":     "파일 저장 중...",
+}
+PROGRESS_POLL_MS = 100
+PREVIEW_DEBOUNCE_MS = 250  # 기준 편집 후 미리보기 재계산까지 대기 시간 (연속 입력은 한 번만 계산)
+PREVIEW_POLL_MS = 20
+INPUT_CACHE_LABEL = "~/.quantitative_app/input_cache"  # input_cache.DEFAULT_CACHE_DIR (표시용)
+
 
 class QuantitativeUI:
     def __init__(self, root):
@@ -18,6 +35,23 @@ class QuantitativeUI:
         self.file_path = None
         self.output_dir_path = None
         self.rows = []
+        # 입력 캐시 (opt-in): 파싱한 Raw 데이터를 INPUT_CACHE_LABEL 폴더에 저장해 다음 실행/미리보기에 재사용
+        self.use_cache = tk.BooleanVar(value=False)
+
+        # 백그라운드 변환 작업 상태
+        self.worker = None
+        self.cancel_event = None
+        self.progress_queue = queue.Queue()
+        # 직전 결과 파일 — 기준만 바꿔 다시 변환하면 이 파일의 기준 관련 셀만 교체 (증분 갱신)
+        self.last_output_file = None
+
+        # 탈락/통과 건수 미리보기 상태 (Raw 데이터는 백그라운드 스레드에서 한 번만 적재)
+        self.preview = None              # preview.FunnelPreview
+        self.preview_key = None          # 적재된 (Raw 파일, 시작연도, 종료연도)
+        self.preview_queue = queue.Queue()
+        self._preview_job = None
+        self._preview_pending = False
+        self._preview_after_id = None
 
         self.build_ui()
 
@@ -45,27 +79,43 @@ class QuantitativeUI:
         ttk.Label(info, text="시작연도").grid(row=1, column=0, sticky="e")
         self.year_from = ttk.Entry(info, width=10)
         self.year_from.grid(row=1, column=1)
+        self.year_from.bind("<KeyRelease>", self._schedule_preview)
 
         ttk.Label(info, text="종료연도").grid(row=1, column=2, sticky="e")
         self.year_to = ttk.Entry(info, width=10)
         self.year_to.grid(row=1, column=3)
+        self.year_to.bind("<KeyRelease>", self._schedule_preview)
 
         ttk.Button(frame, text="Raw 파일 선택", command=self.select_file).grid(row=1, column=0, pady=5)
         self.file_label = ttk.Label(frame, text="선택된 파일 없음")
         self.file_label.grid(row=1, column=1, columnspan=8, sticky="w")
 
+        ttk.Checkbutton(frame, text=f"입력 캐시 사용 ({INPUT_CACHE_LABEL})", variable=self.use_cache).grid(
+            row=2, column=0, columnspan=4, sticky="w"
+        )
+        ttk.Button(frame, text="캐시 비우기", command=self.clear_cache).grid(row=2, column=4, sticky="w")
+
         ttk.Button(frame, text="기준 추가", command=self.add_row).grid(row=3, column=0, pady=5)
+        self.preview_label = ttk.Label(frame, text="미리보기: Raw 파일과 연도를 입력하세요.")
+        self.preview_label.grid(row=3, column=1, columnspan=8, sticky="w")
 
         self.table = ttk.Frame(frame)
         self.table.grid(row=4, column=0, columnspan=9, sticky="w")
 
-        headers = ["순번", "유형", "분석계정", "기준값", "비교연산자", "연도조건", "N", "포함", "삭제"]
+        headers = ["순번", "유형", "분석계정", "기준값", "비교연산자", "연도조건", "N", "포함", "삭제", "누적통과"]
         for i, h in enumerate(headers):
             ttk.Label(self.table, text=h, width=10 if i not in (0, 6, 8) else 4).grid(
                 row=0, column=i, padx=2
             )
 
-        ttk.Button(frame, text="변환", command=self.on_convert).grid(row=5, column=0, pady=10)
+        self.convert_button = ttk.Button(frame, text="변환", command=self.on_convert)
+        self.convert_button.grid(row=5, column=0, pady=10)
+        self.cancel_button = ttk.Button(frame, text="취소", command=self.on_cancel, state="disabled")
+        self.cancel_button.grid(row=5, column=1, pady=10)
+        self.progress_bar = ttk.Progressbar(frame, mode="determinate", length=200)
+        self.progress_bar.grid(row=5, column=2, columnspan=3, sticky="w", padx=5)
+        self.status_label = ttk.Label(frame, text="")
+        self.status_label.grid(row=5, column=5, columnspan=4, sticky="w")
 
         # -------------------------
         # 설명 문구 (하단)
@@ -78,7 +128,10 @@ class QuantitativeUI:
             "2. 유형 → 분석계정 → 비교연산자 → 기준값 순서로 설정하세요.\n"
             "   비율계정의 기준값은 소수점으로 입력합니다. (예: 0.01 → 1%)\n"
             "3. '변환' 버튼을 누르면 분석 결과가 입력 파일과 동일한 폴더에 저장됩니다.\n"
-            "   (파일명: [클라이언트명]_양적분석_[기간].xlsx)"
+            "   (파일명: [클라이언트명]_양적분석_[기간].xlsx)\n"
+            "4. 기준을 편집하면 '누적통과' 열에 기준별 누적 통과(탈락) 건수가 미리 표시됩니다.\n"
+            f"5. '입력 캐시 사용'을 선택하면 읽은 Raw 데이터를 {INPUT_CACHE_LABEL} 폴더에 최대 2GB 저장해\n"
+            "   같은 파일을 다시 열 때 재사용합니다. 저장된 데이터는 '캐시 비우기'로 삭제합니다."
         )
         ttk.Label(desc_frame, text=guide_text).pack(anchor="w")
 
@@ -86,11 +139,28 @@ class QuantitativeUI:
     # 파일 선택
     # -------------------------
     def select_file(self):
-        self.file_path = filedialog.askopenfilename(
-            filetypes=[("Excel files", "*.xlsx *.xls")]
+        paths = filedialog.askopenfilenames(
+            filetypes=[("Raw files", "*.xlsx *.xls *.csv *.parquet"), ("Excel files", "*.xlsx *.xls")]
         )
-        if self.file_path:
-            self.file_label.config(text=self.file_path)
+        if paths:
+            # 나눠 내보낸 파일을 여러 개 선택하면 목록 순서대로 이어 붙여 분석
+            self.file_path = paths[0] if len(paths) == 1 else tuple(paths)
+            self.file_label.config(text=paths[0] if len(paths) == 1 else f"{paths[0]} 외 {len(paths) - 1}개")
+            self.preview_key = None  # 같은 파일을 다시 선택해도 새로 적재
+            self._schedule_preview()
+
+    def clear_cache(self):
+        """입력 캐시 폴더의 항목을 모두 삭제합니다 (변환/미리보기 적재 중에는 삭제하지 않음)."""
+        if self.worker is not None or self._preview_job is not None:
+            messagebox.showwarning("캐시 비우기", "작업이 진행 중입니다. 완료 후 다시 시도하세요.")
+            return
+        from input_cache import ParsedInputCache
+        try:
+            ParsedInputCache().clear()
+        except OSError as e:
+            messagebox.showerror("캐시 비우기", f"입력 캐시를 삭제하지 못했습니다:\n{e}")
+            return
+        messagebox.showinfo("캐시 비우기", f"입력 캐시를 삭제했습니다. ({INPUT_CACHE_LABEL})")
 
     # -------------------------
     # 기준 row 추가 (9컬럼)
@@ -143,6 +213,10 @@ class QuantitativeUI:
         )
         del_btn.grid(row=row_idx, column=8, padx=2)
 
+        # col 9: 누적 통과 건수 미리보기
+        count_label = ttk.Label(self.table, text="", width=18)
+        count_label.grid(row=row_idx, column=9, padx=2, sticky="w")
+
         row_dict = {
             "seq": seq,
             "type": type_cb,
@@ -153,12 +227,19 @@ class QuantitativeUI:
             "nYears": n_years,
             "include": include,
             "del_btn": del_btn,
+            "count": count_label,
         }
         self.rows.append(row_dict)
 
         idx = len(self.rows) - 1
         type_cb.bind("<<ComboboxSelected>>", lambda e, r=idx: self._on_type_changed(r))
 
+        # 미리보기 갱신 (유형/연도조건은 각 변경 핸들러에서 호출 — resequence()가 바인딩을 재설정)
+        for widget in (account_cb, xcompare, include):
+            widget.bind("<<ComboboxSelected>>", self._schedule_preview, add="+")
+        for widget in (xvalue, n_years):
+            widget.bind("<KeyRelease>", self._schedule_preview, add="+")
+
     # -------------------------
     # 유형 변경 핸들러
     # -------------------------
@@ -193,6 +274,7 @@ class QuantitativeUI:
             row["xCompare"].set("존재함")
 
         self._update_year_cond_visibility(idx)
+        self._schedule_preview()
 
     def _update_year_cond_visibility(self, idx):
         from criteria_config import CRITERIA_TYPES
@@ -216,6 +298,7 @@ class QuantitativeUI:
             row["nYears"].grid()
         else:
             row["nYears"].grid_remove()
+        self._schedule_preview()
 
     # -------------------------
     # preset 적용
@@ -255,12 +338,13 @@ class QuantitativeUI:
         for widget in (
             row["seq"], row["type"], row["account"], row["xValue"],
             row["xCompare"], row["yearCond"], row["nYears"],
-            row["include"], row["del_btn"],
+            row["include"], row["del_btn"], row["count"],
         ):
             widget.destroy()
 
         self.rows.pop(idx)
         self.resequence()
+        self._schedule_preview()
 
     def resequence(self):
         from criteria_config import CRITERIA_TYPES
@@ -289,6 +373,7 @@ class QuantitativeUI:
 
             row["include"].grid(row=i + 1, column=7)
             row["del_btn"].grid(row=i + 1, column=8)
+            row["count"].grid(row=i + 1, column=9)
 
             # 바인딩 재설정
             row["del_btn"].configure(command=lambda r=i: self.delete_row(r))
@@ -297,6 +382,133 @@ class QuantitativeUI:
                 "<<ComboboxSelected>>", lambda e, r=i: self._on_year_cond_changed(r)
             )
 
+    @staticmethod
+    def _criteria_from_row(idx, row):
+        """기준 row 위젯 값 → criteriaList 항목."""
+        return {
+            "seq":           idx,
+            "type":          row["type"].get(),
+            "account":       row["account"].get(),
+            "xValue":        row["xValue"].get().strip(),
+            "xCompare":      row["xCompare"].get(),
+            "yearCondition": row["yearCond"].get(),
+            "nYears":        row["nYears"].get().strip(),
+            "include":       row["include"].get() == "포함",
+        }
+
+    # -------------------------
+    # 탈락/통과 건수 미리보기
+    # -------------------------
+    def _schedule_preview(self, event=None):
+        """입력이 PREVIEW_DEBOUNCE_MS 동안 더 바뀌지 않으면 미리보기를 다시 계산합니다."""
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self._refresh_preview)
+
+    def _preview_source_key(self):
+        """(Raw 파일, 시작연도, 종료연도) — 입력이 덜 된 경우 None."""
+        try:
+            year_from = int(self.year_from.get().strip())
+            year_to = int(self.year_to.get().strip())
+        except ValueError:
+            return None
+        if not self.file_path or year_from > year_to:
+            return None
+        return self.file_path, year_from, year_to
+
+    def _refresh_preview(self):
+        """Raw 데이터가 바뀌었으면 다시 적재하고, 아니면 현재 기준으로 건수만 다시 계산합니다."""
+        self._preview_after_id = None
+        if self._preview_job is not None:
+            self._preview_pending = True  # 진행 중인 작업이 끝나면 다시 갱신
+            return
+
+        key = self._preview_source_key()
+        if key is None:
+            self.preview_label.config(text="미리보기: Raw 파일과 연도를 입력하세요.")
+            return
+
+        if key != self.preview_key:
+            self.preview = None
+            self.preview_key = key
+            self.preview_label.config(text="미리보기: Raw 데이터 로딩 중...")
+            self._start_preview_job("loaded", self._load_preview, (key, self.use_cache.get()))
+        elif self.preview is not None:
+            # 유형/계정/연산자/포함 여부가 모두 선택된 행만 계산 (입력 중인 행은 "-")
+            indices, criteria_list = [], []
+            for idx, row in enumerate(self.rows):
+                criteria = self._criteria_from_row(idx + 1, row)
+                if criteria["type"] and criteria["account"] and criteria["xCompare"] and row["include"].get():
+                    indices.append(idx)
+                    criteria_list.append(criteria)
+            self._start_preview_job("counts", self.preview.counts, criteria_list, indices)
+
+    @staticmethod
+    def _load_preview(arg):
+        from input_cache import ParsedInputCache
+        from preview import FunnelPreview
+        (file_path, year_from, year_to), use_cache = arg
+        return FunnelPreview.load(file_path, year_from, year_to,
+                                  input_cache=ParsedInputCache() if use_cache else None)
+
+    def _start_preview_job(self, kind, fn, arg, context=None):
+        """fn(arg)를 백그라운드 스레드에서 실행하고 결과 폴링을 시작합니다."""
+        self._preview_job = threading.Thread(
+            target=self._run_preview_job, args=(kind, fn, arg, context, self.preview_queue), daemon=True
+        )
+        self._preview_job.start()
+        self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+
+    @staticmethod
+    def _run_preview_job(kind, fn, arg, context, preview_queue):
+        """큐 메시지: (kind, 결과, context, 소요 시간) / ("error", 예외, kind)."""
+        started = time.perf_counter()
+        try:
+            result = fn(arg)
+        except Exception as e:
+            logger.exception("미리보기 계산 중 오류 발생")
+            preview_queue.put(("error", e, kind))
+            return
+        preview_queue.put((kind, result, context, time.perf_counter() - started))
+
+    def _poll_preview(self):
+        try:
+            message = self.preview_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+            return
+
+        self._preview_job = None
+        kind = message[0]
+        if kind == "loaded":
+            self.preview = message[1]
+            self._preview_pending = True  # 적재 완료 → 현재 기준으로 건수 계산
+        elif kind == "counts":
+            self._show_preview_counts(message[1], message[2], message[3])
+        else:
+            if message[2] == "loaded":
+                self.preview_key = None  # 적재 실패 → 다음 갱신 때 같은 파일도 다시 적재
+            self.preview_label.config(text=f"미리보기 오류: {message[1]}")
+
+        if self._preview_pending:
+            self._preview_pending = False
+            self._refresh_preview()
+
+    def _show_preview_counts(self, counts, indices, elapsed):
+        """행별 누적 통과(탈락) 건수와 최종 통과 건수를 표시합니다."""
+        for row in self.rows:
+            row["count"].config(text="-")
+        for idx, count in zip(indices, counts):
+            if idx < len(self.rows) and count is not None:
+                fail_count, pass_count = count
+                self.rows[idx]["count"].config(text=f"{pass_count:,} (-{fail_count:,})")
+
+        valid = [count for count in counts if count is not None]
+        final = valid[-1][1] if valid else self.preview.row_count
+        self.preview_label.config(
+            text=f"미리보기: 전체 {self.preview.row_count:,}건 → 통과 {final:,}건 ({elapsed * 1000:.0f}ms)"
+        )
+
     # -------------------------
     # 변환 버튼
     # -------------------------
@@ -319,7 +531,8 @@ class QuantitativeUI:
             messagebox.showerror("입력 오류", "Raw 파일을 선택하세요.")
             return
 
-        self.output_dir_path = os.path.dirname(self.file_path)
+        first_path = self.file_path[0] if isinstance(self.file_path, tuple) else self.file_path
+        self.output_dir_path = os.path.dirname(first_path)
 
         try:
             year_from = int(year_from)
@@ -337,9 +550,13 @@ class QuantitativeUI:
             "targetCorp":  target_corp,
             "yearFrom":    year_from,
             "yearTo":      year_to,
-            "rawFilePath": self.file_path,
+            "rawFilePath": list(self.file_path) if isinstance(self.file_path, tuple) else self.file_path,
             "outputDir":   self.output_dir_path,
+            "useCache":    self.use_cache.get(),
         }
+        if self.last_output_file:
+            # Raw 파일/기간/기준 수가 다르면 main_processor가 전체를 다시 생성
+            input_data["incrementalFrom"] = self.last_output_file
 
         # =========================
         # 2. 기준 테이블 수집
@@ -392,16 +609,7 @@ class QuantitativeUI:
                 messagebox.showerror("입력 오류", f"기준 {idx}: 포함/제외를 선택해주세요.")
                 return
 
-            criteria_list.append({
-                "seq":           idx,
-                "type":          type_key,
-                "account":       account,
-                "xValue":        x_value,
-                "xCompare":      x_compare,
-                "yearCondition": year_cond,
-                "nYears":        n_years,
-                "include":       include_str == "포함",
-            })
+            criteria_list.append(self._criteria_from_row(idx, row))
 
         if not criteria_list:
             messagebox.showerror("입력 오류", "최소 1개의 기준을 입력하세요.")
@@ -413,12 +621,93 @@ class QuantitativeUI:
         payload = {"inputData": input_data, "criteriaList": criteria_list}
         logger.info("변환 실행: %s", payload)
 
+        self._start_worker(payload)
+
+    # -------------------------
+    # 백그라운드 변환 작업
+    # -------------------------
+    def _start_worker(self, payload):
+        """main_processor를 백그라운드 스레드에서 실행하고 진행 상황 폴링을 시작합니다."""
+        self.cancel_event = threading.Event()
+        self.progress_queue = queue.Queue()
+        self.worker = threading.Thread(
+            target=self._run_processor, args=(payload, self.cancel_event, self.progress_queue), daemon=True
+        )
+
+        self.convert_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress_bar["value"] = 0
+        self.status_label.config(text="변환 준비 중...")
+
+        self.worker.start()
+        self.root.after(PROGRESS_POLL_MS, self._poll_progress)
+
+    @staticmethod
+    def _run_processor(payload, cancel_event, progress_queue):
+        """
+        작업 스레드 본문. Tk 위젯에는 접근하지 않고 결과를 큐로만 전달합니다.
+
+        큐 메시지: ("stage", 단계, index, total) / ("done", 측정 결과) / ("cancelled",) / ("error", 예외)
+        """
         try:
-            from processor import main_processor
-            main_processor(payload)
-            messagebox.showinfo("완료", "분석 및 파일 저장이 완료되었습니다.")
-        except PermissionError as pe:
-            messagebox.showerror("저장 오류", str(pe))
+            from processor import main_processor, ProcessingCancelled
+            profile = main_processor(
+                payload,
+                progress_callback=lambda stage, index, total: progress_queue.put(("stage", stage, index, total)),
+                cancel_event=cancel_event,
+            )
+            progress_queue.put(("done", profile))
+        except ProcessingCancelled:
+            progress_queue.put(("cancelled",))
         except Exception as e:
             logger.exception("변환 중 오류 발생")
-            messagebox.showerror("오류", f"작업 중 오류가 발생했습니다:\n{e}")
+            progress_queue.put(("error", e))
+
+    def _poll_progress(self):
+        """큐에 쌓인 진행 메시지를 Tk 메인 스레드에서 처리합니다."""
+        try:
+            while True:
+                message = self.progress_queue.get_nowait()
+                kind = message[0]
+                if kind == "stage":
+                    _, stage, index, total = message
+                    self.progress_bar["maximum"] = total
+                    self.progress_bar["value"] = index
+                    self.status_label.config(text=f"[{index + 1}/{total}] {STAGE_LABELS.get(stage, stage)}")
+                else:
+                    self._finish_worker(message)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(PROGRESS_POLL_MS, self._poll_progress)
+
+    def _finish_worker(self, message):
+        """작업 종료 메시지 처리 (버튼 상태 복구 및 결과 안내)."""
+        self.convert_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.worker = None
+
+        kind = message[0]
+        if kind == "done":
+            self.last_output_file = message[1].get("output_file")
+            self.progress_bar["value"] = self.progress_bar["maximum"]
+            self.status_label.config(text="완료")
+            messagebox.showinfo("완료", "분석 및 파일 저장이 완료되었습니다.")
+        elif kind == "cancelled":
+            self.progress_bar["value"] = 0
+            self.status_label.config(text="취소됨")
+            messagebox.showinfo("취소", "변환 작업이 취소되었습니다.")
+        else:
+            error = message[1]
+            self.status_label.config(text="오류")
+            if isinstance(error, PermissionError):
+                messagebox.showerror("저장 오류", str(error))
+            else:
+                messagebox.showerror("오류", f"작업 중 오류가 발생했습니다:\n{error}")
+
+    def on_cancel(self):
+        """진행 중인 변환 작업을 현재 단계가 끝난 뒤 중단하도록 요청합니다."""
+        if self.cancel_event is not None and self.worker is not None:
+            self.cancel_event.set()
+            self.cancel_button.config(state="disabled")
+            self.status_label.config(text="취소 중... (현재 단계 완료 후 중단)")
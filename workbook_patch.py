@@ -0,0 +1,264 @@
+# workbook_patch.py
+# 저장된 xlsx 파일의 일부 셀만 다시 쓰기 (openpyxl로 통합문서 전체를 읽고 다시 저장하지 않음)
+import io
+import json
+import logging
+import os
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timezone
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from openpyxl.packaging.custom import CustomPropertyList
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.writer.excel import ExcelWriter
+from openpyxl.xml.functions import fromstring, tostring
+
+logger = logging.getLogger(__name__)
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CUSTOM_NS = "http://schemas.openxmlformats.org/officeDocument/2006/custom-properties"
+CUSTOM_PROPS_PATH = "docProps/custom.xml"
+# Excel에서 다시 저장한 파일의 계산 체인 — 수식 셀을 바꾸면 어긋나므로 이 파일은 패치하지 않음
+CALC_CHAIN_PATH = "xl/calcChain.xml"
+# save_workbook()/patch_worksheet()가 JSON 문서 속성에 추가하는 시트 파트 CRC-32 키
+SHEET_CRC_KEY = "sheet_crc"
+
+READ_CHUNK_CHARS = 1024 * 1024  # 시트 XML 스트리밍 단위 (문자 수)
+
+_ROW_END = "</row>"
+_ROW_START = re.compile(r'<row r="(\d+)"[^>]*>')
+_CELL = re.compile(r'<c r="([A-Z]+)\d+"([^>]*?)(?:/>|>.*?</c>)', re.S)
+_STYLE_ATTR = re.compile(r'\ss="(\d+)"')
+
+
+class WorkbookPatchError(Exception):
+    """패치 대상 시트/행을 찾을 수 없는 경우 (호출 측에서 전체 재생성으로 대체)."""
+
+
+def read_custom_property(path, name):
+    """xlsx 사용자 지정 문서 속성(docProps/custom.xml) name의 문자열 값 (없으면 None)."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            if CUSTOM_PROPS_PATH not in zf.namelist():
+                return None
+            root = ElementTree.fromstring(zf.read(CUSTOM_PROPS_PATH))
+    except (OSError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        logger.warning("문서 속성을 읽을 수 없습니다: %s (%s)", path, e)
+        return None
+
+    for prop in root.iter(f"{{{CUSTOM_NS}}}property"):
+        if prop.get("name") == name:
+            return "".join(prop.itertext())
+    return None
+
+
+def read_json_property(path, name):
+    """JSON 문자열로 저장된 사용자 지정 문서 속성 (없거나 형식이 잘못되면 None)."""
+    text = read_custom_property(path, name)
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+def _with_sheet_crc(custom_xml, name, crc):
+    """docProps/custom.xml 내용에서 JSON 문서 속성 name에 SHEET_CRC_KEY: crc를 추가한 내용."""
+    props = CustomPropertyList.from_tree(fromstring(custom_xml))
+    for prop in props:
+        if prop.name == name:
+            prop.value = json.dumps({**json.loads(prop.value), SHEET_CRC_KEY: crc})
+    return tostring(props.to_tree())
+
+
+class _CustomPropsLastZipFile(zipfile.ZipFile):
+    """docProps/custom.xml을 다른 파트를 모두 기록한 뒤(닫기 직전) 쓰는 ZipFile (ExcelWriter 저장용)."""
+
+    def __init__(self, path, name, sheet):
+        super().__init__(path, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+        self._property_name = name
+        self._sheet = sheet
+        self._custom_xml = None
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kwargs):
+        if getattr(zinfo_or_arcname, "filename", zinfo_or_arcname) == CUSTOM_PROPS_PATH:
+            self._custom_xml = data
+            return
+        super().writestr(zinfo_or_arcname, data, *args, **kwargs)
+
+    def close(self):
+        if self._custom_xml is not None and self.fp is not None:
+            # 시트 번호(ws.path)는 ExcelWriter가 시트를 기록할 때 정해짐
+            crc = self.getinfo(self._sheet.path.lstrip("/")).CRC
+            custom_xml, self._custom_xml = self._custom_xml, None
+            super().writestr(CUSTOM_PROPS_PATH, _with_sheet_crc(custom_xml, self._property_name, crc))
+        super().close()
+
+
+def save_workbook(wb, path, name, sheet):
+    """
+    wb를 path에 저장하면서 JSON 문서 속성 name에 sheet 시트 파트의 CRC-32(SHEET_CRC_KEY)를 추가합니다.
+
+    name 속성은 미리 wb.custom_doc_props에 추가해 두어야 합니다. 문서 속성 파트는 시트 파트를 기록한 뒤
+    마지막에 쓰므로 저장한 파일을 다시 열어 고쳐 쓰지 않습니다. sheet_unchanged()로 다른 프로그램이
+    시트를 다시 저장했는지 확인할 수 있습니다.
+    """
+    if wb.write_only and not wb.worksheets:
+        wb.create_sheet()
+    wb.properties.modified = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    ExcelWriter(wb, _CustomPropsLastZipFile(path, name, sheet)).save()
+
+
+def sheet_unchanged(path, sheet_title, crc):
+    """
+    path 통합문서의 sheet_title 시트 파트가 CRC-32 crc로 저장된 그대로이고 계산 체인이 없으면 True.
+
+    save_workbook()/patch_worksheet()가 기록한 SHEET_CRC_KEY 값과 비교하여 다른 프로그램에서 다시 저장한
+    파일(셀 XML 형식이 다를 수 있음)을 구분합니다. 파일/시트를 읽을 수 없으면 False.
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            if CALC_CHAIN_PATH in zf.namelist():
+                return False
+            return zf.getinfo(_worksheet_path(zf, sheet_title)).CRC == crc
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError, WorkbookPatchError):
+        return False
+
+
+def _worksheet_path(zf, sheet_title):
+    """시트 이름 → 패키지 내 워크시트 XML 경로."""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship")}
+
+    for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet"):
+        if sheet.get("name") == sheet_title:
+            target = targets.get(sheet.get(f"{{{REL_NS}}}id"))
+            if target is None:
+                break
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    raise WorkbookPatchError(f"시트를 찾을 수 없습니다: {sheet_title}")
+
+
+def _cell_xml(ref, value, style):
+    """openpyxl과 같은 형식의 <c> 요소 (수식은 "="로 시작하는 문자열, 문자열은 inlineStr)."""
+    style_attr = f' s="{style}"' if style is not None else ""
+    if value is None:
+        return f'<c r="{ref}"{style_attr} t="n" />'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style_attr} t="n"><v>{value!r}</v></c>'
+
+    text = str(value)
+    if text.startswith("="):
+        return f'<c r="{ref}"{style_attr}><f>{escape(text[1:])}</f><v /></c>'
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _patch_row(cells_xml, row, values):
+    """한 행의 셀 XML에서 values({컬럼번호: 값}) 컬럼만 교체 (없는 셀은 컬럼 순서대로 삽입)."""
+    cells = []
+    for match in _CELL.finditer(cells_xml):
+        col = column_index_from_string(match.group(1))
+        if col in values:
+            style = _STYLE_ATTR.search(match.group(2))
+            cells.append((col, _cell_xml(f"{match.group(1)}{row}", values[col], style.group(1) if style else None)))
+        else:
+            cells.append((col, match.group(0)))
+
+    existing = {col for col, _ in cells}
+    for col, value in values.items():
+        if col not in existing:
+            cells.append((col, _cell_xml(f"{get_column_letter(col)}{row}", value, None)))
+    cells.sort(key=lambda item: item[0])
+    return "".join(xml for _, xml in cells)
+
+
+def _iter_patched_rows(text_stream, target_rows, row_values, found_rows):
+    """시트 XML을 </row> 단위로 읽어 대상 행만 고친 문자열 조각을 생성합니다."""
+    buffer = ""
+    while True:
+        chunk = text_stream.read(READ_CHUNK_CHARS)
+        if not chunk:
+            # 마지막 조각(</sheetData> 이후)은 그대로 기록
+            yield buffer
+            return
+
+        buffer += chunk
+        pieces = buffer.split(_ROW_END)
+        buffer = pieces.pop()
+        for piece in pieces:
+            start = piece.rfind("<row ")
+            match = _ROW_START.match(piece, start) if start >= 0 else None
+            if match is None:
+                yield piece + _ROW_END
+                continue
+
+            row = int(match.group(1))
+            if row in target_rows:
+                found_rows.add(row)
+                piece = piece[:match.end()] + _patch_row(piece[match.end():], row, row_values(row))
+            yield piece + _ROW_END
+
+
+def patch_worksheet(src_path, dst_path, sheet_title, target_rows, row_values, json_property=None):
+    """
+    src_path 통합문서의 sheet_title 시트에서 target_rows 행의 일부 셀만 바꿔 dst_path로 저장합니다.
+
+    시트 XML은 행 단위로 스트리밍하며 다른 행/다른 패키지 파트(서식, 병합, 너비 등)는
+    바이트 그대로 복사하므로, 통합문서 전체를 읽고 다시 저장하는 것보다 훨씬 빠릅니다.
+    기존 셀의 서식 번호(s)는 유지합니다.
+
+    셀은 openpyxl이 기록한 형식(<row r=".."> 안의 접두사 없는 <c r=".." ...>)을 정규식으로 찾으므로
+    이 앱이 save_workbook()/patch_worksheet()로 저장한 뒤 다른 프로그램이 고치지 않은 파일만 대상입니다
+    (호출 측에서 sheet_unchanged()로 확인).
+
+    Parameters:
+    - target_rows: 고칠 행 번호 집합 (range/set 등 `in` 연산 지원 객체)
+    - row_values: fn(row) -> {컬럼번호: 값} (값: None / 숫자 / 문자열 / "="로 시작하는 수식)
+    - json_property: 설정되면 이 JSON 문서 속성의 SHEET_CRC_KEY를 고친 시트 파트의 CRC-32로 갱신
+
+    Raises:
+    - WorkbookPatchError: 시트/대상 행이 없거나 계산 체인이 있는 경우 (dst_path는 만들지 않음)
+    """
+    found_rows = set()
+    try:
+        with zipfile.ZipFile(src_path) as zin, zipfile.ZipFile(dst_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            if CALC_CHAIN_PATH in zin.namelist():
+                raise WorkbookPatchError("Excel에서 다시 저장한 파일(계산 체인 포함)은 패치할 수 없습니다.")
+            sheet_path = _worksheet_path(zin, sheet_title)
+            custom_info = None
+            for info in zin.infolist():
+                if json_property is not None and info.filename == CUSTOM_PROPS_PATH:
+                    custom_info = info  # 시트 파트 CRC를 알게 된 뒤 기록
+                    continue
+                if info.filename != sheet_path:
+                    zout.writestr(info, zin.read(info.filename), compress_type=info.compress_type)
+                    continue
+
+                sheet_info = zipfile.ZipInfo(info.filename, info.date_time)
+                sheet_info.compress_type = zipfile.ZIP_DEFLATED
+                with zin.open(info) as raw, zout.open(sheet_info, "w", force_zip64=True) as out:
+                    text_stream = io.TextIOWrapper(raw, encoding="utf-8")
+                    for text in _iter_patched_rows(text_stream, target_rows, row_values, found_rows):
+                        out.write(text.encode("utf-8"))
+
+            if custom_info is not None:
+                custom_xml = _with_sheet_crc(zin.read(custom_info), json_property, zout.getinfo(sheet_path).CRC)
+                zout.writestr(custom_info, custom_xml, compress_type=custom_info.compress_type)
+
+        missing = len(target_rows) - len(found_rows)
+        if missing:
+            raise WorkbookPatchError(f"패치 대상 행 {missing}개를 시트에서 찾을 수 없습니다.")
+    except BaseException:
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        raise